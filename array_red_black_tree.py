@@ -0,0 +1,463 @@
+# -*- coding: utf-8 -*-
+""" 
+An array-backed storage mode for red black trees. 
+
+Instead of one Node object per key, ArrayRedBlackTree keeps parallel arrays: 
+the keys, the indices of the left/right children and of the parents, and one
+packed color bit per node. Slots of removed nodes are recycled via a free list. 
+"""
+
+from array import array
+from typing import Union
+
+from red_black_tree import black, red
+
+
+###############################################################################
+
+# the index which stands for an empty leaf (and for "no parent")
+nil = -1
+
+class ArrayRedBlackTree:
+    """ 
+    This is a class for a red black tree whose nodes are stored in parallel arrays. 
+    
+    A node is represented by its index i, i.e. by keys[i], left[i], right[i], parent[i]
+    and bit i of colors. The indices are stored in arrays of C ints (4 bytes each),
+    so one tree can hold up to 2**31 - 1 nodes. 
+    
+    Attributes: 
+        root (int): The index of the root node (nil = -1 if the tree is empty). 
+        typecode (str, None): The typecode of the array module for the keys (e.g. "q" or "d"),
+            or None (by default) to store arbitrary comparable keys in a list. 
+    """
+    
+    
+    
+    def __init__(self, typecode:Union[str,None] = None):
+        """ 
+        The constructor for ArrayRedBlackTrees. 
+        
+        Parameter: 
+            typecode (str, None): The typecode of the array module for the keys, or None for a list of keys. 
+        """
+        self.typecode = typecode
+        self._keys = [] if typecode is None else array(typecode)
+        self._left = array("i")
+        self._right = array("i")
+        self._parent = array("i")
+        # one bit per node, 1 stands for red and 0 for black (like in red_black_tree.py)
+        self._colors = bytearray()
+        self.root = nil
+        # the head of the free list; the free slots are chained via their left index
+        self._free = nil
+        self._size = 0
+    
+    
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    ###########################################################################
+    # help functions for the packed colors
+    def _is_red(self, i:int) -> bool:
+        # the leafes (nil) are always black
+        return i != nil and (self._colors[i >> 3] >> (i & 7)) & 1 == red
+    
+    
+    
+    def _set_color(self, i:int, color:int) -> None:
+        if color is red:
+            self._colors[i >> 3] |= 1 << (i & 7)
+        else:
+            self._colors[i >> 3] &= ~(1 << (i & 7)) & 0xFF
+        return None
+    
+    ###########################################################################
+    # help functions for the slots
+    def _new_slot(self, key) -> int:
+        # reuse a slot of a removed node if there is one
+        i = self._free
+        if i != nil:
+            self._free = self._left[i]
+            self._keys[i] = key
+            self._left[i] = nil
+            self._right[i] = nil
+            self._parent[i] = nil
+        else:
+            i = len(self._left)
+            self._keys.append(key)
+            self._left.append(nil)
+            self._right.append(nil)
+            self._parent.append(nil)
+            if (i >> 3) == len(self._colors):
+                self._colors.append(0)
+        self._set_color(i, red)
+        self._size += 1
+        return i
+    
+    
+    
+    def _release_slot(self, i:int) -> None:
+        # put the slot on the free list (the key is dropped if it is a Python object)
+        if self.typecode is None:
+            self._keys[i] = None
+        self._left[i] = self._free
+        self._right[i] = nil
+        self._parent[i] = nil
+        self._free = i
+        self._size -= 1
+        return None
+    
+    ###########################################################################
+    # a rotation around x; the arrays a and b are (left, right) for a left rotation
+    # and (right, left) for a right rotation (the same idea as _left/_right in RedBlackTree)
+    def _rotate(self, x:int, a:array, b:array) -> None:
+        parent = self._parent
+        y = b[x]
+        if y == nil:
+            raise Exception("The rotation is not possible since the ends of the branches are empty")
+        
+        # y's inner child becomes x's outer child
+        b[x] = a[y]
+        if a[y] != nil:
+            parent[a[y]] = x
+        
+        # y takes x's place
+        p = parent[x]
+        parent[y] = p
+        if p == nil:
+            self.root = y
+        elif self._left[p] == x:
+            self._left[p] = y
+        else:
+            self._right[p] = y
+        
+        a[y] = x
+        parent[x] = y
+        return None
+    
+    ###########################################################################
+    def insert(self, key) -> None:
+        """ 
+        The function inserts the input key into the tree while preserving the red-black-tree-properties. 
+        
+        Parameter: 
+            key: The key which is inserted. 
+            
+        Returns: 
+            None
+        """
+        keys = self._keys
+        lefts = self._left
+        rights = self._right
+        
+        # search for a spare place (equal keys go to the right like in RedBlackTree)
+        p = nil
+        i = self.root
+        go_left = False
+        while i != nil:
+            p = i
+            go_left = key < keys[i]
+            i = lefts[i] if go_left else rights[i]
+        
+        n = self._new_slot(key)
+        self._parent[n] = p
+        if p == nil:
+            self.root = n
+        elif go_left:
+            lefts[p] = n
+        else:
+            rights[p] = n
+        
+        self._fix_insert(n)
+        return None
+    
+    
+    
+    def _fix_insert(self, n:int) -> None:
+        parent = self._parent
+        lefts = self._left
+        rights = self._right
+        
+        while True:
+            p = parent[n]
+            # the root-Node must always be black
+            if p == nil:
+                self._set_color(n, black)
+                return None
+            # if the parent is black, nothing must be fixed
+            if not self._is_red(p):
+                return None
+            
+            # a red parent is never the root-Node, so the grandparent exists
+            g = parent[p]
+            if lefts[g] == p:
+                a, b = lefts, rights
+            else:
+                a, b = rights, lefts
+            u = b[g]
+            
+            # red parent and red uncle: recolor and continue with the grandparent
+            if self._is_red(u):
+                self._set_color(p, black)
+                self._set_color(u, black)
+                self._set_color(g, red)
+                n = g
+                continue
+            
+            # red parent and black uncle: the red parent and the red child are not in a row
+            if b[p] == n:
+                self._rotate(p, a, b)
+                n, p = p, n
+            
+            # now they are in a row
+            self._rotate(g, b, a)
+            self._set_color(p, black)
+            self._set_color(g, red)
+            return None
+    
+    ###########################################################################
+    def _find(self, key) -> int:
+        keys = self._keys
+        i = self.root
+        while i != nil:
+            k = keys[i]
+            if key < k:
+                i = self._left[i]
+            elif k < key:
+                i = self._right[i]
+            else:
+                return i
+        return nil
+    
+    
+    
+    def search(self, key) -> bool:
+        """ The function returns whether a node with the input key is stored in the tree. """
+        return self._find(key) != nil
+    
+    
+    
+    def __contains__(self, key) -> bool:
+        return self._find(key) != nil
+    
+    
+    
+    def remove(self, key) -> None:
+        """ 
+        The function removes one node with the input key while preserving the red-black-tree-properties. 
+        Its slot is recycled by the next insertion. 
+        
+        Parameter: 
+            key: The key which is removed. 
+            
+        Returns: 
+            None
+        """
+        z = self._find(key)
+        if z == nil:
+            raise KeyError(key)
+        
+        parent = self._parent
+        lefts = self._left
+        rights = self._right
+        
+        # y is the node which is taken out of the tree (z itself or its successor),
+        # x the child which moves into y's place and xp the (new) parent of x
+        y = z
+        y_red = self._is_red(y)
+        if lefts[z] == nil:
+            x = rights[z]
+            xp = parent[z]
+            self._transplant(z, x)
+        elif rights[z] == nil:
+            x = lefts[z]
+            xp = parent[z]
+            self._transplant(z, x)
+        else:
+            y = rights[z]
+            while lefts[y] != nil:
+                y = lefts[y]
+            y_red = self._is_red(y)
+            x = rights[y]
+            if parent[y] == z:
+                xp = y
+            else:
+                xp = parent[y]
+                self._transplant(y, x)
+                rights[y] = rights[z]
+                parent[rights[y]] = y
+            self._transplant(z, y)
+            lefts[y] = lefts[z]
+            parent[lefts[y]] = y
+            self._set_color(y, red if self._is_red(z) else black)
+        
+        self._release_slot(z)
+        
+        # removing a black node violates the black height
+        if not y_red:
+            self._fix_remove(x, xp)
+        return None
+    
+    
+    
+    def _transplant(self, u:int, v:int) -> None:
+        # v takes u's place below u's parent
+        p = self._parent[u]
+        if p == nil:
+            self.root = v
+        elif self._left[p] == u:
+            self._left[p] = v
+        else:
+            self._right[p] = v
+        if v != nil:
+            self._parent[v] = p
+        return None
+    
+    
+    
+    def _fix_remove(self, x:int, xp:int) -> None:
+        parent = self._parent
+        lefts = self._left
+        rights = self._right
+        
+        while x != self.root and not self._is_red(x):
+            if lefts[xp] == x:
+                a, b = lefts, rights
+            else:
+                a, b = rights, lefts
+            w = b[xp]
+            
+            # red sibling: rotate it above the parent
+            if self._is_red(w):
+                self._set_color(w, black)
+                self._set_color(xp, red)
+                self._rotate(xp, a, b)
+                w = b[xp]
+            
+            # black sibling with black children: recolor and continue with the parent
+            if not self._is_red(a[w]) and not self._is_red(b[w]):
+                self._set_color(w, red)
+                x = xp
+                xp = parent[x]
+                continue
+            
+            # black sibling with a red inner child: rotate it to the outside
+            if not self._is_red(b[w]):
+                self._set_color(a[w], black)
+                self._set_color(w, red)
+                self._rotate(w, b, a)
+                w = b[xp]
+            
+            # black sibling with a red outer child
+            self._set_color(w, red if self._is_red(xp) else black)
+            self._set_color(xp, black)
+            self._set_color(b[w], black)
+            self._rotate(xp, a, b)
+            x = self.root
+            break
+        
+        if x != nil:
+            self._set_color(x, black)
+        return None
+    
+    ###########################################################################
+    def inorder(self) -> list:
+        """ The function returns the keys of the nodes inserted in the tree in increasing order. """
+        ordered = []
+        stack = []
+        i = self.root
+        while stack or i != nil:
+            while i != nil:
+                stack.append(i)
+                i = self._left[i]
+            i = stack.pop()
+            ordered.append(self._keys[i])
+            i = self._right[i]
+        return ordered
+    
+    
+    
+    def validate(self) -> None:
+        """ 
+        The function checks in one pass over the nodes (in O(n)) that the tree is a valid red black tree 
+        (see RedBlackTree.validate) with the parent indices matching the child indices, and that the free 
+        list holds exactly the slots which are not in the tree. 
+        
+        Returns: 
+            None (an Exception describes the first violation which is found) 
+        """
+        keys, left, right, parent = self._keys, self._left, self._right, self._parent
+        if self.root != nil:
+            if parent[self.root] != nil:
+                raise Exception("The root-Node " + str(self.root) + " has a parent!")
+            if self._is_red(self.root):
+                raise Exception("The root-Node " + str(self.root) + " is not black!")
+        
+        # an inorder walk with a stack of the nodes and the numbers of black nodes on their paths
+        leaf_height = None
+        count = 0
+        previous = nil
+        stack = []
+        i = self.root
+        height = 0
+        while stack or i != nil:
+            while i != nil:
+                if not self._is_red(i):
+                    height += 1
+                for c in (left[i], right[i]):
+                    if c == nil:
+                        if leaf_height is None:
+                            leaf_height = height
+                        elif height != leaf_height:
+                            raise Exception("The paths below the node " + str(i) + " have different numbers of black nodes!")
+                        continue
+                    if parent[c] != i:
+                        raise Exception("The parent index of the node " + str(c) + " does not point to " + str(i) + "!")
+                    if self._is_red(i) and self._is_red(c):
+                        raise Exception("The red node " + str(i) + " has the red child " + str(c) + "!")
+                stack.append((i, height))
+                i = left[i]
+            
+            i, height = stack.pop()
+            if (previous != nil) and (keys[i] < keys[previous]):
+                raise Exception("The keys of the nodes " + str(previous) + " and " + str(i) + " are not in order!")
+            previous = i
+            count += 1
+            i = right[i]
+        
+        if self._size != count:
+            raise Exception("The tree has " + str(count) + " nodes, but its length is " + str(self._size) + "!")
+        free = 0
+        i = self._free
+        while i != nil:
+            free += 1
+            if free > len(left):
+                raise Exception("The free list has a cycle!")
+            i = left[i]
+        if count + free != len(left):
+            raise Exception("The tree has " + str(count) + " nodes and " + str(free) + " free slots, but " + str(len(left)) + " slots!")
+        return None
+    
+    
+    
+    def minimum(self):
+        """ The function returns a key which is smaller or equal than the others. """
+        i = self.root
+        if i == nil:
+            raise ValueError("The tree is empty!")
+        while self._left[i] != nil:
+            i = self._left[i]
+        return self._keys[i]
+    
+    
+    
+    def maximum(self):
+        """ The function returns a key which is bigger or equal than the others. """
+        i = self.root
+        if i == nil:
+            raise ValueError("The tree is empty!")
+        while self._right[i] != nil:
+            i = self._right[i]
+        return self._keys[i]
@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+""" 
+An asyncio facade for the red black tree of red_black_tree.py. 
+
+A single operation on the tree costs microseconds, but an iteration over a large tree or a
+large batch of insertions runs for hundreds of milliseconds, and during that time the event
+loop can not run any other task. AsyncRedBlackTree splits such operations into chunks of
+chunk_size keys and yields to the event loop after every chunk (with asyncio.sleep(0)), so
+the other tasks wait for a few chunks instead of the whole operation (a task which is woken
+by a timer gets its turn after one or two further chunks). A new tree can be built in an
+executor instead. 
+
+All methods must be called from the thread of the event loop (the tree is not locked). 
+"""
+
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from operator import index
+from typing import Union
+
+from red_black_tree import RedBlackTree
+
+
+###############################################################################
+
+# the positions of the keys in the order of the keys (equal keys keep the order of their positions);
+# runs in another process, see AsyncRedBlackTree.from_iterable
+def _sorted_positions(keys:list) -> list:
+    return sorted(range(len(keys)), key=keys.__getitem__)
+
+
+
+# link the nodes of the empty tree (with a key function, so no multiset) in the order of their sorted
+# positions (in a thread of this process)
+def _link_in_order(tree:RedBlackTree, nodes:list, order:list) -> RedBlackTree:
+    tree._link_sorted([nodes[i] for i in order])
+    return tree
+
+
+
+class AsyncRedBlackTree:
+    """ 
+    This is a class for a red black tree which is used by the tasks of an asyncio event loop. 
+    
+    The iterations (async for, irange, inorder) take a chunk of nodes at once and hold no walk over
+    the nodes while they are suspended: the next chunk is searched again, behind the key of the last
+    node of the chunk before. So the tree can be changed between the chunks, even by the task which
+    iterates, and the deletions do not wait for the iterations. Keys which are inserted or deleted
+    meanwhile behind the current chunk are yielded resp. skipped; a key of the current chunk is
+    yielded even if it is deleted before. 
+    
+    Attributes: 
+        tree (RedBlackTree): The wrapped tree (its O(log n) operations can be used directly). 
+        chunk_size (int): The number of keys which are processed before yielding to the event loop. 
+    """
+    
+    
+    
+    def __init__(self, tree:Union[RedBlackTree,None] = None, chunk_size:int = 1000, **options):
+        """ 
+        The constructor for AsyncRedBlackTrees. 
+        
+        Parameters: 
+            tree (RedBlackTree, None): The tree which is wrapped (None by default, then a new tree is created). 
+            chunk_size (int): The number of keys after which the long operations yield to the event loop
+                (1000 by default, i.e. about a millisecond). 
+            options: The keyword arguments for the constructor of a new tree (e.g. order_statistics=True). 
+        """
+        if chunk_size < 1:
+            raise ValueError("The chunk size must be positive!")
+        self.tree = RedBlackTree(**options) if tree is None else tree
+        self.chunk_size = chunk_size
+    
+    
+    
+    @classmethod
+    async def from_iterable(cls, iterable, executor = None, chunk_size:int = 1000, **options) -> "AsyncRedBlackTree":
+        """ 
+        The function builds a tree from keys in any order outside of the event loop. 
+        
+        With a thread executor (or None for the default executor of the loop) the whole tree is built
+        in a thread, which shares the GIL with the event loop, so the loop runs at least every switch
+        interval (sys.getswitchinterval(), 5 ms by default). A ProcessPoolExecutor sorts the keys in
+        another process (a sort does not release the GIL) and only the linking of the sorted nodes in
+        O(n) runs in a thread of this process (nodes with parent pointers can not be sent between processes). 
+        A key function (e.g. a lambda) is not sent to the process either: it is called once per item in a
+        thread of this process, and the process sorts the positions of the items by their keys. So only
+        the keys (resp. the results of the key function) must be picklable. 
+        
+        Parameters: 
+            iterable: The keys. 
+            executor (Executor, None): The executor (None by default, i.e. the default executor of the loop). 
+            chunk_size (int): The chunk size of the new facade (1000 by default). 
+            options: The keyword arguments for the constructor of the tree (e.g. order_statistics=True). 
+            
+        Returns: 
+            AsyncRedBlackTree: The new facade with the new tree. 
+        """
+        loop = asyncio.get_running_loop()
+        keys = list(iterable)
+        if isinstance(executor, ProcessPoolExecutor) and (options.get("key") is not None):
+            tree = RedBlackTree(**options)
+            nodes = await loop.run_in_executor(None, partial(list, map(tree._make_node, keys)))
+            order = await loop.run_in_executor(executor, _sorted_positions, [n.key for n in nodes])
+            tree = await loop.run_in_executor(None, _link_in_order, tree, nodes, order)
+        elif isinstance(executor, ProcessPoolExecutor):
+            # (the typed mode orders the converted keys, see RedBlackTree.from_iterable)
+            key = None
+            if options.get("typed") is not None:
+                key = index if options["typed"] is int else float
+            keys = await loop.run_in_executor(executor, partial(sorted, key=key), keys)
+            tree = await loop.run_in_executor(None, partial(RedBlackTree.from_sorted, keys, **options))
+        else:
+            tree = await loop.run_in_executor(executor, partial(RedBlackTree.from_iterable, keys, **options))
+        return cls(tree, chunk_size=chunk_size)
+    
+    ###########################################################################
+    # writers
+    async def insert(self, key) -> None:
+        """ The function inserts the input key (resp. item, see RedBlackTree.add). """
+        self.tree.add(key)
+        return None
+    
+    
+    
+    async def insert_many(self, iterable) -> None:
+        """ 
+        The function inserts the input keys in batches of chunk_size keys (with RedBlackTree.insert_many) 
+        and yields to the event loop after every batch. If the task is cancelled, the keys of the
+        batches before are inserted and the others are not. 
+        
+        Parameter: 
+            iterable: The keys which are inserted. 
+            
+        Returns: 
+            None
+        """
+        keys = list(iterable)
+        size = self.chunk_size
+        for i in range(0, len(keys), size):
+            self.tree.insert_many(keys[i:i + size])
+            await asyncio.sleep(0)
+        return None
+    
+    
+    
+    async def delete(self, key) -> None:
+        """ The function deletes a node with the input key (KeyError if there is none). """
+        self.tree.delete(key)
+        return None
+    
+    
+    
+    async def pop_min(self):
+        """ The function removes the smallest key and returns it. """
+        return self.tree.pop_min().key
+    
+    
+    
+    async def pop_max(self):
+        """ The function removes the biggest key and returns it. """
+        return self.tree.pop_max().key
+    
+    
+    
+    async def clear(self) -> None:
+        """ The function removes all keys. """
+        self.tree.clear()
+        return None
+    
+    ###########################################################################
+    # readers: the O(log n) lookups do not need to yield to the event loop
+    def __contains__(self, key) -> bool:
+        return key in self.tree
+    
+    
+    
+    def __len__(self) -> int:
+        return len(self.tree)
+    
+    
+    
+    def minimum(self):
+        """ The function returns the smallest key (ValueError for an empty tree). """
+        if self.tree.root is None:
+            raise ValueError("The tree is empty!")
+        return self.tree.minimum().key
+    
+    
+    
+    def maximum(self):
+        """ The function returns the biggest key (ValueError for an empty tree). """
+        if self.tree.root is None:
+            raise ValueError("The tree is empty!")
+        return self.tree.maximum().key
+    
+    
+    
+    # yield the values of the nodes of irange(lo, hi, inclusive, reverse) in chunks of chunk_size nodes, with a
+    # pause for the event loop after every chunk; each chunk is taken at once by a new walk, which starts behind
+    # the key of the last node of the chunk before, so no walk is suspended while the tree can change
+    async def _chunked(self, lo, hi, inclusive:tuple, reverse:bool):
+        tree = self.tree
+        size = self.chunk_size
+        while tree.root is not None:
+            chunk = []
+            for n in tree._irange_nodes(lo, hi, inclusive, reverse):
+                # (the nodes with an equal key belong to the same chunk, since the next chunk starts behind it)
+                if (len(chunk) >= size) and ((chunk[-1].key < n.key) or (n.key < chunk[-1].key)):
+                    break
+                chunk.append(n)
+            else:
+                for k in tree._values(chunk):
+                    yield k
+                return
+            
+            last = chunk[-1].key
+            if reverse:
+                hi = last
+                inclusive = (inclusive[0], False)
+            else:
+                lo = last
+                inclusive = (False, inclusive[1])
+            for k in tree._values(chunk):
+                yield k
+            await asyncio.sleep(0)
+    
+    
+    
+    def __aiter__(self):
+        """ The function yields the keys (resp. items) in increasing order and pauses after every chunk. """
+        return self._chunked(None, None, (True, True), False)
+    
+    
+    
+    def reversed(self):
+        """ The function yields the keys (resp. items) in decreasing order and pauses after every chunk (async for). """
+        return self._chunked(None, None, (True, True), True)
+    
+    
+    
+    def irange(self, lo = None, hi = None, inclusive:tuple = (True, True), reverse:bool = False):
+        """ 
+        The function yields the keys between lo and hi (see RedBlackTree.irange) and pauses after every chunk. 
+        
+        Parameters: 
+            lo: The lower bound (None for no lower bound). 
+            hi: The upper bound (None for no upper bound). 
+            inclusive (tuple): Whether lo and hi themselves are included ((True, True) by default). 
+            reverse (bool): Whether the keys are yielded in decreasing order (False by default). 
+            
+        Returns: 
+            async generator: The keys in the range (for async for). 
+        """
+        return self._chunked(lo, hi, inclusive, reverse)
+    
+    
+    
+    async def inorder(self) -> list:
+        """ The function returns the keys (resp. items) in increasing order and pauses after every chunk. """
+        return [k async for k in self]
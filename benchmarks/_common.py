@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+""" 
+Common help functions for the benchmark scripts in this folder. 
+
+The scripts can be started directly (e.g. "python benchmarks/bench_insert.py"),
+therefore the folder above is added to the search path for modules here. 
+"""
+
+import gc
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def best_of(function, repeat:int = 3) -> float:
+    """ 
+    The function measures the runtime of the input function several times. 
+    
+    Parameters: 
+        function: A callable without arguments whose runtime is measured. 
+        repeat (int): How often the function is called (3 by default). 
+        
+    Returns: 
+        float: The shortest of the measured runtimes in seconds. 
+    """
+    times = []
+    # like timeit, the cyclic garbage collector is switched off during the measurement
+    # (the parent pointers make every tree a cycle, so it would scan the nodes again and again)
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function()
+            times.append(time.perf_counter() - start)
+            gc.collect()
+    finally:
+        if enabled:
+            gc.enable()
+    return min(times)
+
+
+
+def report(name:str, seconds:float, n:int) -> None:
+    """ The function prints a measured runtime together with the throughput. """
+    print("%-40s %10.3f s %14.0f ops/s" % (name, seconds, n / seconds if seconds else float("inf")))
+    return None
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""  
+Benchmark for the range aggregates of RedBlackTree(monoid=...) against summing the output of
+irange: n random int keys, queried with ranges of several widths, and a RedBlackTreeMap from
+timestamps to sizes in bytes, whose total size per time range is computed. The results of
+both are compared. The price of the aggregates is measured as well, as the runtime of add
+with and without a monoid. 
+
+Usage:  
+    python benchmarks/bench_aggregate.py [-n 1000000] [--queries 100]
+"""
+
+import argparse
+import random
+from operator import attrgetter
+
+from _common import best_of, report
+from red_black_tree import Monoid, RedBlackTree
+from red_black_tree_map import RedBlackTreeMap
+
+
+def build(keys:list, **options) -> RedBlackTree:
+    """ The function inserts the keys one by one with add. """
+    tree = RedBlackTree(**options)
+    for k in keys:
+        tree.add(k)
+    return tree
+
+
+
+def irange_sums(tree:RedBlackTree, queries:list) -> list:
+    """ The function sums the keys of every range with irange. """
+    return [sum(tree.irange(lo, hi)) for lo, hi in queries]
+
+
+
+def aggregate_sums(tree:RedBlackTree, queries:list) -> list:
+    """ The function sums the keys of every range with aggregate. """
+    aggregate = tree.aggregate
+    return [aggregate(lo, hi) for lo, hi in queries]
+
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", type=int, default=1000000, help="number of keys")
+    parser.add_argument("--queries", type=int, default=100, help="number of queries per width")
+    parser.add_argument("--repeat", type=int, default=3, help="number of repetitions (the best one counts)")
+    parser.add_argument("--seed", type=int, default=1, help="seed for the random keys")
+    args = parser.parse_args()
+    
+    random.seed(args.seed)
+    span = 10 * args.n
+    keys = random.sample(range(span), args.n)
+    
+    print("add of %d random keys:" % args.n)
+    report("  RedBlackTree()", best_of(lambda: build(keys), args.repeat), args.n)
+    report("  RedBlackTree(order_statistics=True)", best_of(lambda: build(keys, order_statistics=True), args.repeat), args.n)
+    report("  RedBlackTree(monoid=Monoid.sum())", best_of(lambda: build(keys, monoid=Monoid.sum()), args.repeat), args.n)
+    tree = RedBlackTree.from_iterable(keys, monoid=Monoid.sum())
+    
+    for width in (span // 10000, span // 100, span // 10):
+        queries = []
+        for _ in range(args.queries):
+            lo = random.randrange(span)
+            queries.append((lo, lo + width))
+        expected = irange_sums(tree, queries)
+        if aggregate_sums(tree, queries) != expected:
+            raise Exception("The aggregates of the tree differ from the sums of irange!")
+        found = sum(1 for lo, hi in queries for _ in tree.irange(lo, hi))
+        print("%d sums of ranges of width %d (%.0f keys on average):" % (args.queries, width, found / args.queries))
+        report("  sum(irange(lo, hi))", best_of(lambda: irange_sums(tree, queries), args.repeat), args.queries)
+        report("  aggregate(lo, hi)", best_of(lambda: aggregate_sums(tree, queries), args.repeat), args.queries)
+    
+    # the total size in bytes per time range, with the sizes as the values of a map
+    sizes = RedBlackTreeMap(((t, random.randrange(100, 100000)) for t in keys), monoid=Monoid.sum(attrgetter("value")))
+    queries = []
+    for _ in range(args.queries):
+        lo = random.randrange(span)
+        queries.append((lo, lo + span // 100))
+    
+    def map_irange_sums() -> list:
+        return [sum(sizes[t] for t in sizes.irange(lo, hi)) for lo, hi in queries]
+    
+    if aggregate_sums(sizes, queries) != map_irange_sums():
+        raise Exception("The aggregates of the map differ from the sums of irange!")
+    print("%d total sizes of time ranges of width %d in a RedBlackTreeMap:" % (args.queries, span // 100))
+    report("  sum(sizes[t] for t in irange(lo, hi))", best_of(map_irange_sums, args.repeat), args.queries)
+    report("  aggregate(lo, hi)", best_of(lambda: aggregate_sums(sizes, queries), args.repeat), args.queries)
+    return None
+
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+""" 
+Latency benchmark for AsyncRedBlackTree: a probe task asks the event loop to wake it up every
+millisecond and measures how late it is woken up (the stall of the event loop), while another
+task runs a large operation on a tree with n keys, once blocking (the plain RedBlackTree) and
+once through the asyncio facade. 
+
+Reported are the runtime of the operation and the maximum and the 99th percentile of the stalls. 
+The trees are moved into the permanent generation of the garbage collector (gc.freeze) after they
+are built, like a service would do with its long-lived trees; otherwise every full collection scans
+all nodes (their parent pointers make every tree a cycle), which stalls the loop in any variant. 
+
+Usage: 
+    python benchmarks/bench_async.py [-n 1000000] [--chunk-size 1000]
+"""
+
+import argparse
+import asyncio
+import gc
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import _common  # adds the folder above to the search path
+from async_red_black_tree import AsyncRedBlackTree
+from red_black_tree import RedBlackTree
+
+
+async def probe(stalls:list, done:asyncio.Event, interval:float = 0.001) -> None:
+    """ The function records how much later than requested the event loop wakes it up, until done is set. """
+    loop = asyncio.get_running_loop()
+    while not done.is_set():
+        start = loop.time()
+        await asyncio.sleep(interval)
+        stalls.append(loop.time() - start - interval)
+    return None
+
+
+
+async def measure(operation) -> tuple:
+    """ The function runs the coroutine function operation together with the probe. """
+    stalls = []
+    done = asyncio.Event()
+    task = asyncio.create_task(probe(stalls, done))
+    # the probe is waiting before the operation starts
+    await asyncio.sleep(0.01)
+    start = time.perf_counter()
+    await operation()
+    seconds = time.perf_counter() - start
+    done.set()
+    await task
+    stalls.sort()
+    return seconds, stalls[-1], stalls[int(0.99 * (len(stalls) - 1))]
+
+
+
+async def run(args) -> None:
+    random.seed(args.seed)
+    keys = [random.randrange(10 * args.n) for _ in range(args.n)]
+    tree = RedBlackTree.from_iterable(keys)
+    facade = AsyncRedBlackTree(RedBlackTree.from_iterable(keys), chunk_size=args.chunk_size)
+    batch = [random.randrange(10 * args.n) for _ in range(args.n // 10)]
+    gc.freeze()
+    
+    async def blocking_inorder() -> None:
+        tree.inorder()
+    
+    async def async_inorder() -> None:
+        await facade.inorder()
+    
+    async def blocking_insert_many() -> None:
+        tree.insert_many(batch)
+    
+    async def async_insert_many() -> None:
+        await facade.insert_many(batch)
+    
+    async def blocking_build() -> None:
+        RedBlackTree.from_iterable(keys)
+    
+    async def thread_build() -> None:
+        with ThreadPoolExecutor(1) as executor:
+            await AsyncRedBlackTree.from_iterable(keys, executor=executor)
+    
+    async def process_build() -> None:
+        with ProcessPoolExecutor(1) as executor:
+            await AsyncRedBlackTree.from_iterable(keys, executor=executor)
+    
+    print("%d keys, chunk size %d:" % (args.n, args.chunk_size))
+    print("  %-40s %10s %14s %14s" % ("operation", "runtime", "max stall", "p99 stall"))
+    for name, operation in (("inorder, blocking", blocking_inorder),
+                            ("inorder, async for", async_inorder),
+                            ("insert_many of n/10 keys, blocking", blocking_insert_many),
+                            ("insert_many of n/10 keys, await", async_insert_many),
+                            ("from_iterable, blocking", blocking_build),
+                            ("from_iterable, thread executor", thread_build),
+                            ("from_iterable, process executor", process_build)):
+        seconds, worst, p99 = await measure(operation)
+        print("  %-40s %8.3f s %11.1f ms %11.1f ms" % (name, seconds, 1000 * worst, 1000 * p99))
+    return None
+
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", type=int, default=1000000, help="number of keys")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="chunk size of the facade")
+    parser.add_argument("--seed", type=int, default=1, help="seed for the random keys")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+    return None
+
+
+
+if __name__ == '__main__':
+    main()
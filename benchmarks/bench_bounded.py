@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+""" 
+Benchmark for rolling quantiles over a stream of events: the median and the 99th percentile
+of the last --capacity values (resp. of the values of the last --window seconds, with one
+event per millisecond of stream time). 
+
+Measured are a BoundedRedBlackTree with order statistics, which evicts the oldest value with
+every insertion and answers a query after every event, and the former approach, which rebuilds
+a RedBlackTree from the values of the window (kept in a deque) for every query; since that
+is far too slow for a query per event, it answers a query only every --every events. The
+answers of both are compared at these events. 
+
+Usage: 
+    python benchmarks/bench_bounded.py [-n 1000000] [--capacity 10000] [--every 1000]
+"""
+
+import argparse
+import random
+from collections import deque
+
+from _common import best_of, report
+from bounded_red_black_tree import BoundedRedBlackTree
+from red_black_tree import RedBlackTree
+
+
+def bounded(events:list, every:int, **options) -> list:
+    """ The function answers the rolling quantiles after every event (and returns those after every every-th event). """
+    tree = BoundedRedBlackTree(order_statistics=True, **options)
+    add = tree.add
+    quantile = tree.quantile
+    answers = []
+    for i, (t, v) in enumerate(events, 1):
+        add(v, t)
+        median = quantile(0.5).key
+        p99 = quantile(0.99).key
+        if i % every == 0:
+            answers.append((median, p99))
+    return answers
+
+
+
+def rebuild(events:list, every:int, capacity:int) -> list:
+    """ The function keeps the last values in a deque and builds a new tree from them every every-th event. """
+    window = deque(maxlen=capacity)
+    answers = []
+    for i, (t, v) in enumerate(events, 1):
+        window.append(v)
+        if i % every == 0:
+            tree = RedBlackTree.from_iterable(window, order_statistics=True)
+            answers.append((tree.quantile(0.5).key, tree.quantile(0.99).key))
+    return answers
+
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", type=int, default=1000000, help="number of events")
+    parser.add_argument("--capacity", type=int, default=10000, help="number of values in the window")
+    parser.add_argument("--window", type=float, default=None, help="length of the time window in seconds (default: capacity ms)")
+    parser.add_argument("--every", type=int, default=1000, help="events between two queries of the rebuilding approach")
+    parser.add_argument("--repeat", type=int, default=1, help="number of repetitions (the best one counts)")
+    parser.add_argument("--seed", type=int, default=1, help="seed for the random values")
+    args = parser.parse_args()
+    
+    random.seed(args.seed)
+    # latencies in milliseconds, one event per millisecond
+    events = [(i / 1000, random.lognormvariate(3, 0.5)) for i in range(args.n)]
+    window = args.window if args.window is not None else args.capacity / 1000
+    
+    print("%d events, rolling median and p99:" % args.n)
+    queries = args.n // args.every
+    for name, run, answered in (("rebuild per query, every %d events" % args.every,
+                                 lambda: rebuild(events, args.every, args.capacity), queries),
+                                ("BoundedRedBlackTree, capacity %d" % args.capacity,
+                                 lambda: bounded(events, args.every, capacity=args.capacity), args.n),
+                                ("BoundedRedBlackTree, window %g s" % window,
+                                 lambda: bounded(events, args.every, window=window), args.n)):
+        seconds = best_of(run, args.repeat)
+        report("  " + name, seconds, args.n)
+        print("  %40s %10.1f us per query (%d queries)" % ("", 1e6 * seconds / max(answered, 1), answered))
+    
+    # (one event per millisecond, so the last capacity events are those within the window, except for the bound)
+    expected = rebuild(events, args.every, args.capacity)
+    if bounded(events, args.every, capacity=args.capacity) != expected:
+        raise Exception("The rolling quantiles of BoundedRedBlackTree differ from the rebuilt trees!")
+    print("  (the quantiles agree at all %d queries of the rebuilding approach)" % queries)
+    return None
+
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+""" 
+Benchmark for building a tree from many keys: RedBlackTree.from_sorted and
+RedBlackTree.from_iterable against the repeated insertion of the __main__ block
+of red_black_tree.py, i.e. "for i in keys: tree.insert_rbt(Node(i))". 
+
+Usage: 
+    python benchmarks/bench_bulk_load.py [-n 1000000] [--repeat 3]
+"""
+
+import argparse
+import random
+
+from _common import best_of, report
+from red_black_tree import Node, RedBlackTree
+
+
+def insert_loop(keys:list) -> RedBlackTree:
+    """ The function builds a tree by inserting the keys one after another. """
+    tree = RedBlackTree()
+    for i in keys:
+        tree.insert_rbt(Node(i))
+    return tree
+
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", type=int, default=1000000, help="number of keys")
+    parser.add_argument("--repeat", type=int, default=3, help="number of repetitions (the best one counts)")
+    parser.add_argument("--seed", type=int, default=1, help="seed for the random keys")
+    args = parser.parse_args()
+    
+    random.seed(args.seed)
+    sorted_keys = list(range(args.n))
+    random_keys = random.sample(range(10 * args.n), args.n)
+    
+    print("%d sorted keys:" % args.n)
+    before = best_of(lambda: insert_loop(sorted_keys), args.repeat)
+    report("  insert_rbt loop", before, args.n)
+    after = best_of(lambda: RedBlackTree.from_sorted(sorted_keys), args.repeat)
+    report("  RedBlackTree.from_sorted", after, args.n)
+    print("  speedup: %.2fx" % (before / after))
+    
+    print("%d random keys:" % args.n)
+    before = best_of(lambda: insert_loop(random_keys), args.repeat)
+    report("  insert_rbt loop", before, args.n)
+    after = best_of(lambda: RedBlackTree.from_iterable(random_keys), args.repeat)
+    report("  RedBlackTree.from_iterable", after, args.n)
+    print("  speedup: %.2fx" % (before / after))
+    return None
+
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+""" 
+Stress test and throughput benchmark for ConcurrentRedBlackTree. 
+
+Several threads of a thread pool run a mix of lookups, range scans, insertions and
+deletions on one tree. Afterwards the red-black-tree-properties and the content of the
+tree are checked. The throughput is reported for 1, 2, 4, ... threads, with and without
+the batching queue of the writers. On a build with the GIL the readers cannot run truly
+in parallel, so the throughput there shows the overhead of the locking rather than scaling. 
+
+Usage: 
+    python benchmarks/bench_concurrent.py [-n 100000] [--ops 20000] [--threads 1,2,4,8] [--writes 0.2]
+"""
+
+import argparse
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import _common  # adds the folder above to the search path
+from concurrent_red_black_tree import ConcurrentRedBlackTree
+
+
+def check(tree:ConcurrentRedBlackTree, expected:set) -> None:
+    """ The function raises an Exception if the tree violates a red-black-tree-property or has wrong keys. """
+    tree.tree.validate()
+    if tree.snapshot() != sorted(expected):
+        raise Exception("The tree has other keys than expected!")
+    return None
+
+
+
+def worker(tree:ConcurrentRedBlackTree, thread:int, threads:int, ops:int, n:int, writes:float, seed:int) -> set:
+    """ The function runs ops operations on the tree and returns the keys which this thread owns afterwards. """
+    rnd = random.Random(seed)
+    # every thread only inserts and deletes its own keys (n + i with i % threads == thread),
+    # so the expected content is known in the end
+    owned = set()
+    following = n + thread
+    for _ in range(ops):
+        x = rnd.random()
+        if x < writes / 2:
+            tree.insert(following)
+            owned.add(following)
+            following += threads
+        elif x < writes:
+            if owned:
+                tree.delete(owned.pop())
+        elif x < 0.95:
+            rnd.randrange(n) in tree
+        else:
+            lo = rnd.randrange(n)
+            tree.irange(lo, lo + 20)
+    return owned
+
+
+
+def run(threads:int, args, batch_size) -> tuple:
+    """ The function runs the workload with the input number of threads and returns (seconds, tree, expected keys). """
+    tree = ConcurrentRedBlackTree(batch_size=batch_size)
+    tree.insert_many(range(args.n))
+    ops = args.ops // threads
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        start = time.perf_counter()
+        futures = [pool.submit(worker, tree, t, threads, ops, args.n, args.writes, args.seed + t) for t in range(threads)]
+        owned = [f.result() for f in futures]
+        seconds = time.perf_counter() - start
+    tree.flush()
+    expected = set(range(args.n)).union(*owned)
+    return seconds, tree, expected
+
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", type=int, default=100000, help="number of keys in the tree before the workload")
+    parser.add_argument("--ops", type=int, default=200000, help="total number of operations (split among the threads)")
+    parser.add_argument("--threads", default="1,2,4,8", help="comma separated numbers of threads")
+    parser.add_argument("--writes", type=float, default=0.2, help="share of the insertions and deletions")
+    parser.add_argument("--batch", type=int, default=64, help="batch size of the writer queue")
+    parser.add_argument("--seed", type=int, default=1, help="seed for the random operations")
+    args = parser.parse_args()
+    
+    # sys._is_gil_enabled only exists since Python 3.13
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print("Python %s, GIL %s, %d keys, %d operations, %.0f%% writes:"
+          % (sys.version.split()[0], "enabled" if gil else "disabled", args.n, args.ops, 100 * args.writes))
+    print("  %8s %24s %24s" % ("threads", "without queue", "batch size %d" % args.batch))
+    for threads in map(int, args.threads.split(",")):
+        line = "  %8d" % threads
+        for batch_size in (None, args.batch):
+            seconds, tree, expected = run(threads, args, batch_size)
+            check(tree, expected)
+            line += " %18.0f ops/s" % (args.ops / seconds)
+        print(line)
+    print("all invariants hold")
+    return None
+
+
+
+if __name__ == '__main__':
+    main()
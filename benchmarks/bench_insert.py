@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+""" 
+Microbenchmark for the insertion into a red black tree. 
+
+The iterative insertion of RedBlackTree.insert_rbt is compared with the former
+recursive insertion (reproduced below in RecursiveRedBlackTree), which used one
+Python frame per level for the search and one per grandparent for the fixing. 
+
+Usage: 
+    python benchmarks/bench_insert.py [-n 1000000] [--repeat 3]
+"""
+
+import argparse
+import random
+
+from _common import best_of, report
+from red_black_tree import Node, RedBlackTree, black, red, left, right
+
+
+class RecursiveRedBlackTree(RedBlackTree):
+    """ The former recursive insertion path, kept here as the baseline of the benchmark. """
+    
+    def insert_rbt(self, n:Node) -> None:
+        if not isinstance(n, Node):
+            raise ValueError("You can only insert nodes!")
+        self.insert(n)
+        self.fix(n)
+        return None
+    
+    def insert(self, n:Node) -> None:
+        if not isinstance(n, Node):
+            raise ValueError("You can only insert nodes!")
+        n.color = red
+        n.right = None
+        n.left = None
+        if self.root is None:
+            self.root = n
+        else:
+            self._insert_recursive(n, self.root)
+        return None
+    
+    def _insert_recursive(self, n:Node, node:Node) -> None:
+        if n.key < node.key:
+            if node.left is None:
+                node.left = n
+                n.parent = node
+                return None
+            else:
+                self._insert_recursive(n, node.left)
+        else:
+            if node.right is None:
+                node.right = n
+                n.parent = node
+                return None
+            else:
+                self._insert_recursive(n, node.right)
+    
+    def fix(self, n:Node) -> None:
+        if not isinstance(n, Node):
+            raise ValueError("You can only insert nodes!")
+        p = self.get_parent(n)
+        if p is None:
+            n.color = black
+            return None
+        if p.color is black:
+            return None
+        u = self.get_uncle(n)
+        g = self.get_grand_parent(n)
+        if (p.color is red) and (u is not None) and (u.color is red):
+            p.color = black
+            u.color = black
+            g.color = red
+            self.fix(g)
+            return None
+        if (p.color is red) and ((u is None) or (u.color is black)):
+            self._case_1_recursive(n)
+        else:
+            raise Exception("Something went wrong in fix!")
+    
+    def _case_1_recursive(self, n:Node) -> None:
+        p = self.get_parent(n)
+        g = self.get_grand_parent(n)
+        if (n is p.right) and (g is not None) and (p is g.left):
+            self.rotate_around(p, left)
+            n = n.left
+        elif (n is p.left) and (g is not None) and (p is g.right):
+            self.rotate_around(p, right)
+            n = n.right
+        return self._case_2_recursive(n)
+    
+    def _case_2_recursive(self, n:Node) -> None:
+        p = self.get_parent(n)
+        g = self.get_grand_parent(n)
+        if (n is p.left) and (g is not None) and (p is g.left):
+            self.rotate_around(g, right)
+        elif (n is p.right) and (g is not None) and (p is g.right):
+            self.rotate_around(g, left)
+        else:
+            raise Exception("Something went wrong in case_2!")
+        root = n
+        while (self.get_parent(root) is not None):
+            root = self.get_parent(root)
+        self.root = root
+        p.color = black
+        g.color = red
+        return None
+
+
+
+def insert_all(tree_class, keys:list) -> RedBlackTree:
+    """ The function inserts all keys into a new tree of the given class (like the loops in red_black_tree.py). """
+    tree = tree_class()
+    for k in keys:
+        tree.insert_rbt(Node(k))
+    return tree
+
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", type=int, default=1000000, help="number of inserted keys")
+    parser.add_argument("--repeat", type=int, default=3, help="number of repetitions (the best one counts)")
+    parser.add_argument("--seed", type=int, default=1, help="seed for the random keys")
+    args = parser.parse_args()
+    
+    random.seed(args.seed)
+    distributions = {
+        "random": random.sample(range(10 * args.n), args.n),
+        "sorted": list(range(args.n)),
+        "reverse sorted": list(range(args.n, 0, -1)),
+    }
+    
+    for name, keys in distributions.items():
+        print("%d %s keys:" % (args.n, name))
+        before = best_of(lambda: insert_all(RecursiveRedBlackTree, keys), args.repeat)
+        report("  recursive insert_rbt (baseline)", before, args.n)
+        after = best_of(lambda: insert_all(RedBlackTree, keys), args.repeat)
+        report("  iterative insert_rbt", after, args.n)
+        print("  speedup: %.2fx" % (before / after))
+    return None
+
+
+
+if __name__ == '__main__':
+    main()
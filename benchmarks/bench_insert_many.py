@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+""" 
+Benchmark for the insertion of batches of keys: RedBlackTree.insert_many against the loop
+"for k in batch: tree.insert_rbt(Node(k))", for several batch sizes and a tree which already
+holds n keys. The result is the throughput in inserted keys per second. 
+
+Usage: 
+    python benchmarks/bench_insert_many.py [-n 1000000] [--batches 10,100,1000,10000,100000,1000000]
+"""
+
+import argparse
+import gc
+import random
+import time
+
+import _common  # adds the folder above to the search path
+from red_black_tree import Node, RedBlackTree
+
+
+def measure(base:list, batch:list, insert, repeat:int) -> float:
+    """ The function returns the best runtime of insert(tree, batch) on a new tree with the keys of base. """
+    best = float("inf")
+    for _ in range(repeat):
+        tree = RedBlackTree.from_iterable(base)
+        gc.disable()
+        start = time.perf_counter()
+        insert(tree, batch)
+        best = min(best, time.perf_counter() - start)
+        gc.enable()
+    return best
+
+
+
+def insert_loop(tree:RedBlackTree, batch:list) -> None:
+    for k in batch:
+        tree.insert_rbt(Node(k))
+
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", type=int, default=1000000, help="number of keys in the tree before the batch")
+    parser.add_argument("--batches", default="10,100,1000,10000,100000,1000000", help="comma separated batch sizes")
+    parser.add_argument("--repeat", type=int, default=3, help="number of repetitions (the best one counts)")
+    parser.add_argument("--seed", type=int, default=1, help="seed for the random keys")
+    args = parser.parse_args()
+    
+    random.seed(args.seed)
+    base = [random.randrange(10 * args.n) for _ in range(args.n)]
+    
+    print("tree with %d keys:" % args.n)
+    print("  %10s %21s %21s %9s" % ("batch", "insert_rbt loop", "insert_many", "speedup"))
+    for size in map(int, args.batches.split(",")):
+        batch = [random.randrange(10 * args.n) for _ in range(size)]
+        before = measure(base, batch, insert_loop, args.repeat)
+        after = measure(base, batch, RedBlackTree.insert_many, args.repeat)
+        print("  %10d %14.0f keys/s %14.0f keys/s %8.2fx" % (size, size / before, size / after, before / after))
+    return None
+
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+""" 
+Benchmark for the overlap queries of IntervalRedBlackTree against a scan over a list of
+intervals: n time ranges with random starts and exponentially distributed lengths, queried
+with points and with short ranges. The results of both are compared. 
+
+Usage: 
+    python benchmarks/bench_interval.py [-n 100000] [--queries 1000] [--length 100]
+"""
+
+import argparse
+import random
+
+from _common import best_of, report
+from interval_red_black_tree import IntervalRedBlackTree
+
+
+def build(intervals:list) -> IntervalRedBlackTree:
+    """ The function inserts the intervals one by one with add. """
+    tree = IntervalRedBlackTree()
+    for iv in intervals:
+        tree.add(iv)
+    return tree
+
+
+
+def scan(intervals:list, queries:list) -> list:
+    """ The function answers the queries by checking every interval. """
+    return [[(low, high) for low, high in intervals if (low <= hi) and (lo <= high)] for lo, hi in queries]
+
+
+
+def tree_queries(tree:IntervalRedBlackTree, queries:list) -> list:
+    """ The function answers the queries with the tree. """
+    overlapping = tree.overlapping
+    return [list(overlapping(lo, hi)) for lo, hi in queries]
+
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", type=int, default=100000, help="number of intervals")
+    parser.add_argument("--queries", type=int, default=1000, help="number of queries per kind")
+    parser.add_argument("--length", type=float, default=100, help="mean length of the intervals")
+    parser.add_argument("--repeat", type=int, default=3, help="number of repetitions (the best one counts)")
+    parser.add_argument("--seed", type=int, default=1, help="seed for the random intervals")
+    args = parser.parse_args()
+    
+    random.seed(args.seed)
+    span = 10 * args.n
+    intervals = []
+    for _ in range(args.n):
+        low = random.uniform(0, span)
+        intervals.append((low, low + random.expovariate(1 / args.length)))
+    # (sorted like the results of the tree, so that both can be compared directly)
+    intervals.sort()
+    
+    print("%d intervals:" % args.n)
+    report("  add", best_of(lambda: build(intervals), args.repeat), args.n)
+    report("  from_iterable", best_of(lambda: IntervalRedBlackTree.from_iterable(intervals), args.repeat), args.n)
+    tree = IntervalRedBlackTree.from_iterable(intervals)
+    
+    for kind, width in (("points", 0), ("ranges of width %g" % (10 * args.length), 10 * args.length)):
+        queries = []
+        for _ in range(args.queries):
+            lo = random.uniform(0, span)
+            queries.append((lo, lo + width))
+        expected = scan(intervals, queries)
+        if tree_queries(tree, queries) != expected:
+            raise Exception("The overlapping intervals of the tree differ from the scan!")
+        found = sum(map(len, expected))
+        print("%d queries with %s (%.1f results on average):" % (args.queries, kind, found / args.queries))
+        report("  scan", best_of(lambda: scan(intervals, queries), args.repeat), args.queries)
+        report("  IntervalRedBlackTree.overlapping", best_of(lambda: tree_queries(tree, queries), args.repeat), args.queries)
+    return None
+
+
+
+if __name__ == '__main__':
+    main()
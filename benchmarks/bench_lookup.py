@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+""" 
+Benchmark for the point queries of RedBlackTree (search/__contains__, floor, ceiling,
+successor and predecessor) against a bisect over the output of inorder(). 
+
+Two bisect variants are measured: one on a list which was produced once by inorder() 
+(the lower bound, valid only as long as the tree does not change) and one which calls
+inorder() for every query (as it has to be done for a tree which changes between queries). 
+
+Usage: 
+    python benchmarks/bench_lookup.py [-n 1000000] [--queries 100000]
+"""
+
+import argparse
+import bisect
+import random
+
+from _common import best_of, report
+from red_black_tree import Node, RedBlackTree
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", type=int, default=1000000, help="number of keys in the tree")
+    parser.add_argument("--queries", type=int, default=100000, help="number of queries per method")
+    parser.add_argument("--rebuilds", type=int, default=20, help="number of queries for the inorder()-per-query variant")
+    parser.add_argument("--seed", type=int, default=1, help="seed for the random keys")
+    args = parser.parse_args()
+    
+    random.seed(args.seed)
+    tree = RedBlackTree()
+    for k in random.sample(range(10 * args.n), args.n):
+        tree.insert_rbt(Node(k))
+    ordered = tree.inorder()
+    queries = [random.randrange(10 * args.n) for _ in range(args.queries)]
+    
+    def tree_queries(method):
+        return lambda: [method(q) for q in queries]
+    
+    def bisect_floor(q):
+        i = bisect.bisect_right(ordered, q)
+        return ordered[i - 1] if i else None
+    
+    def bisect_ceiling(q):
+        i = bisect.bisect_left(ordered, q)
+        return ordered[i] if i < len(ordered) else None
+    
+    def bisect_contains(q):
+        i = bisect.bisect_left(ordered, q)
+        return i < len(ordered) and ordered[i] == q
+    
+    print("%d keys, %d queries:" % (args.n, args.queries))
+    for name, method in (("search", tree.search), ("__contains__", tree.__contains__),
+                         ("floor", tree.floor), ("ceiling", tree.ceiling),
+                         ("successor", tree.successor), ("predecessor", tree.predecessor)):
+        report("  RedBlackTree." + name, best_of(tree_queries(method)), args.queries)
+    for name, method in (("contains", bisect_contains), ("floor", bisect_floor), ("ceiling", bisect_ceiling)):
+        report("  bisect on inorder() list, " + name, best_of(tree_queries(method)), args.queries)
+    
+    # the way it has to be done without lookups if the tree changes between the queries
+    few = queries[:args.rebuilds]
+    seconds = best_of(lambda: [bisect.bisect_left(tree.inorder(), q) for q in few], 1)
+    report("  inorder() + bisect per query", seconds, len(few))
+    return None
+
+
+
+if __name__ == '__main__':
+    main()
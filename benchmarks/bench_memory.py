@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+""" 
+Benchmark for the memory per node, measured with tracemalloc. 
+
+The keys are created before the measurement starts, so only the memory of the
+tree structure itself is counted (except for typed arrays, which copy the keys). 
+
+Usage: 
+    python benchmarks/bench_memory.py [-n 1000000]
+"""
+
+import argparse
+import random
+import tracemalloc
+
+import _common  # adds the folder above to the search path
+from array_red_black_tree import ArrayRedBlackTree
+from red_black_tree import Node, RedBlackTree
+
+
+class DictNode:
+    """ A node like the former Node class, whose attributes were stored in a __dict__. """
+    
+    def __init__(self, key):
+        self.key = key
+        self.parent = None
+        self.left = None
+        self.right = None
+        self.color = 1
+
+
+
+def bytes_per_node(build, n:int) -> float:
+    """ The function returns the memory allocated by build() (and still alive) divided by n. """
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    tree = build()
+    size = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    del tree
+    return size / n
+
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", type=int, default=1000000, help="number of inserted keys")
+    parser.add_argument("--seed", type=int, default=1, help="seed for the random keys")
+    args = parser.parse_args()
+    
+    random.seed(args.seed)
+    keys = random.sample(range(10 * args.n), args.n)
+    
+    def node_tree() -> RedBlackTree:
+        tree = RedBlackTree()
+        for k in keys:
+            tree.insert_rbt(Node(k))
+        return tree
+    
+    def array_tree(typecode) -> ArrayRedBlackTree:
+        tree = ArrayRedBlackTree(typecode)
+        for k in keys:
+            tree.insert(k)
+        return tree
+    
+    candidates = [
+        ("Node with __dict__ (former, nodes only)", lambda: [DictNode(k) for k in keys]),
+        ("RedBlackTree (Node with __slots__)", node_tree),
+        ("ArrayRedBlackTree (list of keys)", lambda: array_tree(None)),
+        ("ArrayRedBlackTree (typecode 'q')", lambda: array_tree("q")),
+    ]
+    print("%d random int keys:" % args.n)
+    for name, build in candidates:
+        print("  %-42s %8.1f bytes/node" % (name, bytes_per_node(build, args.n)))
+    return None
+
+
+
+if __name__ == '__main__':
+    main()
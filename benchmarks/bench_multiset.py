@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+""" 
+Benchmark for the multiset mode of RedBlackTree with a low-cardinality stream, like
+latencies in whole milliseconds for a histogram (log-normally distributed, a few hundred
+distinct values among n keys). 
+
+Measured are add and insert_many, the iteration over all keys and the memory which the
+tree keeps alive (with tracemalloc), for the default tree (one node per key) and for the
+multiset (one node per distinct key, which counts its equal keys). 
+
+Usage: 
+    python benchmarks/bench_multiset.py [-n 1000000] [--sigma 0.5]
+"""
+
+import argparse
+import random
+import tracemalloc
+
+from _common import best_of, report
+from red_black_tree import RedBlackTree
+
+
+def build(keys:list, **options) -> RedBlackTree:
+    """ The function inserts the keys one by one with add. """
+    tree = RedBlackTree(**options)
+    add = tree.add
+    for k in keys:
+        add(k)
+    return tree
+
+
+
+def bytes_per_key(build, n:int) -> float:
+    """ The function returns the memory allocated by build() (and still alive) divided by n. """
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    tree = build()
+    size = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    del tree
+    return size / n
+
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", type=int, default=1000000, help="number of keys")
+    parser.add_argument("--sigma", type=float, default=0.5, help="sigma of the log-normal distribution")
+    parser.add_argument("--repeat", type=int, default=3, help="number of repetitions (the best one counts)")
+    parser.add_argument("--seed", type=int, default=1, help="seed for the random keys")
+    args = parser.parse_args()
+    
+    random.seed(args.seed)
+    n = args.n
+    keys = [int(random.lognormvariate(3, args.sigma)) for _ in range(n)]
+    print("%d latencies with %d distinct values:" % (n, len(set(keys))))
+    
+    for name, options in (("default", {}), ("multiset", {"multiset": True})):
+        report("  add, %s" % name, best_of(lambda: build(keys, **options), args.repeat), n)
+        report("  insert_many, %s" % name, best_of(lambda: RedBlackTree(**options).insert_many(keys), args.repeat), n)
+        tree = build(keys, **options)
+        report("  iteration, %s" % name, best_of(lambda: sum(1 for _ in tree), args.repeat), n)
+        print("  %-38s %10.2f bytes/key" % ("memory, %s" % name, bytes_per_key(lambda: build(keys, **options), n)))
+        del tree
+    return None
+
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+""" 
+Benchmark for the order statistics of RedBlackTree(order_statistics=True), i.e. rank,
+select and count_range, against the same queries answered with the list of inorder(). 
+
+Since the tree changes between the queries in a live key set, the list has to be built
+again for every query; a list which is built once is measured as the lower bound. 
+
+Usage: 
+    python benchmarks/bench_order_statistics.py [-n 1000000] [--queries 100000]
+"""
+
+import argparse
+import bisect
+import random
+
+from _common import best_of, report
+from red_black_tree import RedBlackTree
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", type=int, default=1000000, help="number of keys in the tree")
+    parser.add_argument("--queries", type=int, default=100000, help="number of queries per method")
+    parser.add_argument("--rebuilds", type=int, default=20, help="number of queries for the inorder()-per-query variant")
+    parser.add_argument("--seed", type=int, default=1, help="seed for the random keys")
+    args = parser.parse_args()
+    
+    random.seed(args.seed)
+    tree = RedBlackTree.from_iterable(random.sample(range(10 * args.n), args.n), order_statistics=True)
+    ordered = tree.inorder()
+    keys = [random.randrange(10 * args.n) for _ in range(args.queries)]
+    indices = [random.randrange(args.n) for _ in range(args.queries)]
+    ranges = [tuple(sorted(random.sample(range(10 * args.n), 2))) for _ in range(args.queries)]
+    
+    print("%d keys, %d queries:" % (args.n, args.queries))
+    report("  rank", best_of(lambda: [tree.rank(k) for k in keys]), args.queries)
+    report("  select (99th percentile etc.)", best_of(lambda: [tree.select(i) for i in indices]), args.queries)
+    report("  count_range", best_of(lambda: [tree.count_range(lo, hi) for lo, hi in ranges]), args.queries)
+    
+    report("  bisect on inorder() list, rank", best_of(lambda: [bisect.bisect_left(ordered, k) for k in keys]), args.queries)
+    report("  inorder() list, index", best_of(lambda: [ordered[i] for i in indices]), args.queries)
+    report("  bisect on inorder() list, count", best_of(lambda: [bisect.bisect_right(ordered, hi) - bisect.bisect_left(ordered, lo) for lo, hi in ranges]), args.queries)
+    
+    few = keys[:args.rebuilds]
+    report("  inorder() + bisect per query", best_of(lambda: [bisect.bisect_left(tree.inorder(), k) for k in few], 1), len(few))
+    return None
+
+
+
+if __name__ == '__main__':
+    main()
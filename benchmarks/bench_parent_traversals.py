@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+""" 
+Regression benchmark for the number of parent-pointer traversals per insertion. 
+
+Every read of Node.parent is counted while keys are inserted with insert_rbt. 
+Before rotate_around kept the root up to date, _case_2 searched the new root by
+following the parents from the inserted node to the top after every rotation,
+which is reproduced by RootSearchingRedBlackTree as the baseline. 
+The reads per insertion must stay constant on average (and must not grow with log n). 
+
+Usage: 
+    python benchmarks/bench_parent_traversals.py [-n 100000]
+"""
+
+import argparse
+import random
+
+import _common  # adds the folder above to the search path
+from red_black_tree import Node, RedBlackTree, black, red, left, right
+
+
+class CountingNode(Node):
+    """ A node which counts every access of its parent pointer. """
+    
+    reads = 0
+    
+    def __init__(self, key, color:int = red):
+        self._parent = None
+        super().__init__(key, color)
+    
+    @property
+    def parent(self):
+        CountingNode.reads += 1
+        return self._parent
+    
+    @parent.setter
+    def parent(self, p):
+        self._parent = p
+
+
+
+class RootSearchingRedBlackTree(RedBlackTree):
+    """ The former case 2, which searched the root from the inserted node after the rotation. """
+    
+    def _case_2(self, n:Node) -> None:
+        p = n.parent
+        g = p.parent
+        if (n is p.left) and (p is g.left):
+            self.rotate_around(g, right)
+        elif (n is p.right) and (p is g.right):
+            self.rotate_around(g, left)
+        else:
+            raise Exception("Something went wrong in case_2!")
+        root = n
+        while (self.get_parent(root) is not None):
+            root = self.get_parent(root)
+        self.root = root
+        p.color = black
+        g.color = red
+        return None
+
+
+
+def count_reads(tree_class, keys:list) -> float:
+    """ The function returns the average number of parent reads per insertion of the keys. """
+    tree = tree_class()
+    CountingNode.reads = 0
+    for k in keys:
+        tree.insert_rbt(CountingNode(k))
+    return CountingNode.reads / len(keys)
+
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", type=int, default=100000, help="largest number of inserted keys")
+    parser.add_argument("--seed", type=int, default=1, help="seed for the random keys")
+    args = parser.parse_args()
+    
+    random.seed(args.seed)
+    print("%-10s %-16s %14s %14s" % ("n", "keys", "root search", "rotate_around"))
+    n = 1000
+    while n <= args.n:
+        for name, keys in (("random", random.sample(range(10 * n), n)), ("sorted", list(range(n)))):
+            before = count_reads(RootSearchingRedBlackTree, keys)
+            after = count_reads(RedBlackTree, keys)
+            print("%-10d %-16s %14.2f %14.2f" % (n, name, before, after))
+        n *= 10
+    return None
+
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+""" 
+Benchmark for snapshots: a RedBlackTree which is copied with copy.deepcopy for every snapshot
+against a PersistentRedBlackTree, where a snapshot is the reference to the current version. 
+
+A writer inserts --updates keys into a tree with n keys and takes a snapshot after every
+--every insertions. Measured are the runtime of a snapshot, the runtime of an insertion and
+the memory which is still alive while all snapshots are held (with tracemalloc). 
+
+Usage: 
+    python benchmarks/bench_persistent.py [-n 100000] [--updates 1000] [--every 100]
+"""
+
+import argparse
+import copy
+import random
+import sys
+import time
+import tracemalloc
+
+from _common import best_of, report
+from persistent_red_black_tree import PersistentRedBlackTree
+from red_black_tree import Node, RedBlackTree
+
+
+def mutable_writer(base:list, updates:list, every:int) -> tuple:
+    """ The function inserts the updates into a RedBlackTree and deep-copies it for every snapshot. """
+    tree = RedBlackTree.from_sorted(base)
+    snapshots = []
+    copying = 0.0
+    for i, k in enumerate(updates, 1):
+        tree.insert_rbt(Node(k))
+        if i % every == 0:
+            start = time.perf_counter()
+            snapshots.append(copy.deepcopy(tree))
+            copying += time.perf_counter() - start
+    return snapshots, copying
+
+
+
+def persistent_writer(base:list, updates:list, every:int) -> tuple:
+    """ The function inserts the updates into a PersistentRedBlackTree and keeps a reference for every snapshot. """
+    tree = PersistentRedBlackTree.from_sorted(base)
+    snapshots = []
+    copying = 0.0
+    for i, k in enumerate(updates, 1):
+        tree = tree.insert(k)
+        if i % every == 0:
+            start = time.perf_counter()
+            snapshots.append(tree)
+            copying += time.perf_counter() - start
+    return snapshots, copying
+
+
+
+def retained_memory(writer, base:list, updates:list, every:int) -> int:
+    """ The function returns the memory which the snapshots of the writer (and their tree) keep alive. """
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    snapshots, _ = writer(base, updates, every)
+    size = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    del snapshots
+    return size
+
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", type=int, default=100000, help="number of keys in the tree before the updates")
+    parser.add_argument("--updates", type=int, default=1000, help="number of inserted keys")
+    parser.add_argument("--every", type=int, default=100, help="number of insertions between two snapshots")
+    parser.add_argument("--repeat", type=int, default=3, help="number of repetitions (the best one counts)")
+    parser.add_argument("--seed", type=int, default=1, help="seed for the random keys")
+    args = parser.parse_args()
+    
+    random.seed(args.seed)
+    base = sorted(random.sample(range(10 * args.n), args.n))
+    updates = [random.randrange(10 * args.n) for _ in range(args.updates)]
+    snapshots = args.updates // args.every
+    # deepcopy follows the parent and child pointers recursively
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10000))
+    
+    print("tree with %d keys, %d insertions, a snapshot after every %d:" % (args.n, args.updates, args.every))
+    for name, writer in (("deepcopy of RedBlackTree", mutable_writer), ("PersistentRedBlackTree", persistent_writer)):
+        copying = min(writer(base, updates, args.every)[1] for _ in range(args.repeat))
+        print("  %-36s %12.6f s per snapshot" % (name, copying / max(snapshots, 1)))
+    
+    tree = RedBlackTree.from_sorted(base)
+    report("  RedBlackTree.insert_rbt", best_of(lambda: [tree.insert_rbt(Node(k)) for k in updates], args.repeat), args.updates)
+    persistent = PersistentRedBlackTree.from_sorted(base)
+    
+    def persistent_inserts() -> None:
+        version = persistent
+        for k in updates:
+            version = version.insert(k)
+    
+    report("  PersistentRedBlackTree.insert", best_of(persistent_inserts, args.repeat), args.updates)
+    
+    print("memory kept alive by the tree and its %d snapshots:" % snapshots)
+    for name, writer in (("deepcopy of RedBlackTree", mutable_writer), ("PersistentRedBlackTree", persistent_writer)):
+        size = retained_memory(writer, base, updates, args.every)
+        print("  %-36s %12.1f MB %10.1f bytes/key" % (name, size / 2**20, size / args.n))
+    return None
+
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+""" 
+Benchmark for the startup of a process which needs a tree with n keys: rebuilding it with
+insert_rbt (like before), RedBlackTree.from_sorted, RedBlackTree.load of a dumped tree, and
+opening a MappedRedBlackTree. Every variant runs in a new process, which reports its startup
+time, the time of --lookups lookups and its peak resident memory (Unix only). 
+
+Usage: 
+    python benchmarks/bench_serialization.py [-n 1000000] [--lookups 100000]
+"""
+
+import argparse
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import _common  # adds the folder above to the search path
+from mapped_red_black_tree import MappedRedBlackTree
+from red_black_tree import Node, RedBlackTree
+
+
+def child(mode:str, path:str, n:int, lookups:int, seed:int) -> None:
+    """ The function starts the tree in the input mode and prints the measured values (runs in a new process). """
+    random.seed(seed)
+    keys = random.sample(range(10 * n), n) if mode in ("insert_rbt", "from_sorted") else None
+    
+    start = time.perf_counter()
+    if mode == "insert_rbt":
+        tree = RedBlackTree()
+        for k in keys:
+            tree.insert_rbt(Node(k))
+    elif mode == "from_sorted":
+        tree = RedBlackTree.from_sorted(sorted(keys))
+    elif mode == "load":
+        tree = RedBlackTree.load(path)
+    else:
+        tree = MappedRedBlackTree(path)
+    startup = time.perf_counter() - start
+    
+    rnd = random.Random(seed + 1)
+    queries = [rnd.randrange(10 * n) for _ in range(lookups)]
+    start = time.perf_counter()
+    for q in queries:
+        q in tree
+    lookup = time.perf_counter() - start
+    
+    print(startup, lookup, peak_rss())
+    return None
+
+
+
+def peak_rss() -> int:
+    """ The function returns the peak resident memory of this process in kilobytes. """
+    # on Linux, ru_maxrss survives the exec of a new process (so it would include the peak of the parent);
+    # VmHWM of /proc is reset with the new address space
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    # ru_maxrss is given in kilobytes on Linux and in bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        rss //= 1024
+    return rss
+
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", type=int, default=1000000, help="number of keys")
+    parser.add_argument("--lookups", type=int, default=100000, help="number of lookups after the startup")
+    parser.add_argument("--seed", type=int, default=1, help="seed for the random keys")
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.child:
+        child(args.child[0], args.child[1], args.n, args.lookups, args.seed)
+        return None
+    
+    random.seed(args.seed)
+    tree = RedBlackTree.from_iterable(random.sample(range(10 * args.n), args.n))
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "tree.rbt")
+        tree.dump(path)
+        del tree
+        print("%d random int keys, file size %.1f MB:" % (args.n, os.path.getsize(path) / 2**20))
+        print("  %-26s %12s %16s %14s" % ("startup with", "startup", "lookups/s", "peak RSS"))
+        for mode in ("insert_rbt", "from_sorted", "load", "MappedRedBlackTree"):
+            command = [sys.executable, os.path.abspath(__file__), "-n", str(args.n), "--lookups", str(args.lookups),
+                       "--seed", str(args.seed), "--child", mode, path]
+            startup, lookup, rss = subprocess.run(command, check=True, capture_output=True, text=True).stdout.split()
+            print("  %-26s %10.3f s %16.0f %11.1f MB" % (mode, float(startup), args.lookups / float(lookup), int(rss) / 1024))
+    return None
+
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+""" 
+Scaling benchmark for the bulk load of ShardedRedBlackTree with 1, 2, 4, ... processes,
+compared with RedBlackTree.from_iterable in a single process. Afterwards inorder and
+range queries over the shards are measured. 
+
+The sort is done in the processes, the nodes are created in the main process (trees with
+parent pointers cannot be sent between processes in O(n)), so the speedup is limited by
+this serial part. 
+
+Usage: 
+    python benchmarks/bench_sharded.py [-n 10000000] [--workers 1,2,4,8] [--repeat 1]
+"""
+
+import argparse
+import os
+import random
+
+from _common import best_of, report
+from red_black_tree import RedBlackTree
+from sharded_red_black_tree import ShardedRedBlackTree
+
+
+def main() -> None:
+    cpus = os.cpu_count() or 1
+    default_workers = ",".join(str(2**i) for i in range(cpus.bit_length()) if 2**i <= cpus)
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", type=int, default=10000000, help="number of keys")
+    parser.add_argument("--workers", default=default_workers, help="comma separated numbers of processes")
+    parser.add_argument("--queries", type=int, default=10000, help="number of range queries")
+    parser.add_argument("--repeat", type=int, default=1, help="number of repetitions (the best one counts)")
+    parser.add_argument("--seed", type=int, default=1, help="seed for the random keys")
+    args = parser.parse_args()
+    
+    random.seed(args.seed)
+    keys = [random.randrange(10 * args.n) for _ in range(args.n)]
+    
+    print("bulk load of %d random keys (%d CPUs):" % (args.n, cpus))
+    single = best_of(lambda: RedBlackTree.from_iterable(keys), args.repeat)
+    report("  RedBlackTree.from_iterable", single, args.n)
+    for workers in map(int, args.workers.split(",")):
+        seconds = best_of(lambda: ShardedRedBlackTree.from_iterable(keys, shards=workers, workers=workers), args.repeat)
+        report("  ShardedRedBlackTree, %d processes" % workers, seconds, args.n)
+        print("  %40s %10.2fx" % ("speedup", single / seconds))
+    
+    tree = ShardedRedBlackTree.from_iterable(keys, shards=max(map(int, args.workers.split(","))))
+    print("queries on %d shards:" % len(tree.shards))
+    report("  inorder", best_of(tree.inorder, args.repeat), args.n)
+    starts = [random.randrange(10 * args.n) for _ in range(args.queries)]
+    width = 1000
+    
+    def ranges() -> None:
+        for lo in starts:
+            for _ in tree.irange(lo, lo + width):
+                pass
+    
+    report("  irange (width %d)" % width, best_of(ranges, args.repeat), args.queries)
+    return None
+
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+""" 
+Reproducible benchmark suite: insert_rbt, insert, inorder, minimum/maximum and the memory
+per node of RedBlackTree for several key distributions and sizes, written to a JSON file
+(so that the results of two versions can be compared). 
+
+If sortedcontainers is installed, SortedList is measured as a baseline, and a list which is
+kept sorted with bisect.insort is measured up to --bisect-max keys (each insertion is O(n)). 
+The unbalanced insert degenerates to a linked list for sorted keys and duplicates, so it is
+measured up to --unbalanced-max keys for the distributions other than random. 
+
+The keys are generated from --seed, the distribution and the size, so every run (and every
+subset of the sizes or distributions) uses the same keys. 
+
+Usage: 
+    python benchmarks/bench_suite.py [--sizes 1000,10000,100000,1000000] [--output results.json]
+    python benchmarks/bench_suite.py --sizes 10000000 --distributions random,zipf --repeat 1
+"""
+
+import argparse
+import bisect
+import itertools
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from _common import best_of
+from red_black_tree import Node, RedBlackTree
+
+try:
+    from sortedcontainers import SortedList
+except ImportError:
+    SortedList = None
+
+
+distributions = ("random", "sorted", "reverse", "duplicates", "zipf")
+
+def make_keys(distribution:str, n:int, seed:int) -> list:
+    """ The function returns n keys of the input distribution (always the same ones for the same arguments). """
+    rnd = random.Random("%d-%s-%d" % (seed, distribution, n))
+    if distribution == "random":
+        return [rnd.random() for _ in range(n)]
+    if distribution == "sorted":
+        return list(range(n))
+    if distribution == "reverse":
+        return list(range(n, 0, -1))
+    if distribution == "duplicates":
+        # about 100 copies of every key
+        return [rnd.randrange(n // 100 + 1) for _ in range(n)]
+    if distribution == "zipf":
+        # key k (from 1 to n) with a probability proportional to 1 / k**1.1, in random order
+        weights = list(itertools.accumulate(1 / k**1.1 for k in range(1, n + 1)))
+        return rnd.choices(range(1, n + 1), cum_weights=weights, k=n)
+    raise ValueError("That was no possible distribution in this context!")
+
+
+
+def bytes_per_key(build, n:int) -> float:
+    """ The function returns the memory allocated by build() (and still alive) divided by n. """
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    structure = build()
+    size = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    del structure
+    return size / n
+
+
+
+def implementations(args) -> dict:
+    """ The function returns the measured data structures with their operations (and their limits of n). """
+    def rbt_insert_rbt(keys:list) -> RedBlackTree:
+        tree = RedBlackTree()
+        for k in keys:
+            tree.insert_rbt(Node(k))
+        return tree
+    
+    def rbt_insert(keys:list) -> RedBlackTree:
+        tree = RedBlackTree()
+        for k in keys:
+            tree.insert(Node(k))
+        return tree
+    
+    def rbt_min_max(tree:RedBlackTree, calls:int) -> None:
+        for _ in range(calls):
+            tree.minimum()
+            tree.maximum()
+    
+    result = {
+        "RedBlackTree": {
+            "insert_rbt": rbt_insert_rbt,
+            "insert": rbt_insert,
+            "inorder": RedBlackTree.inorder,
+            "minimum/maximum": rbt_min_max,
+            "memory": rbt_insert_rbt,
+        },
+    }
+    
+    def insort_list(keys:list) -> list:
+        ordered = []
+        for k in keys:
+            bisect.insort(ordered, k)
+        return ordered
+    
+    def list_min_max(ordered:list, calls:int) -> None:
+        for _ in range(calls):
+            ordered[0]
+            ordered[-1]
+    
+    result["bisect list"] = {
+        "insert": insort_list,
+        "inorder": list,
+        "minimum/maximum": list_min_max,
+        "memory": sorted,
+        "max_n": args.bisect_max,
+    }
+    
+    if SortedList is not None:
+        def sorted_list_add(keys:list) -> SortedList:
+            ordered = SortedList()
+            for k in keys:
+                ordered.add(k)
+            return ordered
+        
+        result["SortedList"] = {
+            "insert": sorted_list_add,
+            "inorder": list,
+            "minimum/maximum": list_min_max,
+            "memory": SortedList,
+        }
+    return result
+
+
+
+def run(args) -> dict:
+    """ The function runs all measurements and returns them as a JSON-serializable dictionary. """
+    report = {
+        "python": sys.version,
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "sortedcontainers": SortedList is not None,
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "started": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": [],
+    }
+    
+    def record(distribution:str, n:int, name:str, operation:str, ops:int, seconds) -> None:
+        entry = {"distribution": distribution, "n": n, "implementation": name, "operation": operation}
+        if seconds is None:
+            entry["skipped"] = True
+            print("  %-14s %-16s %-16s %9s" % (name, operation, "", "skipped"))
+        else:
+            entry.update(seconds=seconds, ops_per_second=ops / seconds if seconds else None)
+            print("  %-14s %-16s %12.4f s %14.0f ops/s" % (name, operation, seconds, ops / seconds if seconds else float("inf")))
+        report["results"].append(entry)
+        return None
+    
+    measured = implementations(args)
+    for n in map(int, args.sizes.split(",")):
+        for distribution in args.distributions.split(","):
+            keys = make_keys(distribution, n, args.seed)
+            print("%s keys, n = %d:" % (distribution, n))
+            for name, operations in measured.items():
+                if n > operations.get("max_n", n):
+                    record(distribution, n, name, "insert", n, None)
+                    continue
+                structure = None
+                for operation in ("insert_rbt", "insert"):
+                    if operation not in operations:
+                        continue
+                    if (name == "RedBlackTree") and (operation == "insert") and (distribution != "random") and (n > args.unbalanced_max):
+                        record(distribution, n, name, operation, n, None)
+                        continue
+                    build = operations[operation]
+                    record(distribution, n, name, operation, n, best_of(lambda: build(keys), args.repeat))
+                    if structure is None:
+                        structure = build(keys)
+                
+                record(distribution, n, name, "inorder", n, best_of(lambda: operations["inorder"](structure), args.repeat))
+                calls = 10000
+                min_max = operations["minimum/maximum"]
+                record(distribution, n, name, "minimum/maximum", 2 * calls, best_of(lambda: min_max(structure, calls), args.repeat))
+                del structure
+        
+        # the memory per key does not depend on the distribution of the keys
+        if not args.no_memory:
+            keys = make_keys("random", n, args.seed)
+            for name, operations in measured.items():
+                size = bytes_per_key(lambda: operations["memory"](keys), n)
+                report["results"].append({"distribution": "random", "n": n, "implementation": name,
+                                          "operation": "memory", "bytes_per_key": size})
+                print("  %-14s %-16s %12.1f bytes/key" % (name, "memory", size))
+    return report
+
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000,100000,1000000", help="comma separated numbers of keys (up to 10000000)")
+    parser.add_argument("--distributions", default=",".join(distributions), help="comma separated distributions of the keys")
+    parser.add_argument("--repeat", type=int, default=3, help="number of repetitions (the best one counts)")
+    parser.add_argument("--seed", type=int, default=1, help="seed for the keys")
+    parser.add_argument("--bisect-max", type=int, default=100000, help="largest n for the bisect.insort baseline")
+    parser.add_argument("--unbalanced-max", type=int, default=10000, help="largest n for insert with keys which are not random")
+    parser.add_argument("--no-memory", action="store_true", help="skip the measurement of the memory")
+    parser.add_argument("--output", default="bench_results.json", help="path of the JSON file with the results")
+    args = parser.parse_args()
+    
+    for distribution in args.distributions.split(","):
+        if distribution not in distributions:
+            parser.error("unknown distribution %r (possible: %s)" % (distribution, ", ".join(distributions)))
+    
+    report = run(args)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=1)
+    print("results written to", args.output)
+    return None
+
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+""" 
+Benchmark for the typed mode and for key functions of RedBlackTree. 
+
+Numeric keys: the default nodes (which check every key) against typed=int resp. typed=float,
+whose nodes skip the check, for from_sorted (which creates and links the nodes only), insert_many and add. 
+
+Records: a key function (computed once per node and cached in it) against the usual workaround,
+inserting (key, record) tuples, which compares whole tuples at every level of the search. 
+
+Usage: 
+    python benchmarks/bench_typed.py [-n 1000000] [--repeat 3]
+"""
+
+import argparse
+import random
+
+from _common import best_of, report
+from red_black_tree import Node, RedBlackTree
+
+
+def build(keys:list, **options) -> RedBlackTree:
+    """ The function inserts the keys one by one with add. """
+    tree = RedBlackTree(**options)
+    add = tree.add
+    for k in keys:
+        add(k)
+    return tree
+
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", type=int, default=1000000, help="number of keys")
+    parser.add_argument("--repeat", type=int, default=3, help="number of repetitions (the best one counts)")
+    parser.add_argument("--seed", type=int, default=1, help="seed for the random keys")
+    args = parser.parse_args()
+    
+    random.seed(args.seed)
+    n = args.n
+    ints = [random.randrange(10 * n) for _ in range(n)]
+    floats = [random.random() for _ in range(n)]
+    
+    for name, keys, typed in (("int", ints, int), ("float", floats, float)):
+        print("%d random %s keys:" % (n, name))
+        ordered = sorted(keys)
+        report("  from_sorted, default", best_of(lambda: RedBlackTree.from_sorted(ordered), args.repeat), n)
+        report("  from_sorted, typed=%s" % name, best_of(lambda: RedBlackTree.from_sorted(ordered, typed=typed), args.repeat), n)
+        report("  add, default", best_of(lambda: build(keys), args.repeat), n)
+        report("  add, typed=%s" % name, best_of(lambda: build(keys, typed=typed), args.repeat), n)
+        report("  insert_many, default", best_of(lambda: RedBlackTree().insert_many(keys), args.repeat), n)
+        report("  insert_many, typed=%s" % name, best_of(lambda: RedBlackTree(typed=typed).insert_many(keys), args.repeat), n)
+    
+    records = [{"id": k, "name": "record %d" % k} for k in ints]
+    print("%d records ordered by their id:" % n)
+    report("  add, key function", best_of(lambda: build(records, key=lambda r: r["id"]), args.repeat), n)
+    report("  add, key function, typed=int", best_of(lambda: build(records, key=lambda r: r["id"], typed=int), args.repeat), n)
+    
+    def tuples() -> None:
+        tree = RedBlackTree()
+        for i, r in enumerate(records):
+            # (the index breaks the ties, since the records themselves can not be compared)
+            tree.insert_rbt(Node((r["id"], i, r)))
+    
+    report("  insert_rbt, (id, index, record) keys", best_of(tuples, args.repeat), n)
+    return None
+
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,303 @@
+# -*- coding: utf-8 -*-
+""" 
+A red black tree of red_black_tree.py which keeps only the last N keys, or the keys of the
+last T seconds, e.g. for rolling quantiles over a stream of values. 
+
+Besides their links in the tree, the nodes are linked in the order of their insertion (in the
+slots older and newer, an intrusive doubly linked list), so the oldest node is found in O(1) 
+and an insertion together with the eviction of the oldest node costs O(log n), without ever
+rebuilding the tree. 
+"""
+
+import time
+from typing import Union
+
+from red_black_tree import Node, RedBlackTree
+
+
+###############################################################################
+
+class BoundedRedBlackTree(RedBlackTree):
+    """ 
+    This is a class for a red black tree which evicts its oldest keys (in the order of their insertion) 
+    as soon as it holds more than capacity keys, or as soon as they are older than window seconds. 
+    
+    All ways to insert (add, insert_rbt, insert_many, ...) append the new node to the list of the
+    insertion order, and all ways to delete (delete, pop_min, ..., and the evictions) unlink it. 
+    With order_statistics=True, rank, select and quantile answer rolling queries in O(log n). 
+    Multisets, split, join and the set operations are not supported (they would mix up the order). 
+    
+    Attributes: 
+        root (Node, None): The root node, i.e. the initial node of the tree. 
+        capacity (int, None): The maximum number of keys, or None for no limit. 
+        window (float, None): The maximum age of the keys in seconds, or None for no limit. 
+        clock (callable): The function which returns the current time for add (time.monotonic by default). 
+    """
+    
+    _fields = ("older", "newer")
+    
+    
+    
+    def __init__(self, capacity:Union[int,None] = None, window:Union[float,None] = None, clock = time.monotonic, **options):
+        """ 
+        The constructor for BoundedRedBlackTrees. 
+        
+        Parameters: 
+            capacity (int, None): The maximum number of keys (None by default, i.e. no limit). 
+            window (float, None): The maximum age of the keys in seconds (None by default, i.e. no limit). 
+            clock (callable): The function which returns the current time (time.monotonic by default). 
+            options: The keyword arguments for the constructor of RedBlackTree (e.g. order_statistics=True). 
+        """
+        if (capacity is None) and (window is None):
+            raise ValueError("A bounded tree needs a capacity or a window!")
+        if (capacity is not None) and (capacity < 1):
+            raise ValueError("The capacity must be positive!")
+        if (window is not None) and not (window > 0):
+            raise ValueError("The window must be positive!")
+        if options.get("multiset"):
+            raise ValueError("A bounded tree can not be a multiset (each key needs its own node)!")
+        # only a window needs the time of the insertion in every node
+        if window is not None:
+            self._fields = self._fields + ("time",)
+        super().__init__(**options)
+        self.capacity = capacity
+        self.window = window
+        self.clock = clock
+        # the ends of the list of the insertion order
+        self._oldest = None
+        self._newest = None
+    
+    
+    
+    @classmethod
+    def from_iterable(cls, iterable, **options) -> "BoundedRedBlackTree":
+        """ 
+        The function builds a bounded tree from keys which are inserted in the given order
+        (so only the last ones are kept). 
+        
+        Parameters: 
+            iterable: The keys in the order of their insertion. 
+            options: The keyword arguments for the constructor (e.g. capacity=1000). 
+            
+        Returns: 
+            BoundedRedBlackTree: The new tree. 
+        """
+        tree = cls(**options)
+        tree.insert_many(iterable)
+        return tree
+    
+    # (the keys are inserted in the given order anyway, sorted or not)
+    from_sorted = from_iterable
+    
+    ###########################################################################
+    # insertion and eviction
+    def add(self, item, timestamp:Union[float,None] = None) -> None:
+        """ 
+        The function inserts the input key (resp. item) as the newest one and evicts the oldest keys
+        which exceed the capacity or the window. 
+        
+        Parameters: 
+            item: The key (resp. the item if the tree has a key function). 
+            timestamp (float, None): The time of the insertion (None by default, i.e. clock()); the timestamps
+                must not decrease from one insertion to the next. 
+                
+        Returns: 
+            None
+        """
+        n = self._make_node(item)
+        self._insert(n)
+        self._fix(n)
+        self._append(n, timestamp)
+        return None
+    
+    
+    
+    def insert_rbt(self, n:Node, timestamp:Union[float,None] = None) -> None:
+        """ 
+        The function inserts the input node as the newest one (see add). 
+        
+        Parameters: 
+            n (Node): The node which is inserted. 
+            timestamp (float, None): The time of the insertion (None by default, i.e. clock()). 
+            
+        Returns: 
+            None
+        """
+        super().insert_rbt(n)
+        self._append(n, timestamp)
+        return None
+    
+    
+    
+    def insert(self, n:Node, timestamp:Union[float,None] = None) -> None:
+        """ The function inserts the input node like insert_rbt (a bounded tree is always balanced). """
+        self.insert_rbt(n, timestamp)
+        return None
+    
+    
+    
+    def insert_many(self, iterable, timestamp:Union[float,None] = None) -> None:
+        """ 
+        The function inserts the input keys one after another in the given order (with the same timestamp). 
+        
+        Parameters: 
+            iterable: The keys which are inserted. 
+            timestamp (float, None): The time of the insertions (None by default, i.e. clock() once for the batch). 
+            
+        Returns: 
+            None
+        """
+        if (timestamp is None) and (self.window is not None):
+            timestamp = self.clock()
+        keys = list(iterable)
+        # the keys before the last capacity ones would be evicted by the batch itself
+        if self.capacity is not None:
+            keys = keys[-self.capacity:]
+        for k in keys:
+            self.add(k, timestamp)
+        return None
+    
+    
+    
+    # link the inserted node n as the newest one and evict the keys which exceed the bounds
+    def _append(self, n:Node, timestamp:Union[float,None]) -> None:
+        newest = self._newest
+        n.older = newest
+        n.newer = None
+        if newest is None:
+            self._oldest = n
+        else:
+            newest.newer = n
+        self._newest = n
+        
+        if self.window is not None:
+            if timestamp is None:
+                timestamp = self.clock()
+            if (newest is not None) and (timestamp < newest.time):
+                self._delete(n)
+                raise ValueError("The timestamps must not decrease!")
+            n.time = timestamp
+            self.expire(timestamp)
+        if self.capacity is not None:
+            while self._length > self.capacity:
+                self._delete(self._oldest)
+        return None
+    
+    
+    
+    def expire(self, now:Union[float,None] = None) -> None:
+        """ 
+        The function evicts the keys which are older than window seconds (e.g. before a query after a pause
+        of the stream, since the keys are only evicted when a new key is inserted otherwise). 
+        
+        Parameter: 
+            now (float, None): The current time (None by default, i.e. clock()). 
+            
+        Returns: 
+            None
+        """
+        if self.window is None:
+            return None
+        if now is None:
+            now = self.clock()
+        limit = now - self.window
+        while (self._oldest is not None) and (self._oldest.time <= limit):
+            self._delete(self._oldest)
+        return None
+    
+    
+    
+    # every deletion (also of delete, pop_min, pop_max and the evictions) unlinks the node from the list first
+    def _delete(self, z:Node) -> None:
+        older = z.older
+        newer = z.newer
+        if older is None:
+            self._oldest = newer
+        else:
+            older.newer = newer
+        if newer is None:
+            self._newest = older
+        else:
+            newer.older = older
+        z.older = None
+        z.newer = None
+        super()._delete(z)
+        return None
+    
+    
+    
+    def clear(self) -> None:
+        """ The function removes all nodes from the tree (in O(1)). """
+        super().clear()
+        self._oldest = None
+        self._newest = None
+        return None
+    
+    ###########################################################################
+    def oldest(self) -> Union[Node,None]:
+        """ The function returns the node which was inserted first (and is evicted next), or None. """
+        return self._oldest
+    
+    
+    
+    def newest(self) -> Union[Node,None]:
+        """ The function returns the node which was inserted last, or None. """
+        return self._newest
+    
+    
+    
+    def by_age(self):
+        """ The function yields the keys (resp. items) in the order of their insertion, from the oldest one on. """
+        keyed = self.key is not None
+        n = self._oldest
+        while n is not None:
+            yield n.item if keyed else n.key
+            n = n.newer
+    
+    
+    
+    def validate(self) -> None:
+        """ 
+        The function checks the red-black-tree-properties (see RedBlackTree.validate) and the list of the
+        insertion order: its links, its length, the order of the timestamps and the bounds. 
+        
+        Returns: 
+            None (an Exception describes the first violation which is found) 
+        """
+        super().validate()
+        count = 0
+        previous = None
+        n = self._oldest
+        while n is not None:
+            if n.older is not previous:
+                raise Exception("The list of the insertion order is broken at " + str(n) + "!")
+            if (self.window is not None) and (previous is not None) and (n.time < previous.time):
+                raise Exception("The timestamps of " + str(previous) + " and " + str(n) + " are not in order!")
+            previous = n
+            n = n.newer
+            count += 1
+        if previous is not self._newest:
+            raise Exception("The newest node is not at the end of the list of the insertion order!")
+        if count != len(self):
+            raise Exception("The list of the insertion order has " + str(count) + " nodes, but the tree " + str(len(self)) + "!")
+        if (self.capacity is not None) and (count > self.capacity):
+            raise Exception("The tree holds more keys than its capacity!")
+        return None
+    
+    ###########################################################################
+    # the operations which would mix the lists of the insertion order of several trees
+    def _check_compatible(self, other:RedBlackTree) -> None:
+        raise ValueError("Bounded trees can not be joined or combined!")
+    
+    
+    
+    def split(self, key) -> tuple:
+        """ The function is not supported for bounded trees (ValueError). """
+        raise ValueError("Bounded trees can not be split!")
+    
+    
+    
+    @classmethod
+    def load(cls, path:str, **options) -> "BoundedRedBlackTree":
+        """ The function is not supported for bounded trees (ValueError), the files store no insertion order. """
+        raise ValueError("Bounded trees can not be loaded from a file!")
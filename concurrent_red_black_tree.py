@@ -0,0 +1,367 @@
+# -*- coding: utf-8 -*-
+""" 
+A thread-safe wrapper around the red black tree of red_black_tree.py. 
+
+A rotation rewires several parent and child pointers one after another, so a reader
+which runs concurrently to a writer could see a torn tree. ConcurrentRedBlackTree
+therefore guards the tree with a reader/writer lock: any number of readers at the same
+time, or a single writer. Iterations and range scans copy the keys under the read lock
+(snapshot reads), so the lock is never held while the caller consumes the keys. 
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Union
+
+from red_black_tree import RedBlackTree
+
+
+###############################################################################
+
+class ReadWriteLock:
+    """ 
+    This is a class for a lock which is either shared by many readers or held by a single writer. 
+    
+    Waiting writers take precedence over new readers, so a steady stream of readers cannot
+    starve the writers. The lock is not reentrant. 
+    """
+    
+    def __init__(self):
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+    
+    
+    
+    def acquire_read(self) -> None:
+        with self._condition:
+            while self._writer or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+        return None
+    
+    
+    
+    def release_read(self) -> None:
+        with self._condition:
+            self._readers -= 1
+            if self._readers == 0:
+                self._condition.notify_all()
+        return None
+    
+    
+    
+    def acquire_write(self) -> None:
+        with self._condition:
+            self._waiting_writers += 1
+            while self._writer or self._readers:
+                self._condition.wait()
+            self._waiting_writers -= 1
+            self._writer = True
+        return None
+    
+    
+    
+    def release_write(self) -> None:
+        with self._condition:
+            self._writer = False
+            self._condition.notify_all()
+        return None
+    
+    
+    
+    @contextmanager
+    def read_locked(self):
+        """ The function returns a context manager which holds the lock for reading. """
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+    
+    
+    
+    @contextmanager
+    def write_locked(self):
+        """ The function returns a context manager which holds the lock for writing. """
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+
+
+class ConcurrentRedBlackTree:
+    """ 
+    This is a class for a red black tree which can be used by several threads at the same time. 
+    
+    The lookups return keys (and not the nodes, whose links change with the next write). 
+    With a batch_size, insert only queues the key, and a full queue is inserted with insert_many
+    under a single acquisition of the write lock; the queued keys are invisible to the readers
+    until then (or until flush or another write operation applies them). A queued key is checked
+    when it is queued (like a node of the tree, and by a comparison with a key of the queue or the
+    tree), so an impossible key fails in the call of insert and not in a later write operation.
+    
+    Attributes: 
+        tree (RedBlackTree): The wrapped tree (only to be used while holding the lock). 
+        lock (ReadWriteLock): The lock which guards the tree. 
+        batch_size (int, None): The number of queued keys which are inserted together, or None for no queue. 
+    """
+    
+    
+    
+    def __init__(self, batch_size:Union[int,None] = None, order_statistics:bool = False):
+        """ 
+        The constructor for ConcurrentRedBlackTrees. 
+        
+        Parameters: 
+            batch_size (int, None): The number of keys which are queued before they are inserted together
+                (None by default, i.e. every key is inserted at once). 
+            order_statistics (bool): Whether every node stores the size of its subtree (see RedBlackTree). 
+        """
+        if (batch_size is not None) and (batch_size < 1):
+            raise ValueError("The batch size must be positive!")
+        self.tree = RedBlackTree(order_statistics=order_statistics)
+        self.lock = ReadWriteLock()
+        self.batch_size = batch_size
+        # the queue of the keys which are not inserted yet, guarded by a plain lock (it is only held shortly)
+        self._pending = []
+        self._pending_lock = threading.Lock()
+    
+    ###########################################################################
+    # writers
+    def insert(self, key) -> None:
+        """ 
+        The function inserts the input key (or puts it into the queue if there is a batch size). 
+        
+        Parameter: 
+            key: The key which is inserted. 
+            
+        Returns: 
+            None
+        """
+        node = self.tree.new_node(key)
+        if self.batch_size is None:
+            with self.lock.write_locked():
+                self.tree.insert_rbt(node)
+            return None
+        
+        with self._pending_lock:
+            # the key must be comparable with the keys it will be merged with (a TypeError like the one of
+            # insert_rbt); the root is read without the lock, but the key of a node never changes
+            if self._pending:
+                self._pending[-1] < node.key
+            else:
+                root = self.tree.root
+                if root is not None:
+                    root.key < node.key
+            self._pending.append(node.key)
+            full = len(self._pending) >= self.batch_size
+        # the queue is taken only while holding the write lock, so a key which is not in the queue
+        # anymore is in the tree for every following write operation
+        if full:
+            with self.lock.write_locked():
+                self._apply_pending()
+        return None
+    
+    
+    
+    def insert_many(self, iterable) -> None:
+        """ The function inserts the input keys (and the queued ones) under a single acquisition of the write lock. """
+        keys = list(iterable)
+        with self.lock.write_locked():
+            # (the queue first, so that impossible keys of the caller can not take the queued ones with them)
+            self._apply_pending()
+            self.tree.insert_many(keys)
+        return None
+    
+    
+    
+    def flush(self) -> None:
+        """ The function inserts the queued keys, so that the readers see them. """
+        with self.lock.write_locked():
+            self._apply_pending()
+        return None
+    
+    
+    
+    def delete(self, key) -> None:
+        """ 
+        The function deletes a node with the input key (the queued keys are inserted before). 
+        
+        Parameter: 
+            key: The key which is deleted. 
+            
+        Returns: 
+            None
+        """
+        with self.lock.write_locked():
+            self._apply_pending()
+            self.tree.delete(key)
+        return None
+    
+    
+    
+    def pop_min(self):
+        """ The function removes the smallest key and returns it. """
+        with self.lock.write_locked():
+            self._apply_pending()
+            return self.tree.pop_min().key
+    
+    
+    
+    def pop_max(self):
+        """ The function removes the biggest key and returns it. """
+        with self.lock.write_locked():
+            self._apply_pending()
+            return self.tree.pop_max().key
+    
+    
+    
+    def clear(self) -> None:
+        """ The function removes all keys (including the queued ones). """
+        with self.lock.write_locked():
+            self._take_pending()
+            self.tree.clear()
+        return None
+    
+    
+    
+    def _take_pending(self) -> list:
+        with self._pending_lock:
+            batch = self._pending
+            self._pending = []
+        return batch
+    
+    
+    
+    # only called while holding the write lock; the queued keys are removed from the queue only after
+    # insert_many succeeded (new keys are appended meanwhile, but nobody else takes keys from the front)
+    def _apply_pending(self) -> None:
+        with self._pending_lock:
+            batch = list(self._pending)
+        if batch:
+            self.tree.insert_many(batch)
+            with self._pending_lock:
+                del self._pending[:len(batch)]
+        return None
+    
+    ###########################################################################
+    # readers: they share the lock, so they run in parallel (on a free-threaded build also truly in parallel)
+    def __contains__(self, key) -> bool:
+        with self.lock.read_locked():
+            return self.tree.search(key) is not None
+    
+    
+    
+    def __len__(self) -> int:
+        with self.lock.read_locked():
+            return len(self.tree)
+    
+    
+    
+    def _key_of(self, method, *args):
+        # call a lookup of the tree which returns a node (or None) and return its key
+        with self.lock.read_locked():
+            n = method(*args)
+        return None if n is None else n.key
+    
+    
+    
+    def minimum(self):
+        """ The function returns the smallest key (ValueError for an empty tree). """
+        with self.lock.read_locked():
+            if self.tree.root is None:
+                raise ValueError("The tree is empty!")
+            return self.tree.minimum().key
+    
+    
+    
+    def maximum(self):
+        """ The function returns the biggest key (ValueError for an empty tree). """
+        with self.lock.read_locked():
+            if self.tree.root is None:
+                raise ValueError("The tree is empty!")
+            return self.tree.maximum().key
+    
+    
+    
+    def floor(self, key):
+        """ The function returns the biggest key which is smaller or equal than the input key, or None. """
+        return self._key_of(self.tree.floor, key)
+    
+    
+    
+    def ceiling(self, key):
+        """ The function returns the smallest key which is bigger or equal than the input key, or None. """
+        return self._key_of(self.tree.ceiling, key)
+    
+    
+    
+    def successor(self, key):
+        """ The function returns the smallest key which is bigger than the input key, or None. """
+        return self._key_of(self.tree.successor, key)
+    
+    
+    
+    def predecessor(self, key):
+        """ The function returns the biggest key which is smaller than the input key, or None. """
+        return self._key_of(self.tree.predecessor, key)
+    
+    
+    
+    def rank(self, key) -> int:
+        """ The function returns the number of keys which are smaller than the input key (needs order_statistics). """
+        with self.lock.read_locked():
+            return self.tree.rank(key)
+    
+    
+    
+    def select(self, i:int):
+        """ The function returns the i-th smallest key, counted from 0 (needs order_statistics). """
+        with self.lock.read_locked():
+            return self.tree.select(i).key
+    
+    ###########################################################################
+    # snapshot reads: the keys are copied under the read lock, the caller iterates over the copy
+    def snapshot(self) -> list:
+        """ The function returns the keys in increasing order at one point in time. """
+        with self.lock.read_locked():
+            return self.tree.inorder()
+    
+    
+    
+    def __iter__(self):
+        return iter(self.snapshot())
+    
+    
+    
+    def __reversed__(self):
+        with self.lock.read_locked():
+            keys = list(reversed(self.tree))
+        return iter(keys)
+    
+    
+    
+    def irange(self, lo = None, hi = None, inclusive:tuple = (True, True), reverse:bool = False) -> list:
+        """ 
+        The function returns the keys between lo and hi at one point in time (see RedBlackTree.irange). 
+        
+        Parameters: 
+            lo: The lower bound (None for no lower bound). 
+            hi: The upper bound (None for no upper bound). 
+            inclusive (tuple): Whether lo and hi themselves are included ((True, True) by default). 
+            reverse (bool): Whether the keys are returned in decreasing order (False by default). 
+            
+        Returns: 
+            list: The keys in the range. 
+        """
+        with self.lock.read_locked():
+            return list(self.tree.irange(lo, hi, inclusive, reverse))
+    
+    
+    
+    def __repr__(self) -> str:
+        return type(self).__name__ + "(" + repr(self.snapshot()) + ")"
@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+""" 
+An interval tree on top of the red black tree of red_black_tree.py. 
+
+Every node stores a closed interval [low, high], where low is the key of the node (so the nodes
+are in increasing order of their lower ends), and the biggest upper end of all intervals in
+its subtree (max_high). The tree recomputes max_high via its hook for additional data (like the
+sizes of the order statistics), so it stays correct through every rotation of the insertion
+and deletion. A search for overlapping intervals skips every subtree whose max_high is below
+the query and stops at the first lower end above it. 
+"""
+
+from typing import Union
+
+from red_black_tree import Node, RedBlackTree
+
+
+###############################################################################
+
+class IntervalRedBlackTree(RedBlackTree):
+    """ 
+    This is a class for a red black tree of closed intervals [low, high] with overlap queries. 
+    
+    The intervals are inserted, iterated and deleted as (low, high) pairs, e.g. tree.add((3, 7)),
+    and may occur several times. The nodes are ordered by low; lookups of RedBlackTree which take
+    a key (search, floor, rank, irange, ...) take a lower end. 
+    
+    Attributes: 
+        root (Node, None): The root node, i.e. the initial node of the tree. 
+        order_statistics (bool): Whether every node stores the size of its subtree (see RedBlackTree). 
+    """
+    
+    _fields = ("high", "max_high")
+    
+    
+    
+    def __init__(self, order_statistics:bool = False, stats:bool = False):
+        """ 
+        The constructor for IntervalRedBlackTrees. 
+        
+        Parameters: 
+            order_statistics (bool): Whether every node stores the size of its subtree (False by default). 
+            stats (bool): Whether the operations are counted (see RedBlackTree, False by default). 
+        """
+        super().__init__(order_statistics=order_statistics, stats=stats)
+        self._update = self._update_interval_size if order_statistics else self._update_interval
+    
+    
+    
+    # the nodes are created from (low, high) pairs (used by add, insert_many, from_sorted, join, ...)
+    def _node_factory(self):
+        cls = self._node_class
+        
+        def make(interval) -> Node:
+            low, high = interval
+            if high < low:
+                raise ValueError("The upper end of an interval must not be smaller than its lower end!")
+            n = cls(low)
+            n.high = high
+            n.max_high = high
+            return n
+        return make
+    
+    ###########################################################################
+    # the additional data: the biggest upper end in the subtree (and the size of the subtree)
+    def _update_interval(self, x:Node) -> None:
+        m = x.high
+        if (x.left is not None) and (m < x.left.max_high):
+            m = x.left.max_high
+        if (x.right is not None) and (m < x.right.max_high):
+            m = x.right.max_high
+        x.max_high = m
+        return None
+    
+    
+    
+    def _update_interval_size(self, x:Node) -> None:
+        self._update_interval(x)
+        self._update_size(x)
+        return None
+    
+    ###########################################################################
+    # the nodes whose intervals overlap [lo, hi], in increasing order of their lower ends: an inorder walk
+    # which skips the subtrees whose max_high is below lo and stops at the first lower end above hi
+    def _overlapping_nodes(self, lo, hi):
+        stack = []
+        x = self.root
+        while True:
+            while (x is not None) and not (x.max_high < lo):
+                stack.append(x)
+                x = x.left
+            if not stack:
+                return
+            x = stack.pop()
+            # all following nodes start above hi as well
+            if hi < x.key:
+                return
+            if not (x.high < lo):
+                yield x
+            x = x.right
+    
+    
+    
+    def overlapping(self, lo, hi = None):
+        """ 
+        The function yields the intervals which overlap the input point or interval, in increasing
+        order of their lower ends. Every subtree which can not contain such an interval is skipped,
+        so a query with k results visits O(log n + k) nodes if the results are close to each other in
+        the tree, and O(k log(n / k)) in the worst case (instead of n for a scan). 
+        
+        Parameters: 
+            lo: The point, or the lower end of the query interval. 
+            hi: The upper end of the query interval (None by default, i.e. the point lo). 
+            
+        Returns: 
+            generator: The (low, high) pairs with low <= hi and lo <= high. 
+        """
+        if hi is None:
+            hi = lo
+        elif hi < lo:
+            raise ValueError("The upper end of an interval must not be smaller than its lower end!")
+        for n in self._overlapping_nodes(lo, hi):
+            yield (n.key, n.high)
+    
+    
+    
+    def overlaps(self, lo, hi = None) -> bool:
+        """ The function checks in O(log n) whether any interval overlaps the input point or interval. """
+        for _ in self.overlapping(lo, hi):
+            return True
+        return False
+    
+    ###########################################################################
+    # the intervals instead of the lower ends
+    def _find(self, interval) -> Union[Node,None]:
+        # a node with exactly the input interval (among the nodes with the same lower end)
+        low, high = interval
+        if self.root is None:
+            return None
+        for n in self._irange_nodes(low, low, (True, True), False):
+            if not (n.high < high) and not (high < n.high):
+                return n
+        return None
+    
+    
+    
+    def __contains__(self, interval) -> bool:
+        return self._find(interval) is not None
+    
+    
+    
+    def delete(self, interval) -> Node:
+        """ 
+        The function deletes a node with the input interval while preserving the red-black-tree-properties. 
+        
+        Parameter: 
+            interval (tuple): The (low, high) pair which is deleted (KeyError if it is not in the tree). 
+            
+        Returns: 
+            Node: The deleted node (detached from the tree). 
+        """
+        n = self._find(interval)
+        if n is None:
+            raise KeyError(interval)
+        self._delete(n)
+        return n
+    
+    
+    
+    # the intervals of the nodes (see RedBlackTree._values)
+    def _values(self, nodes:list) -> list:
+        return [(n.key, n.high) for n in nodes]
+    
+    
+    
+    def __iter__(self):
+        """ The function yields the intervals as (low, high) pairs in increasing order of low (lazily). """
+        if self.root is None:
+            return
+        for n in self._walk(self.minimum()):
+            yield (n.key, n.high)
+    
+    
+    
+    def __reversed__(self):
+        """ The function yields the intervals as (low, high) pairs in decreasing order of low (lazily). """
+        if self.root is None:
+            return
+        for n in self._walk(self.maximum(), reverse=True):
+            yield (n.key, n.high)
+    
+    
+    
+    def irange(self, lo = None, hi = None, inclusive:tuple = (True, True), reverse:bool = False):
+        """ The function yields the intervals whose lower ends are between lo and hi (see RedBlackTree.irange). """
+        if self.root is None:
+            return
+        for n in self._irange_nodes(lo, hi, inclusive, reverse):
+            yield (n.key, n.high)
+    
+    
+    
+    def validate(self) -> None:
+        """ 
+        The function checks the red-black-tree-properties (see RedBlackTree.validate), the intervals and
+        the biggest upper ends of all subtrees. 
+        
+        Returns: 
+            None (an Exception describes the first violation which is found) 
+        """
+        super().validate()
+        if self.root is None:
+            return None
+        for x in self._walk(self.minimum()):
+            if x.high < x.key:
+                raise Exception("The interval of " + str(x) + " ends before it starts!")
+            m = x.high
+            for c in (x.left, x.right):
+                if (c is not None) and (m < c.max_high):
+                    m = c.max_high
+            if (m < x.max_high) or (x.max_high < m):
+                raise Exception("The biggest upper end below " + str(x) + " is wrong!")
+        return None
+    
+    ###########################################################################
+    # the set operations compare only the lower ends, and the binary files store only the keys
+    def _set_operation(self, operation, other:RedBlackTree) -> RedBlackTree:
+        raise ValueError("The set operations are not supported for interval trees!")
+    
+    
+    
+    def dump(self, path:str) -> None:
+        """ The function is not supported for interval trees (ValueError), the files store only the keys. """
+        raise ValueError("Interval trees can not be dumped!")
+    
+    
+    
+    @classmethod
+    def load(cls, path:str, **options) -> "IntervalRedBlackTree":
+        """ The function is not supported for interval trees (ValueError), the files store only the keys. """
+        raise ValueError("Interval trees can not be loaded from a file!")
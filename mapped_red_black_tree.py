@@ -0,0 +1,414 @@
+# -*- coding: utf-8 -*-
+""" 
+A compact binary file format for red black trees and a read-only tree on top of mmap. 
+
+The file consists of a header and four columns of fixed-width records, where the nodes
+are numbered in increasing order of their keys (so the i-th record is the node of rank i): 
+
+    header   32 bytes: magic b"RBT1", byte order, typecode, number of nodes, index of the root
+    keys     n * 8 bytes (C long long or double, see typecode) 
+    left     n * 4 bytes (index of the left child, -1 for none) 
+    right    n * 4 bytes (index of the right child, -1 for none) 
+    colors   n * 1 byte  (0 for black, 1 for red like in red_black_tree.py) 
+    
+load rebuilds the same tree (with the same shape and colors) in O(n) without a single
+comparison. MappedRedBlackTree answers queries straight from the mapped file: since the
+key column is sorted, a lookup is a binary search over it, and a range scan is a slice. 
+"""
+
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import islice
+from operator import le
+
+from red_black_tree import RedBlackTree, black, red
+
+
+###############################################################################
+
+magic = b"RBT1"
+# magic, byte order (0 little, 1 big endian), typecode, 2 pad bytes, number of nodes, index of the root
+_header = struct.Struct("<4sBc2xqq")
+_header_size = 32
+_byteorder = 0 if sys.byteorder == "little" else 1
+
+def dump(tree:RedBlackTree, path:str) -> None:
+    """ 
+    The function writes the keys, the shape and the colors of the tree into a binary file. 
+    Only int keys (stored as 64 bit ints) and float keys (stored as doubles, together with the int
+    keys if every one of them is exactly a double) are supported, and no trees whose nodes store
+    more than their keys, i.e. with a key function, multisets and subclasses with additional
+    attributes like RedBlackTreeMap (their items, counts resp. values can not be stored). 
+    
+    Parameters: 
+        tree (RedBlackTree): The tree which is written. 
+        path (str): The path of the file. 
+        
+    Returns: 
+        None
+    """
+    if tree.key is not None:
+        raise ValueError("Trees with a key function can not be dumped!")
+    if tree.multiset:
+        raise ValueError("Multisets can not be dumped!")
+    if tree._fields:
+        raise ValueError("Trees whose nodes store more than their keys (e.g. the values of a map) can not be dumped!")
+    nodes = [] if tree.root is None else list(tree._walk(tree.minimum()))
+    typecode, key_column = _key_column([n.key for n in nodes])
+    
+    index = {n: i for i, n in enumerate(nodes)}
+    index[None] = -1
+    left_column = array("i", [index[n.left] for n in nodes])
+    right_column = array("i", [index[n.right] for n in nodes])
+    colors = bytes(n.color for n in nodes)
+    
+    with open(path, "wb") as f:
+        f.write(_pack(typecode, key_column, left_column, right_column, colors, index[tree.root]))
+    return None
+
+
+
+def dumps_sorted(keys:list) -> bytes:
+    """ 
+    The function returns the content of the file (see dump) of the tree which RedBlackTree.from_sorted
+    builds from the input keys, without building the tree (e.g. in another process, whose result is
+    read by loads in O(n) without a comparison, see ShardedRedBlackTree.from_iterable). 
+    
+    Parameter: 
+        keys (list): The int or float keys in increasing order. 
+        
+    Returns: 
+        bytes: The content of the file. 
+    """
+    if not all(map(le, keys, islice(keys, 1, None))):
+        raise ValueError("The keys are not sorted!")
+    typecode, key_column = _key_column(keys)
+    n = len(keys)
+    left_column = array("i", [-1]) * n
+    right_column = array("i", [-1]) * n
+    colors = bytearray(n)
+    
+    # the same shape and colors as RedBlackTree._link_sorted: the middle key of a range is the root of its
+    # subtree, and the nodes of the deepest level are red; the ranges of a single key (about half of the
+    # nodes) are done at once instead of via the stack
+    deepest = n.bit_length() - 1
+    stack = [(0, n, 0)] if n else []
+    while stack:
+        lo, hi, depth = stack.pop()
+        mid = (lo + hi) // 2
+        if (depth == deepest) and (depth > 0):
+            colors[mid] = red
+        if lo < mid:
+            left_column[mid] = (lo + mid) // 2
+            if mid - lo == 1:
+                if depth + 1 == deepest:
+                    colors[lo] = red
+            else:
+                stack.append((lo, mid, depth + 1))
+        if mid + 1 < hi:
+            right_column[mid] = (mid + 1 + hi) // 2
+            if hi - mid == 2:
+                if depth + 1 == deepest:
+                    colors[mid + 1] = red
+            else:
+                stack.append((mid + 1, hi, depth + 1))
+    return _pack(typecode, key_column, left_column, right_column, colors, n // 2 if n else -1)
+
+
+
+# the typecode and the column of the keys (int keys next to float keys are stored as doubles, which must not round them)
+def _key_column(keys:list) -> tuple:
+    typecode = "q" if all(type(k) is int for k in keys) else "d"
+    if typecode == "d":
+        try:
+            exact = all((type(k) is float) or (float(k) == k) for k in keys)
+        except (TypeError, ValueError, OverflowError):
+            raise ValueError("Only int keys (with 64 bits) and float keys can be dumped!")
+        if not exact:
+            raise ValueError("The int keys can not be stored exactly as doubles together with the float keys!")
+    try:
+        return typecode, array(typecode, keys)
+    except (TypeError, OverflowError):
+        raise ValueError("Only int keys (with 64 bits) and float keys can be dumped!")
+
+
+
+# the content of a file from its columns
+def _pack(typecode:str, key_column:array, left_column:array, right_column:array, colors, root:int) -> bytes:
+    header = _header.pack(magic, _byteorder, typecode.encode(), len(key_column), root).ljust(_header_size, b"\0")
+    return b"".join((header, key_column.tobytes(), left_column.tobytes(), right_column.tobytes(), bytes(colors)))
+
+
+
+def _read_header(data) -> tuple:
+    # returns the typecode, the number of nodes, the index of the root and the offsets of the columns
+    if len(data) < _header_size:
+        raise ValueError("The file is no dumped red black tree!")
+    tag, order, typecode, n, root = _header.unpack_from(data)
+    if tag != magic:
+        raise ValueError("The file is no dumped red black tree!")
+    typecode = typecode.decode()
+    if len(data) != _header_size + 17 * n:
+        raise ValueError("The file is truncated!")
+    left_offset = _header_size + 8 * n
+    right_offset = left_offset + 4 * n
+    color_offset = right_offset + 4 * n
+    return typecode, order, n, root, (_header_size, left_offset, right_offset, color_offset)
+
+
+
+def load(path:str, cls = RedBlackTree, **options) -> RedBlackTree:
+    """ 
+    The function reads a tree which was written by dump, with the same shape and colors, in O(n). 
+    The options which the file can not represent (a key function, multiset and a class whose nodes
+    have additional attributes) are rejected, and a typed tree must have the type of the stored keys. 
+    
+    Parameters: 
+        path (str): The path of the file. 
+        cls (type): The class of the tree (RedBlackTree by default). 
+        options: The keyword arguments for the constructor (e.g. order_statistics=True). 
+        
+    Returns: 
+        RedBlackTree: The tree. 
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    return loads(data, cls, **options)
+
+
+
+def loads(data:bytes, cls = RedBlackTree, **options) -> RedBlackTree:
+    """ 
+    The function does the same as load for the content of a file (e.g. the result of dumps_sorted). 
+    
+    Parameters: 
+        data (bytes): The content of the file. 
+        cls (type): The class of the tree (RedBlackTree by default). 
+        options: The keyword arguments for the constructor (e.g. order_statistics=True). 
+        
+    Returns: 
+        RedBlackTree: The tree. 
+    """
+    typecode, order, n, root, (key_offset, left_offset, right_offset, color_offset) = _read_header(data)
+    
+    columns = []
+    for code, start, stop in ((typecode, key_offset, left_offset), ("i", left_offset, right_offset),
+                              ("i", right_offset, color_offset)):
+        column = array(code)
+        column.frombytes(data[start:stop])
+        if order != _byteorder:
+            column.byteswap()
+        columns.append(column)
+    keys, lefts, rights = columns
+    colors = data[color_offset:]
+    
+    tree = cls(**options)
+    if (tree.key is not None) or tree.multiset or tree._fields:
+        raise ValueError("The file stores only keys (no items, counts or other attributes of the nodes)!")
+    if (tree.typed is not None) and (tree.typed is not (int if typecode == "q" else float)):
+        raise ValueError("The type of the tree does not match the type of the stored keys!")
+    node_class = tree._node_class
+    nodes = [node_class(k) for k in keys]
+    for x, l, r, c in zip(nodes, lefts, rights, colors):
+        x.color = black if c == black else red
+        if l >= 0:
+            x.left = nodes[l]
+            nodes[l].parent = x
+        if r >= 0:
+            x.right = nodes[r]
+            nodes[r].parent = x
+    
+    if nodes:
+        tree.root = nodes[root]
+        # the additional data (e.g. the sizes) is computed bottom-up, i.e. in reversed preorder
+        if tree._update is not None:
+            preorder = []
+            stack = [tree.root]
+            while stack:
+                x = stack.pop()
+                preorder.append(x)
+                if x.left is not None:
+                    stack.append(x.left)
+                if x.right is not None:
+                    stack.append(x.right)
+            for x in reversed(preorder):
+                tree._update(x)
+    tree._length = n
+    tree._counted = True
+    return tree
+
+
+
+class MappedRedBlackTree:
+    """ 
+    This is a class for a read-only red black tree in a file which was written by dump. 
+    
+    The file is mapped into memory with mmap and the key column is accessed via a memoryview, so
+    opening the tree costs O(1) independent of its size, and only the pages which are touched by
+    the queries are read from the disk (and shared between processes mapping the same file). 
+    The tree should be closed (or used in a with statement) to release the file. 
+    
+    Attributes: 
+        path (str): The path of the file. 
+    """
+    
+    
+    
+    def __init__(self, path:str):
+        """ 
+        The constructor for MappedRedBlackTrees. 
+        
+        Parameter: 
+            path (str): The path of a file which was written by dump. 
+        """
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            typecode, order, n, root, (key_offset, left_offset, right_offset, color_offset) = _read_header(self._mmap)
+            if order != _byteorder:
+                raise ValueError("The file was written with another byte order (use load instead)!")
+        except ValueError:
+            self._mmap.close()
+            raise
+        self._length = n
+        view = memoryview(self._mmap)
+        # (the other columns are only needed by load, the key column is sorted)
+        self._keys = view[key_offset:left_offset].cast(typecode)
+        view.release()
+    
+    
+    
+    def close(self) -> None:
+        """ The function releases the memoryviews and the mapped file. """
+        if self._mmap.closed:
+            return None
+        self._keys.release()
+        self._mmap.close()
+        return None
+    
+    
+    
+    def __enter__(self) -> "MappedRedBlackTree":
+        return self
+    
+    
+    
+    def __exit__(self, *exc) -> None:
+        self.close()
+        return None
+    
+    ###########################################################################
+    def __len__(self) -> int:
+        return self._length
+    
+    
+    
+    def __contains__(self, key) -> bool:
+        i = bisect_left(self._keys, key)
+        return (i < self._length) and not (key < self._keys[i])
+    
+    
+    
+    def minimum(self):
+        """ The function returns the smallest key (ValueError for an empty tree). """
+        if self._length == 0:
+            raise ValueError("The tree is empty!")
+        return self._keys[0]
+    
+    
+    
+    def maximum(self):
+        """ The function returns the biggest key (ValueError for an empty tree). """
+        if self._length == 0:
+            raise ValueError("The tree is empty!")
+        return self._keys[self._length - 1]
+    
+    
+    
+    def floor(self, key):
+        """ The function returns the biggest key which is smaller or equal than the input key, or None. """
+        i = bisect_right(self._keys, key)
+        return self._keys[i - 1] if i > 0 else None
+    
+    
+    
+    def ceiling(self, key):
+        """ The function returns the smallest key which is bigger or equal than the input key, or None. """
+        i = bisect_left(self._keys, key)
+        return self._keys[i] if i < self._length else None
+    
+    
+    
+    def rank(self, key) -> int:
+        """ The function returns the number of keys which are smaller than the input key. """
+        return bisect_left(self._keys, key)
+    
+    
+    
+    def select(self, i:int):
+        """ The function returns the i-th smallest key, counted from 0 (negative i count from the end). """
+        if i < 0:
+            i += self._length
+        if not (0 <= i < self._length):
+            raise IndexError("The index is out of range!")
+        return self._keys[i]
+    
+    
+    
+    def __iter__(self):
+        """ The function iterates lazily over the keys in increasing order. """
+        return iter(self._keys)
+    
+    
+    
+    def __reversed__(self):
+        """ The function iterates lazily over the keys in decreasing order. """
+        return reversed(self._keys)
+    
+    
+    
+    def irange(self, lo = None, hi = None, inclusive:tuple = (True, True), reverse:bool = False):
+        """ 
+        The function iterates lazily over the keys between lo and hi (see RedBlackTree.irange). 
+        
+        Parameters: 
+            lo: The lower bound (None for no lower bound). 
+            hi: The upper bound (None for no upper bound). 
+            inclusive (tuple): Whether lo and hi themselves are included ((True, True) by default). 
+            reverse (bool): Whether the keys are returned in decreasing order (False by default). 
+            
+        Returns: 
+            iterator: The keys in the range. 
+        """
+        keys = self._keys
+        if lo is None:
+            start = 0
+        elif inclusive[0]:
+            start = bisect_left(keys, lo)
+        else:
+            start = bisect_right(keys, lo)
+        if hi is None:
+            stop = self._length
+        elif inclusive[1]:
+            stop = bisect_right(keys, hi)
+        else:
+            stop = bisect_left(keys, hi)
+        if reverse:
+            return (keys[i] for i in range(stop - 1, start - 1, -1))
+        return (keys[i] for i in range(start, stop))
+    
+    
+    
+    def inorder(self) -> list:
+        """ The function returns the keys in increasing order. """
+        return self._keys.tolist()
+    
+    
+    
+    def to_tree(self, **options) -> RedBlackTree:
+        """ The function builds a (writable) RedBlackTree with the same shape and colors. """
+        return load(self.path, **options)
@@ -0,0 +1,399 @@
+# -*- coding: utf-8 -*-
+""" 
+A persistent (immutable) variant of the red black tree of red_black_tree.py. 
+
+An insertion or deletion does not change the tree, but returns a new tree: only the
+nodes on the path from the root to the changed place are copied (path copying),
+every other subtree is shared with the former version. So an update allocates
+O(log n) nodes, and a snapshot of a version is nothing but a reference to it. 
+"""
+
+from typing import Union
+
+from red_black_tree import black, red
+
+
+###############################################################################
+
+class PersistentNode:
+    """ 
+    This is a class whose instances are the (never changed) nodes of a persistent red black tree. 
+    
+    The nodes have no parent pointers, since a node can be shared by many versions of a tree
+    (and so can have different parents). 
+    
+    Attributes: 
+        key: The key which is associated to the node. 
+        left (PersistentNode, None): The left child node. 
+        right (PersistentNode, None): The right child node. 
+        color (int): The color of the node, 0 for black and 1 for red (like in red_black_tree.py). 
+    """
+    
+    __slots__ = ("key", "left", "right", "color")
+    
+    
+    def __init__(self, key, left:Union["PersistentNode",None] = None, right:Union["PersistentNode",None] = None, color:int = red):
+        self.key = key
+        self.left = left
+        self.right = right
+        self.color = color
+    
+    
+    
+    def __str__(self):
+        return "PersistentNode("+str(self.key)+")"
+
+
+
+# help functions for the colors of the (possibly empty) subtrees
+def _is_red(x:Union[PersistentNode,None]) -> bool:
+    return (x is not None) and (x.color is red)
+
+
+
+def _is_black(x:Union[PersistentNode,None]) -> bool:
+    return (x is not None) and (x.color is black)
+
+
+
+def _blackened(x:Union[PersistentNode,None]) -> Union[PersistentNode,None]:
+    # the root-Node must always be black (a copy is only needed if it is red)
+    if _is_red(x):
+        return PersistentNode(x.key, x.left, x.right, black)
+    return x
+
+
+
+# build a black node with the children l and r, where one child may be a red node with a red child
+# (the red-red violation of the insertion, see Okasaki, "Red-Black Trees in a Functional Setting", 1999);
+# the violation is repaired by turning the three nodes into a red node with two black children
+# (with two red children, both are colored black instead, which is also needed by the deletion)
+def _balance(l:Union[PersistentNode,None], key, r:Union[PersistentNode,None]) -> PersistentNode:
+    if _is_red(l) and _is_red(r):
+        return PersistentNode(key, _copy(l, black), _copy(r, black), red)
+    if _is_red(l):
+        if _is_red(l.left):
+            return PersistentNode(l.key, _copy(l.left, black), PersistentNode(key, l.right, r, black), red)
+        if _is_red(l.right):
+            return PersistentNode(l.right.key, PersistentNode(l.key, l.left, l.right.left, black),
+                                  PersistentNode(key, l.right.right, r, black), red)
+    if _is_red(r):
+        if _is_red(r.right):
+            return PersistentNode(r.key, PersistentNode(key, l, r.left, black), _copy(r.right, black), red)
+        if _is_red(r.left):
+            return PersistentNode(r.left.key, PersistentNode(key, l, r.left.left, black),
+                                  PersistentNode(r.key, r.left.right, r.right, black), red)
+    return PersistentNode(key, l, r, black)
+
+
+
+def _copy(x:PersistentNode, color:int) -> PersistentNode:
+    # a node with the input color (x itself if it has the color already)
+    if x.color is color:
+        return x
+    return PersistentNode(x.key, x.left, x.right, color)
+
+
+
+class PersistentRedBlackTree:
+    """ 
+    This is a class for a persistent red black tree: insert and delete return a new tree and leave
+    this one unchanged, so every tree can be used as a consistent snapshot (also by other threads). 
+    
+    Like in RedBlackTree, equal keys are allowed and are inserted to the right of each other. 
+    
+    Attributes: 
+        root (PersistentNode, None): The root node, i.e. the initial node of the tree. 
+    """
+    
+    __slots__ = ("root", "_length")
+    
+    
+    
+    def __init__(self, root:Union[PersistentNode,None] = None, length:int = 0):
+        """ 
+        The constructor for PersistentRedBlackTrees, which is only used internally
+        (an empty tree is created by PersistentRedBlackTree(), see from_sorted and from_iterable for the others). 
+        
+        Parameters: 
+            root (PersistentNode, None): The root node (None by default). 
+            length (int): The number of nodes below the root. 
+        """
+        self.root = root
+        self._length = length
+    
+    
+    
+    @classmethod
+    def from_sorted(cls, iterable) -> "PersistentRedBlackTree":
+        """ 
+        The function builds a tree from keys which are sorted in increasing order in O(n) 
+        (e.g. from the keys of a RedBlackTree). 
+        
+        Parameter: 
+            iterable: The keys sorted in increasing order. 
+            
+        Returns: 
+            PersistentRedBlackTree: The new tree. 
+        """
+        keys = list(iterable)
+        for i in range(1, len(keys)):
+            if keys[i] < keys[i - 1]:
+                raise ValueError("The keys are not sorted!")
+        
+        # like RedBlackTree._link_sorted: the tree is complete up to its deepest level, which is red
+        depth = len(keys).bit_length() - 1
+        
+        def build(lo:int, hi:int, level:int) -> Union[PersistentNode,None]:
+            if lo >= hi:
+                return None
+            mid = (lo + hi) // 2
+            color = red if (level == depth and depth > 0) else black
+            return PersistentNode(keys[mid], build(lo, mid, level + 1), build(mid + 1, hi, level + 1), color)
+        
+        return cls(build(0, len(keys), 0), len(keys))
+    
+    
+    
+    @classmethod
+    def from_iterable(cls, iterable) -> "PersistentRedBlackTree":
+        """ The function builds a tree from keys in any order in O(n log n). """
+        return cls.from_sorted(sorted(iterable))
+    
+    ###########################################################################
+    def insert(self, key) -> "PersistentRedBlackTree":
+        """ 
+        The function returns a new tree with the input key inserted, in O(log n) time and new nodes. 
+        
+        Parameter: 
+            key: The key which is inserted. 
+            
+        Returns: 
+            PersistentRedBlackTree: The new tree (this tree stays unchanged). 
+        """
+        def ins(x:Union[PersistentNode,None]) -> PersistentNode:
+            if x is None:
+                return PersistentNode(key)
+            # the same direction for equal keys as in RedBlackTree
+            if key < x.key:
+                if x.color is black:
+                    return _balance(ins(x.left), x.key, x.right)
+                return PersistentNode(x.key, ins(x.left), x.right, red)
+            if x.color is black:
+                return _balance(x.left, x.key, ins(x.right))
+            return PersistentNode(x.key, x.left, ins(x.right), red)
+        
+        return PersistentRedBlackTree(_blackened(ins(self.root)), self._length + 1)
+    
+    
+    
+    def delete(self, key) -> "PersistentRedBlackTree":
+        """ 
+        The function returns a new tree without (one node with) the input key, in O(log n) time and new nodes. 
+        
+        Parameter: 
+            key: The key which is deleted. 
+            
+        Returns: 
+            PersistentRedBlackTree: The new tree (this tree stays unchanged). 
+        """
+        if self.search(key) is None:
+            raise KeyError(key)
+        
+        # the deletion of Kahrs ("Red-black trees with types", 2001): del returns a subtree whose black
+        # height is one less if the input subtree x was black, the callers repair it with _balance_left/_right
+        def delete(x:PersistentNode) -> Union[PersistentNode,None]:
+            if key < x.key:
+                if _is_black(x.left):
+                    return _balance_left(delete(x.left), x.key, x.right)
+                return PersistentNode(x.key, delete(x.left), x.right, red)
+            if x.key < key:
+                if _is_black(x.right):
+                    return _balance_right(x.left, x.key, delete(x.right))
+                return PersistentNode(x.key, x.left, delete(x.right), red)
+            return _fuse(x.left, x.right)
+        
+        return PersistentRedBlackTree(_blackened(delete(self.root)), self._length - 1)
+    
+    ###########################################################################
+    def search(self, key) -> Union[PersistentNode,None]:
+        """ The function returns a node with the input key, or None if the key is not in the tree. """
+        x = self.root
+        while x is not None:
+            if key < x.key:
+                x = x.left
+            elif x.key < key:
+                x = x.right
+            else:
+                return x
+        return None
+    
+    
+    
+    def __contains__(self, key) -> bool:
+        return self.search(key) is not None
+    
+    
+    
+    def minimum(self) -> PersistentNode:
+        """ The function returns a node whose key is smaller or equal than the others. """
+        x = self.root
+        if x is None:
+            raise ValueError("The tree is empty!")
+        while x.left is not None:
+            x = x.left
+        return x
+    
+    
+    
+    def maximum(self) -> PersistentNode:
+        """ The function returns a node whose key is bigger or equal than the others. """
+        x = self.root
+        if x is None:
+            raise ValueError("The tree is empty!")
+        while x.right is not None:
+            x = x.right
+        return x
+    
+    
+    
+    def __len__(self) -> int:
+        return self._length
+    
+    
+    
+    # iterate over the nodes with a stack (there are no parent pointers), which needs O(log n) memory
+    def _walk(self, reverse:bool = False):
+        a, b = ("right", "left") if reverse else ("left", "right")
+        stack = []
+        x = self.root
+        while stack or (x is not None):
+            while x is not None:
+                stack.append(x)
+                x = getattr(x, a)
+            x = stack.pop()
+            yield x
+            x = getattr(x, b)
+    
+    
+    
+    def __iter__(self):
+        """ The function iterates lazily over the keys in increasing order. """
+        for x in self._walk():
+            yield x.key
+    
+    
+    
+    def __reversed__(self):
+        """ The function iterates lazily over the keys in decreasing order. """
+        for x in self._walk(reverse=True):
+            yield x.key
+    
+    
+    
+    def inorder(self) -> list:
+        """ The function returns the keys of the nodes inserted in the tree in increasing order. """
+        return list(self)
+    
+    
+    
+    def validate(self) -> None:
+        """ 
+        The function checks in one pass over the nodes (in O(n)) that the tree is a valid red black tree: 
+        the keys are in order, the root-Node is black, no red node has a red child, every path from 
+        the root-Node to a leaf has the same number of black nodes, and the number of nodes is correct. 
+        
+        Returns: 
+            None (an Exception describes the first violation which is found) 
+        """
+        if _is_red(self.root):
+            raise Exception("The root-Node " + str(self.root) + " is not black!")
+        
+        # an inorder walk with a stack of the nodes and the numbers of black nodes on their paths (see RedBlackTree)
+        leaf_height = None
+        count = 0
+        previous = None
+        stack = []
+        x = self.root
+        height = 0
+        while stack or (x is not None):
+            while x is not None:
+                if x.color is black:
+                    height += 1
+                elif x.color is not red:
+                    raise Exception(str(x) + " has no possible color!")
+                for c in (x.left, x.right):
+                    if c is None:
+                        if leaf_height is None:
+                            leaf_height = height
+                        elif height != leaf_height:
+                            raise Exception("The paths below " + str(x) + " have different numbers of black nodes!")
+                    elif (x.color is red) and (c.color is red):
+                        raise Exception("The red node " + str(x) + " has the red child " + str(c) + "!")
+                stack.append((x, height))
+                x = x.left
+            
+            x, height = stack.pop()
+            if (previous is not None) and (x.key < previous.key):
+                raise Exception("The keys of " + str(previous) + " and " + str(x) + " are not in order!")
+            previous = x
+            count += 1
+            x = x.right
+        
+        if self._length != count:
+            raise Exception("The tree has " + str(count) + " nodes, but its length is " + str(self._length) + "!")
+        return None
+    
+    
+    
+    def __repr__(self) -> str:
+        return type(self).__name__ + ".from_sorted([" + ", ".join(repr(k) for k in self) + "])"
+
+###############################################################################
+# help functions for the deletion
+
+# the black height of the left subtree l is one less than the one of r
+def _balance_left(l:Union[PersistentNode,None], key, r:PersistentNode) -> PersistentNode:
+    if _is_red(l):
+        return PersistentNode(key, _copy(l, black), r, red)
+    if _is_black(r):
+        return _balance(l, key, _copy(r, red))
+    # r is red with a black left child
+    return PersistentNode(r.left.key, PersistentNode(key, l, r.left.left, black),
+                          _balance(r.left.right, r.key, _copy(r.right, red)), red)
+
+
+
+# the mirror image: the black height of the right subtree r is one less than the one of l
+def _balance_right(l:PersistentNode, key, r:Union[PersistentNode,None]) -> PersistentNode:
+    if _is_red(r):
+        return PersistentNode(key, l, _copy(r, black), red)
+    if _is_black(l):
+        return _balance(_copy(l, red), key, r)
+    # l is red with a black right child
+    return PersistentNode(l.right.key, _balance(_copy(l.left, red), l.key, l.right.left),
+                          PersistentNode(key, l.right.right, r, black), red)
+
+
+
+# join the children l and r of a deleted node (all keys of l are smaller or equal than the ones of r)
+def _fuse(l:Union[PersistentNode,None], r:Union[PersistentNode,None]) -> Union[PersistentNode,None]:
+    if l is None:
+        return r
+    if r is None:
+        return l
+    if _is_red(l) and _is_red(r):
+        m = _fuse(l.right, r.left)
+        if _is_red(m):
+            return PersistentNode(m.key, PersistentNode(l.key, l.left, m.left, red),
+                                  PersistentNode(r.key, m.right, r.right, red), red)
+        return PersistentNode(l.key, l.left, PersistentNode(r.key, m, r.right, red), red)
+    if _is_black(l) and _is_black(r):
+        m = _fuse(l.right, r.left)
+        if _is_red(m):
+            return PersistentNode(m.key, PersistentNode(l.key, l.left, m.left, black),
+                                  PersistentNode(r.key, m.right, r.right, black), red)
+        return _balance_left(l.left, l.key, PersistentNode(r.key, m, r.right, black))
+    if _is_red(r):
+        return PersistentNode(r.key, _fuse(l, r.left), r.right, red)
+    return PersistentNode(l.key, l.left, _fuse(l.right, r), red)
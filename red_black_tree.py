@@ -8,6 +8,10 @@ Created on Sat Jun 13 23:21:03 2020
 from typing import Union # for defining Union types
 import random 
 import sys 
+from operator import add, attrgetter, index
+from itertools import repeat
+import json
+import math
 import os # OS module in python provides functions for interacting with the operating system
 
 
@@ -30,8 +34,16 @@ class Node:
         left (Node, None): The left child node, i.e. the node a stage below the actual node on the left side.
         right (Node, None): The right child node, i.e. the node a stage below the actual node on the right side.
         color (int): The color (red/black) that is associated to a node, where 0 is assigned to black nodes and 1 to red nodes respectively.
+    
+    The attributes are stored in __slots__ instead of a __dict__ per node, which reduces 
+    the memory of a node considerably (see the table in README.md). 
     """
     
+    __slots__ = ("key", "parent", "left", "right", "color")
+    
+    # the number of equal keys which the node stands for: the nodes of a multiset (see RedBlackTree)
+    # store it in a slot, all other nodes count once
+    count = 1
     
     
     def __init__(self, key:float, color:int = red):
@@ -42,10 +54,11 @@ class Node:
            key (float): The key/value which is associated to a node.
            color (int): The color (red/black) that is associated to a node (red by default), where 0 is assigned to black nodes and 1 to red nodes respectively.  
         """
+        # the tree only needs to compare the keys with "<" (numbers, strings, tuples, ...)
         try:
-            float(key)
-        except ValueError:
-            print("That was no possible value for a key in this context!")
+            key < key
+        except TypeError:
+            raise ValueError("That was no possible value for a key in this context!")
             
         if (color is not red) and (color is not black):
             raise ValueError("That was no possible value for a color in this context!")
@@ -61,21 +74,535 @@ class Node:
     def __str__(self):
         return "Node("+str(self.key)+")"
 
+
+
+class SizedNode(Node):
+    """ 
+    This is a class for the nodes of a red black tree with order statistics (see RedBlackTree). 
+    
+    Attribute: 
+        size (int): The number of nodes in the subtree of the node (including the node itself). 
+    """
+    
+    __slots__ = ("size",)
+    
+    
+    
+    def __init__(self, key:float, color:int = red):
+        """ 
+        The constructor for SizedNodes. 
+        
+        Parameters: 
+           key (float): The key/value which is associated to a node. 
+           color (int): The color (red/black) that is associated to a node (red by default). 
+        """
+        super().__init__(key, color)
+        self.size = 1
+
+
+
+# the additional attributes which the nodes of a tree can have (depending on the options of the tree)
+# together with their initial values, in the order of the slots
+node_fields = {"size": 1, "value": None, "item": None, "count": 1, "older": None, "newer": None, "time": None,
+               "high": None, "max_high": None, "agg": None}
+
+# the classes of the nodes for each combination of additional attributes (created on demand),
+# and the same for the typed mode, whose nodes do not check their keys and colors
+_node_classes = {(): Node, ("size",): SizedNode}
+_typed_node_classes = {}
+
+def node_class(*fields:str, typed:bool = False) -> type:
+    """ 
+    The function returns the subclass of Node whose instances have the input attributes (in addition to
+    key, parent, left, right and color), so each tree only pays for the attributes its options need. 
+    
+    Parameters: 
+        fields (str): The names of the additional attributes (keys of node_fields). 
+        typed (bool): Whether the nodes skip the check of their key and color (False by default), 
+            for trees whose keys are converted to int or float before (see RedBlackTree). 
+        
+    Returns: 
+        type: The subclass of Node (always the same one for the same attributes). 
+    """
+    for f in fields:
+        if f not in node_fields:
+            raise ValueError("That was no possible attribute for a node in this context!")
+    fields = tuple(f for f in node_fields if f in fields)
+    
+    classes = _typed_node_classes if typed else _node_classes
+    cls = classes.get(fields)
+    if cls is None:
+        defaults = [(f, node_fields[f]) for f in fields]
+        
+        # (the typed nodes without additional attributes do not even loop over the empty defaults)
+        if typed and not defaults:
+            def __init__(self, key:float, color:int = red):
+                self.key = key
+                self.parent = None
+                self.left = None
+                self.right = None
+                self.color = color
+        elif typed:
+            def __init__(self, key:float, color:int = red):
+                self.key = key
+                self.parent = None
+                self.left = None
+                self.right = None
+                self.color = color
+                for f, default in defaults:
+                    setattr(self, f, default)
+        else:
+            def __init__(self, key:float, color:int = red):
+                Node.__init__(self, key, color)
+                for f, default in defaults:
+                    setattr(self, f, default)
+        
+        name = ("Typed" if typed else "") + "".join(f.capitalize() for f in fields) + "Node"
+        cls = type(name, (Node,), {"__slots__": fields, "__init__": __init__, "__module__": __name__})
+        classes[fields] = cls
+    return cls
+
+
+class TreeStats:
+    """  
+    This is a class for the counters of a RedBlackTree with stats=True.  
+    
+    Attributes:  
+        insertions (int): The number of nodes inserted by a descent (insert, insert_rbt, insert_many).  
+        comparisons (int): The number of key comparisons during these descents.  
+        duplicates (int): The number of descents which found a node with an equal key (of a multiset or a map),  
+            whose count (resp. value) is updated instead of inserting the node.  
+        max_depth (int): The depth of the deepest inserted node (the root-Node has the depth 0).  
+        fixes (int): The number of calls of fix (i.e. of fixed insertions).  
+        recolorings (int): The number of fix steps with a red parent and a red uncle (recolor and continue).  
+        case_1 (int): The number of fix steps in case 1 (red parent and red child not in a row).  
+        case_2 (int): The number of fix steps in case 2 (red parent and red child in a row).  
+        rotations (int): The number of rotations (of insertions and deletions).  
+    """
+    
+    __slots__ = ("insertions", "comparisons", "duplicates", "max_depth", "fixes", "recolorings", "case_1", "case_2", "rotations")
+    
+    
+    def __init__(self):
+        self.reset()
+    
+    
+    
+    def reset(self) -> None:
+        """ The function sets all counters to 0. """
+        for name in self.__slots__:
+            setattr(self, name, 0)
+        return None
+    
+    
+    
+    def as_dict(self) -> dict:
+        """ The function returns the counters as a dictionary. """
+        return {name: getattr(self, name) for name in self.__slots__}
+    
+    
+    
+    def __repr__(self) -> str:
+        return "TreeStats(" + ", ".join(name + "=" + str(getattr(self, name)) for name in self.__slots__) + ")"
+
+
+# the value of a node for the sum of the keys (the key of a multiset node counts as often as it was inserted)
+def _counted_key(n:Node):
+    return n.key * n.count
+
+
+class Monoid:
+    """ 
+    This is a class for the aggregates of a RedBlackTree with monoid=... (see RedBlackTree.aggregate): every
+    node stores the combined value of all nodes in its subtree (in its attribute agg), so the value of any
+    range of keys is combined from O(log n) nodes and subtrees. 
+    
+    The tree only combines the values of nodes, so the identity is just the result of an empty range
+    (therefore min and max can use None instead of an infinite key). 
+    
+    Attributes: 
+        identity: The result of an empty range. 
+        combine (callable): The associative function which combines the values of two neighbouring ranges,
+            the one with the smaller keys first (so it does not need to be commutative). 
+        value (callable): The function which returns the value of a node (e.g. its key, or its value in a
+            RedBlackTreeMap). 
+    """
+    
+    __slots__ = ("identity", "combine", "value")
+    
+    
+    def __init__(self, identity, combine, value = attrgetter("key")):
+        """ 
+        The constructor for Monoids. 
+        
+        Parameters: 
+            identity: The result of an empty range. 
+            combine (callable): The associative function of two values. 
+            value (callable): The function which returns the value of a node (its key by default). 
+        """
+        self.identity = identity
+        self.combine = combine
+        self.value = value
+    
+    
+    
+    @classmethod
+    def sum(cls, value = None) -> "Monoid":
+        """ The function returns the monoid which sums the keys (or value(node)), counting the keys of a multiset as often as they were inserted. """
+        return cls(0, add, _counted_key if value is None else value)
+    
+    
+    
+    @classmethod
+    def min(cls, value = None) -> "Monoid":
+        """ The function returns the monoid of the smallest value (the key of the node by default), None for an empty range. """
+        return cls(None, min, attrgetter("key") if value is None else value)
+    
+    
+    
+    @classmethod
+    def max(cls, value = None) -> "Monoid":
+        """ The function returns the monoid of the biggest value (the key of the node by default), None for an empty range. """
+        return cls(None, max, attrgetter("key") if value is None else value)
+    
+    
+    
+    @classmethod
+    def count(cls) -> "Monoid":
+        """ The function returns the monoid which counts the keys (like count_range, but without order statistics). """
+        return cls(0, add, attrgetter("count"))
+
 ###############################################################################
         
 class RedBlackTree:
     """ 
     This is a class for operations on a red black tree.
       
-    Attribute: 
+    Attributes: 
         root (Node, None): The root node, i.e. the initial node of the tree.
+        order_statistics (bool): Whether every node stores the size of its subtree, which is required by 
+            rank, select and count_range (the nodes must be SizedNodes then).
+        stats (TreeStats, None): The counters of the stats mode, or None if the tree counts nothing.
+        key (callable, None): The function which derives the key of a node from the inserted item, or None
+            if the items are the keys. The key is computed once, when the node is created, and stored in
+            the node (its item in the attribute item); searches, bounds and the keys of split, delete, rank
+            etc. are derived keys, while iterating over the tree and irange yield the items.
+        typed (type, None): int or float if all keys are converted to this type when the nodes are created
+            (see new_node), or None. Then the nodes skip the check of their key and color, and all
+            comparisons are comparisons of plain numbers.
+        multiset (bool): Whether equal keys share one node, which counts them in its attribute count. Then
+            len, iteration, irange, rank, select and count_range count every key as often as it was inserted,
+            while delete, pop_min and pop_max remove one of the equal keys at a time.
+        monoid (Monoid, None): The monoid whose aggregate of its subtree every node stores, which is required
+            by aggregate, or None.
     """
     
+    # the additional attributes of the nodes which a subclass needs (see node_class)
+    _fields = ()
     
-    def __init__(self):
-        """ The constructor for RedBlackTrees. """
+    
+    def __init__(self, order_statistics:bool = False, stats:bool = False, key = None, typed:Union[type,None] = None,
+                 multiset:bool = False, monoid:Union[Monoid,None] = None):
+        """ 
+        The constructor for RedBlackTrees. 
+  
+        Parameters: 
+            order_statistics (bool): Whether every node stores the size of its subtree (False by default).
+            stats (bool): Whether the rotations, fix steps, comparisons and depths of the insertions are counted 
+                in the attribute stats (False by default, then nothing is counted and nothing slows down).
+            key (callable, None): The function which derives the keys from the items (None by default, then
+                the items are the keys). 
+            typed (type, None): int or float to convert every key to this type and skip the check of the
+                nodes (None by default). 
+            multiset (bool): Whether equal keys are counted in one node instead of being inserted as nodes of
+                their own (False by default).
+            monoid (Monoid, None): The monoid whose aggregates of the subtrees are stored in the nodes, for
+                range aggregates in O(log n) (None by default).
+        """
         self.root = None    
+        self.order_statistics = order_statistics
+        
+        # the number of nodes in the tree (only valid if _counted is True, see __len__)
+        self._length = 0
+        self._counted = True
+        
+        # the class of the nodes this tree accepts (subclasses can add attributes via _fields)
+        fields = self._fields
+        if order_statistics:
+            fields = fields + ("size",)
+        if key is not None:
+            fields = fields + ("item",)
+        if multiset:
+            if key is not None:
+                raise ValueError("The items of a multiset can not be counted in one node (use no key function)!")
+            fields = fields + ("count",)
+        if typed not in (None, int, float):
+            raise ValueError("That was no possible type for the keys in this context!")
+        if monoid is not None:
+            if not isinstance(monoid, Monoid):
+                raise ValueError("That was no possible monoid in this context!")
+            fields = fields + ("agg",)
+        self.key = key
+        self.typed = typed
+        self.multiset = multiset
+        self.monoid = monoid
+        self._node_class = node_class(*fields, typed=typed is not None)
+        
+        # the function which creates the node of a key (resp. item), see new_node
+        self._make_node = self._node_factory()
+        
+        # the function which recomputes the additional data of a node (e.g. the size of its subtree) from 
+        # its children, or None if the nodes do not store additional data (then nothing has to be maintained)
+        if not order_statistics:
+            self._update = None
+        elif multiset:
+            self._update = self._update_counted_size
+        else:
+            self._update = self._update_size
+        if monoid is not None:
+            self._update = self._aggregate_updater(monoid, self._update)
+        
+        # the counters of the stats mode (see TreeStats), or None
+        self.stats = None
+        if stats:
+            self.stats = TreeStats()
+            self._enable_stats()
+    
+    ###########################################################################
+    # build a tree in O(n) from keys which are already in increasing order
+    @classmethod
+    def from_sorted(cls, iterable, **options) -> "RedBlackTree":
+        """ 
+        The function builds a red black tree from keys which are sorted in increasing order. 
+        The nodes are linked as a balanced tree in O(n), i.e. without any search or rotation. 
+        
+        Parameters: 
+            iterable: The sorted keys. 
+            options: The keyword arguments for the constructor (e.g. order_statistics=True).
+            
+        Returns: 
+            RedBlackTree: The new tree. 
+        """
+        tree = cls(**options)
+        make = tree._make_node
+        if (tree.typed is not None) and (tree.key is None):
+            iterable = tree._convert_keys(iterable)
+            make = tree._node_class
+        
+        multiset = tree.multiset
+        nodes = []
+        for k in iterable:
+            n = make(k)
+            if nodes and n.key < nodes[-1].key:
+                raise ValueError("The keys are not sorted!")
+            # (a multiset counts a run of equal keys in its first node)
+            if multiset and nodes and not (nodes[-1].key < n.key):
+                nodes[-1].count += 1
+                continue
+            nodes.append(n)
+        
+        tree._link_sorted(nodes)
+        return tree
+    
+    
+    
+    @classmethod
+    def from_iterable(cls, iterable, **options) -> "RedBlackTree":
+        """ 
+        The function builds a red black tree from keys in any order (by sorting them first) in O(n log n). 
+        The typed mode sorts the converted keys, and a key function is called once per item (the nodes
+        are created first and sorted by their keys). 
+        
+        Parameters: 
+            iterable: The keys. 
+            options: The keyword arguments for the constructor (e.g. order_statistics=True).
+            
+        Returns: 
+            RedBlackTree: The new tree. 
+        """
+        tree = cls(**options)
+        if tree.key is not None:
+            make = tree._make_node
+            nodes = [make(item) for item in iterable]
+            # (the sort is stable, so equal keys keep the order of their items like with sorted(key=...))
+            nodes.sort(key=attrgetter("key"))
+        else:
+            if tree.typed is not None:
+                keys = tree._convert_keys(iterable)
+                make = tree._node_class
+            else:
+                keys = list(iterable)
+                make = tree._make_node
+            keys.sort()
+            nodes = [make(k) for k in keys]
+            
+        # (a multiset counts a run of equal keys in its first node)
+        if tree.multiset:
+            nodes = tree._compact(nodes)
+        tree._link_sorted(nodes)
+        return tree
+    
+    
+    
+    # the default mode creates the nodes directly with their class (without any overhead), the typed mode
+    # converts the keys first, and with a key function the key is derived from the item and cached in the node
+    def _node_factory(self):
+        cls = self._node_class
+        if self.typed is None:
+            convert = None
+        elif self.typed is int:
+            convert = index
+        else:
+            convert = float
+        key = self.key
+        
+        if key is None:
+            if convert is None:
+                return cls
+            
+            def make(k) -> Node:
+                try:
+                    return cls(convert(k))
+                except (TypeError, ValueError):
+                    raise ValueError("That was no possible value for a key in this context!")
+            return make
+        
+        def make_keyed(item) -> Node:
+            k = key(item)
+            if convert is not None:
+                try:
+                    k = convert(k)
+                except (TypeError, ValueError):
+                    raise ValueError("That was no possible value for a key in this context!")
+            n = cls(k)
+            n.item = item
+            return n
+        return make_keyed
+    
+    
+    
+    # convert a batch of keys in the typed mode at once (map calls the conversion without a Python frame per key)
+    def _convert_keys(self, keys) -> list:
+        try:
+            return list(map(index if self.typed is int else float, keys))
+        except (TypeError, ValueError):
+            raise ValueError("That was no possible value for a key in this context!")
+    
+    
+    
+    def new_node(self, item) -> Node:
+        """ 
+        The function creates a node which this tree accepts (with the converted key in the typed mode,
+        and with the derived key and the item if the tree has a key function). 
+        
+        Parameter: 
+            item: The key (resp. the item if the tree has a key function). 
+            
+        Returns: 
+            Node: The new node (not inserted yet). 
+        """
+        return self._make_node(item)
+    
+    
+    
+    def add(self, item) -> None:
+        """ 
+        The function creates a node for the input key (resp. item) and inserts it into the red black tree. 
+        
+        Parameter: 
+            item: The key (resp. the item if the tree has a key function). 
+            
+        Returns: 
+            None
+        """
+        # (the node is created by the tree, so the check of insert_rbt is not needed)
+        if self.multiset:
+            # a duplicate only increments the count of the node with its key, without creating a node first
+            # (in the typed mode, the node is created anyway to convert the key)
+            # (in the stats mode, the descent of _insert_counted is counted instead)
+            x = self.search(item) if (self.typed is None) and (self.stats is None) else None
+            if x is not None:
+                x.count += 1
+                self._length += 1
+                if self._update is not None:
+                    self._update_path(x)
+                return None
+            n = self._make_node(item)
+            if self._insert_counted(n):
+                self._fix(n)
+            return None
+        n = self._make_node(item)
+        self._insert(n)
+        self._fix(n)
+        return None
+    
+    
+    
+    # the binary file format is implemented in mapped_red_black_tree.py, which imports this module 
+    # (therefore it is imported only when it is needed)
+    def dump(self, path:str) -> None:
+        """ 
+        The function writes the tree into a compact binary file (see mapped_red_black_tree.py), 
+        which load or MappedRedBlackTree read much faster than the tree can be rebuilt. 
+        
+        Parameter: 
+            path (str): The path of the file.
+            
+        Returns: 
+            None
+        """
+        from mapped_red_black_tree import dump
+        dump(self, path)
+        return None
+    
+    
+    
+    @classmethod
+    def load(cls, path:str, **options) -> "RedBlackTree":
+        """ 
+        The function reads a tree which was written by dump, with the same shape and colors, in O(n). 
+        
+        Parameters: 
+            path (str): The path of the file. 
+            options: The keyword arguments for the constructor (e.g. order_statistics=True).
+            
+        Returns: 
+            RedBlackTree: The tree. 
+        """
+        from mapped_red_black_tree import load
+        return load(path, cls, **options)
+    
+    
+    
+    # link the sorted nodes as a balanced tree: the middle node becomes the root-Node, the halves
+    # left and right of it become its subtrees (recursively, i.e. with a recursion depth of log n);
+    # all levels except the deepest one are full, so coloring the nodes of the deepest level red and
+    # all others black gives every path from the root-Node to a leaf the same number of black nodes
+    def _link_sorted(self, nodes:list) -> None:
+        deepest = len(nodes).bit_length() - 1
+        update = self._update
+        
+        def _build(lo:int, hi:int, depth:int, p:Union[Node,None]) -> Union[Node,None]:
+            if lo >= hi:
+                return None
+            mid = (lo + hi) // 2
+            x = nodes[mid]
+            x.parent = p
+            if (depth == deepest) and (depth > 0):
+                x.color = red
+            else:
+                x.color = black
+            x.left = _build(lo, mid, depth + 1, x)
+            x.right = _build(mid + 1, hi, depth + 1, x)
+            if update is not None:
+                update(x)
+            return x
         
+        self.root = _build(0, len(nodes), 0, None)
+        self._length = sum(n.count for n in nodes) if self.multiset else len(nodes)
+        self._counted = True
+        return None
+            
     ###########################################################################    
     # help functions to access the different nodes in a red-black-tree
     # n is an instance of the class Node
@@ -193,7 +720,8 @@ class RedBlackTree:
         Returns: 
             None
         """
-        p = self.get_parent(x)
+        # (the parent pointer instead of get_parent: rotations also happen in detached subtrees during join)
+        p = x.parent
         # the right child of x (here y) takes x's place
         y = self._right(x, direction)
         
@@ -229,15 +757,22 @@ class RedBlackTree:
             else:
                 x.left.parent = x
             
-        # if p is None (e.g.: if x was the root-Node), we have already finished
+        # if p is None (i.e. if x was the root-Node), y becomes the new root-Node
+        # (so the callers never have to search for the root after a rotation)
         # if p is not None, rectify the relation of p
         # (is the same procedure for both directions, we do not have to use the help functions)
-        if p is not None: 
+        if p is None:
+            self.root = y
+        else:
             if x is p.left:
                 p.left = y
             elif x is p.right:
                 p.right = y
             
+        # the subtrees of x and y changed, so their additional data must be recomputed (x first, it is below y)
+        if self._update is not None:
+            self._update(x)
+            self._update(y)
                 
         return None
                 
@@ -254,15 +789,22 @@ class RedBlackTree:
         Returns: 
             None
         """
-        # check if n is an instance of the class Node
-        if not isinstance(n, Node):
-            raise ValueError("You can only insert nodes!")
+        # check if n is an instance of the class Node (resp. SizedNode)
+        if not isinstance(n, self._node_class):
+            raise ValueError("You can only insert " + self._node_class.__name__ + "s!")
             
+        # a multiset only gets a new node for a new key (and only then it needs to be fixed)
+        if self.multiset:
+            if self._insert_counted(n):
+                self._fix(n)
+            return None
+        
         # insert a new node
-        self.insert(n)
+        # (the checks were already done above, the helpers below work without repeating them)
+        self._insert(n)
         
         # fix the tree if the red-black-tree properties were violated by the insertion
-        self.fix(n)
+        self._fix(n)
         
         return None
      
@@ -277,263 +819,1932 @@ class RedBlackTree:
         Returns: 
             None
         """
-        # check if n is an instance of the class Node
-        if not isinstance(n, Node):
-            raise ValueError("You can only insert nodes!")
+        # check if n is an instance of the class Node (resp. SizedNode)
+        if not isinstance(n, self._node_class):
+            raise ValueError("You can only insert " + self._node_class.__name__ + "s!")
             
-        # basic properties of the new node
-        n.color = red
-        n.right = None
-        n.left = None
-        
         # the actual insertion
-        if self.root is None:
-            self.root = n
-        else:
-            self._insert(n, self.root)
-            
+        if self.multiset:
+            self._insert_counted(n)
+            return None
+        self._insert(n)
+        
         return None
-                
-            
     
-    # search recursively for a spare place       
-    def _insert(self, n:Node, node:Node) -> None:
-        # search for a spare place in the left subtree of node
-        if n.key < node.key: 
-            
-            # if the left place is free, put n on it
-            if node.left is None: 
-                node.left = n
-                n.parent = node
-                return None
-            # if not, continue with the search
-            else: 
-                self._insert(n, node.left)
-         
-        # search for a spare place in the right subtree of node
-        else: 
-            # if the right place is free, put n on it
-            if node.right is None: 
-                node.right = n
-                n.parent = node
-                return None
-            # if not, continue with the search
-            else: 
-                self._insert(n, node.right)
-             
-    ###########################################################################            
-    def fix(self, n:Node) -> None:
+    ###########################################################################
+    # insert a batch of keys
+    
+    # if a batch has at least _merge_ratio * (number of nodes in the tree) keys, it is merged with the 
+    # nodes of the tree in O(n + m) instead of being inserted key by key in O(m log n) 
+    # (measured with benchmarks/bench_insert_many.py: relinking a node costs about a third of an insertion)
+    _merge_ratio = 0.5
+    
+    # the finger search only pays off if the keys of the batch are dense in the tree, i.e. if there are at most 
+    # _finger_gap nodes of the tree between two keys of the batch on average (otherwise the way up from the 
+    # finger and down again is longer than the way down from the root-Node)
+    _finger_gap = 32
+    
+    def insert_many(self, iterable) -> None:
         """ 
-        The function ensures that the red-black-tree-properties are preserved by fixing them if reqired. 
+        The function inserts a batch of keys into the red black tree while preserving the red-black-tree-properties.
+        
+        A batch which is small compared to the tree is inserted key by key; if its keys are dense in the tree, 
+        they are sorted first and the search for the place of a key starts at the node inserted before 
+        (finger search) instead of at the root-Node. A large batch is sorted and merged with the nodes of 
+        the tree, which are linked again as a balanced tree in O(n + m) (see from_sorted).
   
         Parameter: 
-            n (Node): The node from which to start fixing the red-black-tree-properties. 
+            iterable: The keys which are inserted. 
             
         Returns: 
             None
         """
-        # check if n is an instance of the class Node
-        if not isinstance(n, Node):
-            raise ValueError("You can only insert nodes!")
-        
-        p = self.get_parent(n)
-        
+        make = self._make_node
+        if (self.typed is not None) and (self.key is None):
+            keys = self._convert_keys(iterable)
+            make = self._node_class
+        else:
+            keys = list(iterable)
+        insert = self._insert
+        fix = self._fix
         
-        # if n is the root-Node, i.e. n's parent is None 
-        # (the root-Node must always be black)
-        if p is None:
-            n.color = black
-            return None
-            
-        # if the parent-Node of n is black, nothing must be fixed
-        if p.color is black:
+        if self.multiset:
+            self._insert_many_counted(keys, make)
             return None
         
+        # a sparse batch: the order of the insertions does not matter, so it is not even sorted
+        if len(keys) * self._finger_gap < len(self):
+            for k in keys:
+                n = make(k)
+                insert(n)
+                fix(n)
+            return None
         
-        u = self.get_uncle(n)
-        g = self.get_grand_parent(n)
-        
+        # (with a key function, the keys are only known after the nodes are created)
+        if self.key is None:
+            keys.sort()
+            nodes = [make(k) for k in keys]
+        else:
+            nodes = [make(k) for k in keys]
+            nodes.sort(key=attrgetter("key"))
         
-        # if the parent-Node of n is red and the uncle of n is also red
-        # the order of the following conjunction is crucial since leafes(=None) do not have a color
-        if (p.color is red) and (u is not None) and (u.color is red):
-            
-            # color the parent and the uncle black
-            p.color = black
-            u.color = black
-            
-            # color the grandparent red
-            g.color = red
-           
-            # continue by fixing the tree recursively (starting from the grandparent)
-            self.fix(g)
+        if len(nodes) >= self._merge_ratio * len(self):
+            self._merge_sorted(nodes)
             return None
         
-        # if the parent-Node of n is red and the uncle of n is black;
-        # the leafes are always black (therefore we must add "u is None") (*)
-        if (p.color is red) and ((u is None) or (u.color is black)):# the order is crucial
-            # case_1 passes automatically on to case_2
-            self._case_1(n)  
-            
-        else: 
-            raise Exception("Something went wrong in fix!")
+        # the node inserted before (its key is smaller or equal than the key of the next node)
+        finger = None
+        for n in nodes:
+            # go up from the finger to the lowest ancestor whose subtree n belongs into and search the place 
+            # from there on; for sorted batches this costs O(log d) instead of O(log n), where d is the 
+            # distance to the finger
+            node = finger
+            if node is not None:
+                key = n.key
+                p = node.parent
+                # n belongs into the subtree of node, if node is the left child of a parent with a bigger key
+                # (all smaller bounds of the subtree are at most finger.key <= key)
+                while p is not None:
+                    if (node is p.left) and (key < p.key):
+                        break
+                    node = p
+                    p = node.parent
+            insert(n, node)
+            fix(n)
+            finger = n
+        return None
     
     
     
-    # Case 1 of (*):  the red parent and the red child are NOT in a row            
-    def _case_1(self, n:Node) -> None:
-        
-        p = self.get_parent(n)
-        g = self.get_grand_parent(n)
-
-        # case a) 
-        if (n is p.right) and (g is not None) and (p is g.left):
-            self.rotate_around(p, left)
-            # continue fixing the tree by starting from the left child of n
-            n = n.left  
-            
-        # case b) 
-        elif (n is p.left) and (g is not None) and (p is g.right):
-            self.rotate_around(p, right)
-            # continue fixing the tree by starting from the right child of n
-            n = n.right 
-        
-        # now we are in case_2
-        return self._case_2(n)
-        
+    # merge the sorted nodes with the nodes of the tree and link all of them as a balanced tree
+    def _merge_sorted(self, nodes:list) -> None:
+        if self.root is None:
+            self._link_sorted(nodes)
+            return None
+        # both lists are sorted, so the (stable) sort only merges two runs in O(n + m);
+        # for equal keys the nodes of the tree come first (like a new node is inserted right of equal keys)
+        merged = list(self._walk(self.minimum()))
+        merged.extend(nodes)
+        merged.sort(key=attrgetter("key"))
+        if self.multiset:
+            merged = self._compact(merged)
+        self._link_sorted(merged)
+        return None
     
     
-    # Case 2 of (*):  the red parent and the red child are in a row      
-    def _case_2(self, n:Node) -> None:
+    
+    # the batch insertion of a multiset: the sorted keys are counted in one node per distinct key first,
+    # then these nodes are merged with the tree (a large batch) or inserted one by one
+    def _insert_many_counted(self, keys:list, make) -> None:
+        keys.sort()
+        nodes = []
+        for k in keys:
+            if nodes and not (nodes[-1].key < k):
+                nodes[-1].count += 1
+            else:
+                nodes.append(make(k))
         
-        p = self.get_parent(n)
-        g = self.get_grand_parent(n)
+        if len(nodes) >= self._merge_ratio * len(self):
+            self._merge_sorted(nodes)
+            return None
+        fix = self._fix
+        for n in nodes:
+            if self._insert_counted(n):
+                fix(n)
+        return None
+    
+    
+    
+    # count the runs of equal keys in the sorted nodes in their first node (for multisets)
+    def _compact(self, nodes:list) -> list:
+        compacted = []
+        for n in nodes:
+            if compacted and not (compacted[-1].key < n.key):
+                compacted[-1].count += n.count
+            else:
+                compacted.append(n)
+        return compacted
+    
+    
+    
+    # search iteratively for a spare place
+    # (a loop instead of one Python frame per level, so long chains can not hit the recursion limit);
+    # the search starts at the root-Node or at the input node (which must be the root of a subtree n belongs into)
+    def _insert(self, n:Node, node:Union[Node,None] = None) -> None:
+        # basic properties of the new node
+        n.color = red
+        n.right = None
+        n.left = None
+        
+        if node is None:
+            node = self.root
+        if node is None:
+            n.parent = None
+            self.root = n
+            self._length += 1
+            if self._update is not None:
+                self._update(n)
+            return None
+        
+        key = n.key
+        while True:
+            # search for a spare place in the left subtree of node
+            if key < node.key:
+                child = node.left
+                # if the left place is free, put n on it
+                if child is None:
+                    node.left = n
+                    break
+            
+            # search for a spare place in the right subtree of node
+            else:
+                child = node.right
+                # if the right place is free, put n on it
+                if child is None:
+                    node.right = n
+                    break
+            
+            # if not, continue with the search
+            node = child
+        
+        # (counted only now, a key which can not be compared raises during the search)
+        n.parent = node
+        self._length += 1
+        
+        # the subtrees of all nodes on the path to the root-Node got a new node
+        if self._update is not None:
+            self._update_path(n)
+        return None
+    
+    
+    
+    # like _insert, but the node is only inserted if there is no node with an equal key yet;
+    # returns the node with the equal key (then n is not inserted), or None if n was inserted
+    # (the caller has to fix the tree afterwards like for _insert)
+    def _insert_unique(self, n:Node) -> Union[Node,None]:
+        key = n.key
+        node = self.root
+        if node is None:
+            self._insert(n)
+            return None
+        
+        while True:
+            if key < node.key:
+                child = node.left
+            elif node.key < key:
+                child = node.right
+            else:
+                return node
+            if child is None:
+                break
+            node = child
+        
+        # put n on the spare place below node
+        n.color = red
+        n.right = None
+        n.left = None
+        n.parent = node
+        if key < node.key:
+            node.left = n
+        else:
+            node.right = n
+        self._length += 1
+        
+        if self._update is not None:
+            self._update_path(n)
+        return None
+    
+    
+    
+    # the insertion of a multiset: if there is a node with an equal key, it counts the keys of n as well;
+    # returns True if n was inserted as a new node (then the caller has to fix the tree), False otherwise
+    def _insert_counted(self, n:Node) -> bool:
+        x = self._insert_unique(n)
+        if x is None:
+            self._length += n.count - 1
+            return True
+        x.count += n.count
+        self._length += n.count
+        if self._update is not None:
+            self._update_path(x)
+        return False
+    
+    ###########################################################################            
+    def fix(self, n:Node) -> None:
+        """ 
+        The function ensures that the red-black-tree-properties are preserved by fixing them if reqired. 
+  
+        Parameter: 
+            n (Node): The node from which to start fixing the red-black-tree-properties. 
+            
+        Returns: 
+            None
+        """
+        # check if n is an instance of the class Node (resp. SizedNode)
+        if not isinstance(n, self._node_class):
+            raise ValueError("You can only insert " + self._node_class.__name__ + "s!")
+        
+        self._fix(n)
+        
+        return None
+    
+    
+    
+    # the fixing loop: instead of a recursive call for the grandparent, the loop continues with it;
+    # the parent, grandparent and uncle are read directly from the node links (no help functions on the hot path)
+    def _fix(self, n:Node) -> None:
+        while True:
+            p = n.parent
+            
+            # if n is the root-Node, i.e. n's parent is None
+            # (the root-Node must always be black)
+            if p is None:
+                n.color = black
+                return None
+            
+            # if the parent-Node of n is black, nothing must be fixed
+            if p.color is black:
+                return None
+            
+            # a red parent is never the root-Node, so the grandparent exists
+            g = p.parent
+            if p is g.left:
+                u = g.right
+            else:
+                u = g.left
+            
+            # if the parent-Node of n is red and the uncle of n is also red
+            # the order of the following conjunction is crucial since leafes(=None) do not have a color
+            if (u is not None) and (u.color is red):
+                
+                # color the parent and the uncle black
+                p.color = black
+                u.color = black
+                
+                # color the grandparent red
+                g.color = red
+                
+                # continue by fixing the tree (starting from the grandparent)
+                n = g
+                continue
+            
+            # if the parent-Node of n is red and the uncle of n is black;
+            # the leafes are always black (therefore we must add "u is None") (*)
+            # case_1 passes automatically on to case_2
+            self._case_1(n)
+            return None
+    
+    
+    
+    # Case 1 of (*):  the red parent and the red child are NOT in a row            
+    def _case_1(self, n:Node) -> None:
+        
+        p = n.parent
+        g = p.parent
+
+        # case a) 
+        if (n is p.right) and (p is g.left):
+            self.rotate_around(p, left)
+            # continue fixing the tree by starting from the left child of n
+            n = n.left  
+            
+        # case b) 
+        elif (n is p.left) and (p is g.right):
+            self.rotate_around(p, right)
+            # continue fixing the tree by starting from the right child of n
+            n = n.right 
+        
+        # now we are in case_2
+        return self._case_2(n)
+        
+    
+    
+    # Case 2 of (*):  the red parent and the red child are in a row      
+    def _case_2(self, n:Node) -> None:
+        
+        p = n.parent
+        g = p.parent
        
         
-        # case a)
-        if (n is p.left) and (g is not None) and (p is g.left):
-            self.rotate_around(g, right)
+        # case a)
+        if (n is p.left) and (p is g.left):
+            # (rotate_around keeps the root up to date)
+            self.rotate_around(g, right)
+                
+            
+        # case b)
+        elif (n is p.right) and (p is g.right):
+            # (rotate_around keeps the root up to date)
+            self.rotate_around(g, left)
+            
+            
+        else: 
+            raise Exception("Something went wrong in case_2!")
+            
+        # color changes:
+        # the parent becomes black
+        p.color = black
+        # the grandparent becomes red
+        g.color = red
+        
+        return None
+                                      
+    ###########################################################################
+    # delete a node from the red-black-tree
+    def delete(self, key) -> Node:
+        """ 
+        The function deletes a node with the input key while preserving the red-black-tree-properties. 
+        
+        Parameter: 
+            key: The key of the node which is deleted. 
+            
+        Returns: 
+            Node: The deleted node (detached from the tree, it can be inserted again); in a multiset the node
+                which counted the key (it stays in the tree while it still counts other equal keys).
+        """
+        n = self.search(key)
+        if n is None:
+            raise KeyError(key)
+        if self.multiset and (n.count > 1): 
+            self._uncount(n) 
+            return n
+        self._delete(n)
+        return n
+    
+    
+    
+    def delete_node(self, n:Node) -> None:
+        """ 
+        The function deletes the input node from the red black tree while preserving the red-black-tree-properties. 
+        
+        Parameter: 
+            n (Node): The node which is deleted (it must be a node of this tree). 
+            
+        Returns: 
+            None
+        """
+        # check if n is an instance of the class Node
+        if not isinstance(n, self._node_class):
+            raise ValueError("You can only delete " + self._node_class.__name__ + "s!")
+        
+        self._delete(n)
+        
+        return None
+    
+    
+    
+    def pop_min(self) -> Node:
+        """ The function deletes a node whose key is smaller or equal than the others and returns it. """
+        if self.root is None:
+            raise KeyError("pop from an empty tree")
+        n = self.minimum()
+        if self.multiset and (n.count > 1):
+            self._uncount(n)
+            return n
+        self._delete(n)
+        return n
+    
+    
+    
+    def pop_max(self) -> Node:
+        """ The function deletes a node whose key is bigger or equal than the others and returns it. """
+        if self.root is None:
+            raise KeyError("pop from an empty tree")
+        n = self.maximum()
+        if self.multiset and (n.count > 1):
+            self._uncount(n)
+            return n
+        self._delete(n)
+        return n
+    
+    
+    
+    # remove one of the equal keys which the node of a multiset counts (the node stays in the tree)
+    def _uncount(self, n:Node) -> None:
+        n.count -= 1
+        self._length -= 1
+        if self._update is not None:
+            self._update_path(n)
+        return None
+    
+    
+    
+    # the node v takes the place of the node u (below u's parent)
+    def _transplant(self, u:Node, v:Union[Node,None]) -> None:
+        p = u.parent
+        if p is None:
+            self.root = v
+        elif u is p.left:
+            p.left = v
+        else:
+            p.right = v
+        if v is not None:
+            v.parent = p
+        return None
+    
+    
+    
+    def _delete(self, z:Node) -> None:
+        # y is the node which is taken out of its place (z itself or, if z has two children, its successor);
+        # x is the child which moves into y's place and xp the new parent of x (x can be a leaf, i.e. None)
+        if z.left is None:
+            x = z.right
+            xp = z.parent
+            removed_color = z.color
+            self._transplant(z, x)
+        elif z.right is None:
+            x = z.left
+            xp = z.parent
+            removed_color = z.color
+            self._transplant(z, x)
+        else:
+            y = z.right
+            while y.left is not None:
+                y = y.left
+            removed_color = y.color
+            x = y.right
+            if y.parent is z:
+                xp = y
+            else:
+                xp = y.parent
+                self._transplant(y, x)
+                y.right = z.right
+                y.right.parent = y
+            # the successor takes z's place (and color), so the other nodes keep their keys
+            self._transplant(z, y)
+            y.left = z.left
+            y.left.parent = y
+            y.color = z.color
+        
+        self._length -= z.count
+        
+        # detach the deleted node
+        z.parent = None
+        z.left = None
+        z.right = None
+        
+        # the subtrees of all nodes from xp up to the root-Node lost a node
+        # (before the fixing, whose rotations expect correct data below them)
+        if self._update is not None:
+            self._update_path(xp)
+        
+        # removing a black node decreases the black height of the paths through x
+        if removed_color is black:
+            self._fix_delete(x, xp)
+        return None
+    
+    
+    
+    # the fixing loop after a deletion: x carries an additional black (the one of the removed node)
+    def _fix_delete(self, x:Union[Node,None], xp:Union[Node,None]) -> None:
+        while (x is not self.root) and ((x is None) or (x.color is black)):
+            # the direction in which x hangs below its parent (with the help functions the cases for
+            # a left and a right x are the same, like for the rotations)
+            if x is xp.left:
+                direction = left
+            else:
+                direction = right
+            # the sibling of x can not be a leaf, since its side has a bigger black height
+            w = self._right(xp, direction)
+            
+            # case 1: the sibling is red, rotate it above the parent (afterwards the sibling is black)
+            if w.color is red:
+                w.color = black
+                xp.color = red
+                self.rotate_around(xp, direction)
+                w = self._right(xp, direction)
+            
+            inner = self._left(w, direction)
+            outer = self._right(w, direction)
+            
+            # case 2: the sibling and both of its children are black, move the additional black up
+            if ((inner is None) or (inner.color is black)) and ((outer is None) or (outer.color is black)):
+                w.color = red
+                x = xp
+                xp = x.parent
+                continue
+            
+            # case 3: the inner child of the sibling is red, rotate it to the outside
+            if (outer is None) or (outer.color is black):
+                inner.color = black
+                w.color = red
+                self.rotate_around(w, 1 - direction)
+                w = self._right(xp, direction)
+                outer = self._right(w, direction)
+            
+            # case 4: the outer child of the sibling is red, rotate the sibling above the parent
+            w.color = xp.color
+            xp.color = black
+            outer.color = black
+            self.rotate_around(xp, direction)
+            x = self.root
+            break
+        
+        if x is not None:
+            x.color = black
+        return None
+    
+    ###########################################################################
+    def inorder(self) -> list:
+        """ The function returns the keys of the nodes inserted in the tree in increasing order. """
+        # (without recursion, via the iteration over the tree)
+        return list(self)
+    
+    
+    
+    def __len__(self) -> int:
+        """ 
+        The function returns the number of nodes in the tree in O(1). 
+        (Only after split, join or a set operation on a tree without order statistics, the first call 
+        counts the nodes in O(n).)
+        """
+        if not self._counted:
+            if self.order_statistics:
+                self._length = 0 if self.root is None else self.root.size
+            else:
+                self._length = sum(n.count for n in self._walk(None if self.root is None else self.minimum()))
+            self._counted = True
+        return self._length
+    
+    
+    
+    # iterate over the nodes in increasing (or with reverse=True in decreasing) order, starting from x;
+    # the next node is found via the parent pointers, so no stack is needed (O(1) extra memory),
+    # and each step costs O(1) amortized
+    def _walk(self, x:Union[Node,None], reverse:bool = False):
+        if reverse:
+            direction = right
+        else:
+            direction = left
+        while x is not None:
+            yield x
+            # the next node is the most left node of the right subtree (for direction = left) ...
+            y = self._right(x, direction)
+            if y is not None:
+                while self._left(y, direction) is not None:
+                    y = self._left(y, direction)
+                x = y
+            # ... or the first ancestor from whose left subtree we come
+            else:
+                p = x.parent
+                while (p is not None) and (x is self._right(p, direction)):
+                    x = p
+                    p = p.parent
+                x = p
+    
+    
+    
+    def __iter__(self):
+        """ The function yields the keys (resp. items) of the nodes in increasing order (lazily, without a copy). """
+        if self.root is None:
+            return
+        if self.key is not None:
+            for n in self._walk(self.minimum()):
+                yield n.item
+            return
+        # (a multiset yields every key as often as its node counts it)
+        if self.multiset:
+            for n in self._walk(self.minimum()):
+                yield from repeat(n.key, n.count)
+            return
+        for n in self._walk(self.minimum()):
+            yield n.key
+    
+    
+    
+    def __reversed__(self):
+        """ The function yields the keys (resp. items) of the nodes in decreasing order (lazily, without a copy). """
+        if self.root is None:
+            return
+        if self.key is not None:
+            for n in self._walk(self.maximum(), reverse=True):
+                yield n.item
+            return
+        if self.multiset:
+            for n in self._walk(self.maximum(), reverse=True):
+                yield from repeat(n.key, n.count)
+            return
+        for n in self._walk(self.maximum(), reverse=True):
+            yield n.key
+    
+    
+    
+    def irange(self, lo = None, hi = None, inclusive:tuple = (True, True), reverse:bool = False):
+        """ 
+        The function yields the keys between lo and hi lazily in increasing order. 
+        Finding the first key costs O(log n), each further key O(1) amortized,
+        so a range scan with k keys costs O(log n + k). 
+        
+        Parameters: 
+            lo: The lower bound (None for no lower bound). 
+            hi: The upper bound (None for no upper bound). 
+            inclusive (tuple): Whether lo and hi themselves are included ((True, True) by default). 
+            reverse (bool): Whether the keys are yielded in decreasing order (False by default). 
+            
+        Returns: 
+            generator: The keys k with lo <= k <= hi (resp. < if the bound is not inclusive); with a key
+                function the items whose derived keys are in the range.
+        """
+        if self.root is None:
+            return
+        if self.key is not None: 
+            for n in self._irange_nodes(lo, hi, inclusive, reverse): 
+                yield n.item
+            return
+        if self.multiset:
+            for n in self._irange_nodes(lo, hi, inclusive, reverse):
+                yield from repeat(n.key, n.count)
+            return
+        for n in self._irange_nodes(lo, hi, inclusive, reverse): 
+            yield n.key
+        
+
+
+    # the values which the iteration over the tree yields for the input nodes (the keys resp. items, and the
+    # key of a multiset node as often as it counts it), for the iterations which take their nodes in chunks
+    def _values(self, nodes:list) -> list:
+        if self.key is not None:
+            return [n.item for n in nodes]
+        if self.multiset:
+            return [k for n in nodes for k in repeat(n.key, n.count)]
+        return [n.key for n in nodes]
+    
+    
+    
+    # the nodes of irange
+    def _irange_nodes(self, lo, hi, inclusive:tuple, reverse:bool): 
+        if not reverse:
+            # the first node of the range
+            if lo is None:
+                x = self.minimum()
+            elif inclusive[0]:
+                x = self.ceiling(lo)
+            else:
+                x = self.successor(lo)
+            for n in self._walk(x):
+                if hi is not None:
+                    if (hi < n.key) or ((not inclusive[1]) and not (n.key < hi)):
+                        return
+                yield n
+        else:
+            # the last node of the range
+            if hi is None:
+                x = self.maximum()
+            elif inclusive[1]:
+                x = self.floor(hi)
+            else:
+                x = self.predecessor(hi)
+            for n in self._walk(x, reverse=True):
+                if lo is not None:
+                    if (n.key < lo) or ((not inclusive[0]) and not (lo < n.key)):
+                        return
+                yield n
+        
+            
+    def minimum(self) -> Node:
+        """ The function returns a node whose key is smaller or equal than the others. """
+        x = self.root
+        while x.left is not None:
+            x = x.left
+        return x
+        
+    
+    def maximum(self) -> Node:
+        """ The function returns a node whose key is bigger or equal than the others. """
+        x = self.root
+        while x.right is not None:
+            x = x.right
+        return x
+    
+    ###########################################################################
+    # lookups in O(log n): each one descends once from the root-Node without recursion
+    def search(self, key) -> Union[Node,None]:
+        """ 
+        The function searches a node with the input key. 
+        
+        Parameter: 
+            key: The key which is searched. 
+            
+        Returns: 
+            Node/None: A node whose key is equal to key, or None if there is no such node. 
+        """
+        x = self.root
+        while x is not None:
+            if key < x.key:
+                x = x.left
+            elif x.key < key:
+                x = x.right
+            else:
+                return x
+        return None
+    
+    
+    
+    def count(self, key) -> int:
+        """ 
+        The function counts the keys in the tree which are equal to the input key, in O(log n) for a
+        multiset (and in O(log n + k) otherwise, where k is the result). 
+        
+        Parameter: 
+            key: The key which is counted. 
+            
+        Returns: 
+            int: The number of equal keys (0 if the key is not in the tree). 
+        """
+        if self.multiset:
+            n = self.search(key)
+            return 0 if n is None else n.count
+        return sum(1 for _ in self._irange_nodes(key, key, (True, True), False)) if self.root is not None else 0
+    
+    
+    
+    def __contains__(self, key) -> bool:
+        return self.search(key) is not None
+    
+    
+    
+    def floor(self, key) -> Union[Node,None]:
+        """ 
+        The function searches the node with the biggest key which is smaller or equal than the input key. 
+        
+        Parameter: 
+            key: The key to compare with. 
+            
+        Returns: 
+            Node/None: The found node, or None if all keys are bigger than key. 
+        """
+        found = None
+        x = self.root
+        while x is not None:
+            if key < x.key:
+                x = x.left
+            else:
+                # x is a candidate, but there could be a bigger one in the right subtree
+                found = x
+                x = x.right
+        return found
+    
+    
+    
+    def ceiling(self, key) -> Union[Node,None]:
+        """ 
+        The function searches the node with the smallest key which is bigger or equal than the input key. 
+        
+        Parameter: 
+            key: The key to compare with. 
+            
+        Returns: 
+            Node/None: The found node, or None if all keys are smaller than key. 
+        """
+        found = None
+        x = self.root
+        while x is not None:
+            if x.key < key:
+                x = x.right
+            else:
+                # x is a candidate, but there could be a smaller one in the left subtree
+                found = x
+                x = x.left
+        return found
+    
+    
+    
+    def successor(self, key) -> Union[Node,None]:
+        """ 
+        The function searches the node with the smallest key which is strictly bigger than the input key. 
+        
+        Parameter: 
+            key: The key to compare with (it does not need to be in the tree). 
+            
+        Returns: 
+            Node/None: The found node, or None if no key is bigger than key. 
+        """
+        found = None
+        x = self.root
+        while x is not None:
+            if key < x.key:
+                found = x
+                x = x.left
+            else:
+                x = x.right
+        return found
+    
+    
+    
+    def predecessor(self, key) -> Union[Node,None]:
+        """ 
+        The function searches the node with the biggest key which is strictly smaller than the input key. 
+        
+        Parameter: 
+            key: The key to compare with (it does not need to be in the tree). 
+            
+        Returns: 
+            Node/None: The found node, or None if no key is smaller than key. 
+        """
+        found = None
+        x = self.root
+        while x is not None:
+            if x.key < key:
+                found = x
+                x = x.right
+            else:
+                x = x.left
+        return found
+    
+    ###########################################################################
+    # the maintenance of the additional data of the nodes
+    # (called by the insertion, the deletion and rotate_around if self._update is not None)
+    def _update_path(self, x:Union[Node,None]) -> None:
+        # recompute the additional data from x up to the root-Node
+        update = self._update
+        while x is not None:
+            update(x)
+            x = x.parent
+        return None
+    
+    
+    
+    def _update_size(self, x:SizedNode) -> None:
+        size = 1
+        if x.left is not None:
+            size += x.left.size
+        if x.right is not None:
+            size += x.right.size
+        x.size = size
+        return None
+    
+    
+    
+    # the same for multisets, where a node counts as many keys as its attribute count
+    def _update_counted_size(self, x:SizedNode) -> None:
+        size = x.count
+        if x.left is not None:
+            size += x.left.size
+        if x.right is not None:
+            size += x.right.size
+        x.size = size
+        return None
+    
+    # the update function of a tree with a monoid: it recomputes the other data first (update, e.g. the size,
+    # or None) and then the aggregate of the subtree, in the order left subtree, node, right subtree
+    def _aggregate_updater(self, monoid:Monoid, update):
+        combine = monoid.combine
+        value = monoid.value
+        # (without a multiset every node counts one key, so the sum does not need a Python frame per value)
+        if (value is _counted_key) and not self.multiset:
+            value = attrgetter("key")
+        
+        def _update_aggregate(x:Node) -> None:
+            if update is not None:
+                update(x)
+            a = value(x)
+            if x.left is not None:
+                a = combine(x.left.agg, a)
+            if x.right is not None:
+                a = combine(a, x.right.agg)
+            x.agg = a
+            return None
+        return _update_aggregate
+    
+    ###########################################################################
+    # order statistics in O(log n) (only for trees with order_statistics=True)
+    def _check_order_statistics(self) -> None:
+        if not self.order_statistics:
+            raise ValueError("The tree stores no order statistics (use RedBlackTree(order_statistics=True))!")
+        return None
+    
+    
+    
+    # the number of keys which are smaller (resp. smaller or equal if or_equal is True) than key
+    def _count_below(self, key, or_equal:bool = False) -> int:
+        count = 0
+        x = self.root
+        while x is not None:
+            if (x.key < key) or (or_equal and not (key < x.key)):
+                # x and its whole left subtree are below key
+                count += x.count
+                if x.left is not None:
+                    count += x.left.size
+                x = x.right
+            else:
+                x = x.left
+        return count
+    
+    
+    
+    def rank(self, key) -> int:
+        """ 
+        The function computes the rank of the input key, i.e. the number of keys in the tree which are smaller. 
+        
+        Parameter: 
+            key: The key whose rank is computed (it does not need to be in the tree). 
+            
+        Returns: 
+            int: The number of keys smaller than key (i.e. the index of key in inorder(), if it is in the tree). 
+        """
+        self._check_order_statistics()
+        return self._count_below(key)
+    
+    
+    
+    def select(self, i:int) -> Node:
+        """ 
+        The function searches the node with the i-th smallest key (counting from 0 like list indices). 
+        
+        Parameter: 
+            i (int): The index of the node in increasing order (negative indices count from the end). 
+            
+        Returns: 
+            Node: The node whose key is inorder()[i]. 
+        """
+        self._check_order_statistics()
+        x = self.root
+        size = 0 if x is None else x.size
+        if i < 0:
+            i += size
+        if (i < 0) or (i >= size):
+            raise IndexError("The index is out of range!")
+        
+        while True:
+            if x.left is None:
+                left_size = 0
+            else:
+                left_size = x.left.size
+            if i < left_size:
+                x = x.left
+            elif i < left_size + x.count:
+                return x
+            else:
+                i -= left_size + x.count
+                x = x.right
+    
+    
+    
+    def quantile(self, q:float) -> Node:
+        """ 
+        The function searches the node with the key at the quantile q (nearest rank, i.e. the smallest key
+        which is bigger or equal than at least q * len(tree) of the keys), e.g. the median for q = 0.5. 
+        
+        Parameter: 
+            q (float): The quantile between 0 and 1. 
             
-            # after the rotation update the (new) root (could have changed!)
-            root = n
-            while (self.get_parent(root) is not None):
-                root = self.get_parent(root)
-            self.root = root
-                
+        Returns: 
+            Node: The node whose key is inorder()[max(ceil(q * n) - 1, 0)]. 
+        """
+        if not (0 <= q <= 1):
+            raise ValueError("The quantile must be between 0 and 1!")
+        return self.select(max(math.ceil(q * len(self)) - 1, 0))
+    
+    
+    
+    def count_range(self, lo = None, hi = None, inclusive:tuple = (True, True)) -> int:
+        """ 
+        The function counts the keys between lo and hi (the keys which irange(lo, hi, inclusive) yields). 
+        
+        Parameters: 
+            lo: The lower bound (None for no lower bound). 
+            hi: The upper bound (None for no upper bound). 
+            inclusive (tuple): Whether lo and hi themselves are included ((True, True) by default). 
             
-        # case b)
-        elif (n is p.right) and (g is not None) and (p is g.right):
-            self.rotate_around(g, left)
+        Returns: 
+            int: The number of keys k with lo <= k <= hi (resp. < if the bound is not inclusive). 
+        """
+        self._check_order_statistics()
+        if hi is None:
+            upper = 0 if self.root is None else self.root.size
+        else:
+            upper = self._count_below(hi, or_equal=inclusive[1])
+        if lo is None:
+            lower = 0
+        else:
+            lower = self._count_below(lo, or_equal=not inclusive[0])
+        return max(upper - lower, 0)
+    
+    ###########################################################################
+    # range aggregates in O(log n) (only for trees with a monoid)
+    def aggregate(self, lo = None, hi = None, inclusive:tuple = (True, True)):
+        """ 
+        The function combines the values of the keys between lo and hi (the keys which irange(lo, hi, inclusive) 
+        yields) with the monoid of the tree, in increasing order of the keys, in O(log n): only the nodes on
+        the paths to the bounds are combined one by one, the subtrees between these paths with their aggregates. 
+        
+        Parameters: 
+            lo: The lower bound (None for no lower bound). 
+            hi: The upper bound (None for no upper bound). 
+            inclusive (tuple): Whether lo and hi themselves are included ((True, True) by default). 
             
-            # after the rotation update the (new) root (could have changed!)
-            root = n
-            while (self.get_parent(root) is not None):
-                root = self.get_parent(root)
-            self.root = root
+        Returns: 
+            The aggregate of the range (the identity of the monoid if there is no key in the range). 
+        """
+        monoid = self.monoid
+        if monoid is None:
+            raise ValueError("The tree stores no aggregates (use RedBlackTree(monoid=...))!")
+        combine = monoid.combine
+        value = monoid.value
+        x = self.root
+        if (lo is None) and (hi is None):
+            return monoid.identity if x is None else x.agg
+        lo_open = not inclusive[0]
+        hi_open = not inclusive[1]
+        
+        # descend to the highest node in the range, whose subtree contains all keys of the range
+        while x is not None:
+            if (lo is not None) and ((x.key < lo) or (lo_open and not (lo < x.key))):
+                x = x.right
+            elif (hi is not None) and ((hi < x.key) or (hi_open and not (x.key < hi))):
+                x = x.left
+            else:
+                break
+        if x is None:
+            return monoid.identity
+        result = value(x)
+        
+        # the path to lo: below a node in the range, its right subtree is in the range as a whole
+        # (and comes before the keys which are combined already)
+        y = x.left
+        while y is not None:
+            if (lo is not None) and ((y.key < lo) or (lo_open and not (lo < y.key))):
+                y = y.right
+            else:
+                if y.right is not None:
+                    result = combine(y.right.agg, result)
+                result = combine(value(y), result)
+                y = y.left
+        
+        # the path to hi: the same for the left subtrees
+        y = x.right
+        while y is not None:
+            if (hi is not None) and ((hi < y.key) or (hi_open and not (y.key < hi))):
+                y = y.left
+            else:
+                if y.left is not None:
+                    result = combine(result, y.left.agg)
+                result = combine(result, value(y))
+                y = y.right
+        return result
+    
+    ###########################################################################
+    # the stats mode: the instrumented variants of some methods are stored as attributes of the instance, 
+    # where they shadow the methods of the class, so a tree without stats runs the plain methods (zero overhead)
+    def _enable_stats(self) -> None:
+        stats = self.stats
+        rotate_around = self.rotate_around
+        insert = self._insert
+        insert_unique = self._insert_unique
+        case_1 = self._case_1
+        case_2 = self._case_2
+        
+        def _rotate_around(x:Node, direction:int = left) -> None:
+            stats.rotations += 1
+            return rotate_around(x, direction)
+        
+        # _insert compares the key once per level of its descent, so the comparisons are the number 
+        # of levels between the start of the descent and the new node
+        def _insert(n:Node, node:Union[Node,None] = None) -> None:
+            insert(n, node)
+            levels = 0
+            x = n
+            while (x.parent is not None) and (x is not node):
+                x = x.parent
+                levels += 1
+            depth = levels
+            while x.parent is not None:
+                x = x.parent
+                depth += 1
+            stats.insertions += 1
+            stats.comparisons += levels
+            stats.max_depth = max(stats.max_depth, depth)
+            return None
+        
+        # _insert_unique (of multisets and maps) compares the key twice with every node on its way down,
+        # but once if the key is smaller, then once with the parent of a new node, or twice with the node
+        # of an equal key (a duplicate)
+        def _insert_unique(n:Node) -> Union[Node,None]:
+            if self.root is None:
+                # (the first node is inserted by _insert, which counts it)
+                return insert_unique(n)
+            x = insert_unique(n)
+            y = n if x is None else x
+            comparisons = 1 if x is None else 2
+            depth = 0
+            while y.parent is not None:
+                p = y.parent
+                comparisons += 1 if y is p.left else 2
+                y = p
+                depth += 1
+            if x is None:
+                stats.insertions += 1
+                stats.max_depth = max(stats.max_depth, depth)
+            else:
+                stats.duplicates += 1
+            stats.comparisons += comparisons
+            return x
+        
+        def _case_1(n:Node) -> None:
+            p = n.parent
+            # only the red parent and the red child which are not in a row are case 1 (the others go on to case 2)
+            if (n is p.right) == (p is p.parent.left):
+                stats.case_1 += 1
+            return case_1(n)
+        
+        def _case_2(n:Node) -> None:
+            stats.case_2 += 1
+            return case_2(n)
+        
+        self.rotate_around = _rotate_around
+        self._insert = _insert
+        self._insert_unique = _insert_unique
+        self._fix = self._fix_counting
+        self._case_1 = _case_1
+        self._case_2 = _case_2
+        return None
+    
+    
+    
+    # the fixing loop of _fix, which also counts its steps (used instead of _fix in the stats mode)
+    def _fix_counting(self, n:Node) -> None:
+        self.stats.fixes += 1
+        while True:
+            p = n.parent
+            if p is None:
+                n.color = black
+                return None
+            if p.color is black:
+                return None
             
+            g = p.parent
+            if p is g.left:
+                u = g.right
+            else:
+                u = g.left
             
-        else: 
-            raise Exception("Something went wrong in case_2!")
+            if (u is not None) and (u.color is red):
+                self.stats.recolorings += 1
+                p.color = black
+                u.color = black
+                g.color = red
+                n = g
+                continue
             
-        # color changes:
-        # the parent becomes black
-        p.color = black
-        # the grandparent becomes red
-        g.color = red
+            self._case_1(n)
+            return None
+    
+    
+    
+    def validate(self) -> None:
+        """  
+        The function checks in one pass over the nodes (in O(n)) that the tree is a valid red black tree:  
+        the keys are in order, the root-Node is black, no red node has a red child, every path from 
+        the root-Node to a leaf has the same number of black nodes, the parent pointers match the child 
+        pointers, and (if stored) the sizes and aggregates of the subtrees and the number of nodes are correct.
         
+        Returns:  
+            None (an Exception describes the first violation which is found) 
+        """
+        root = self.root
+        if root is not None:
+            if root.parent is not None:
+                raise Exception("The root-Node " + str(root) + " has a parent!")
+            if root.color is not black:
+                raise Exception("The root-Node " + str(root) + " is not black!")
+        
+        # an inorder walk with a stack, which stores each node together with the number of black nodes on 
+        # the path from the root-Node to it; at every leaf (None) this number must be the same
+        leaf_height = None
+        count = 0
+        previous = None
+        monoid = self.monoid
+        stack = []
+        x = root
+        height = 0
+        while stack or (x is not None):
+            while x is not None:
+                if x.color is black:
+                    height += 1
+                elif x.color is not red:
+                    raise Exception(str(x) + " has no possible color!")
+                for c in (x.left, x.right):
+                    if c is None:
+                        if leaf_height is None:
+                            leaf_height = height
+                        elif height != leaf_height:
+                            raise Exception("The paths below " + str(x) + " have different numbers of black nodes!")
+                        continue
+                    if c.parent is not x:
+                        raise Exception("The parent pointer of " + str(c) + " does not point to " + str(x) + "!")
+                    if (x.color is red) and (c.color is red):
+                        raise Exception("The red node " + str(x) + " has the red child " + str(c) + "!")
+                if self.order_statistics:
+                    size = x.count + (x.left.size if x.left is not None else 0) + (x.right.size if x.right is not None else 0)
+                    if x.size != size:
+                        raise Exception("The size of " + str(x) + " is wrong!")
+                if monoid is not None:
+                    a = monoid.value(x)
+                    if x.left is not None:
+                        a = monoid.combine(x.left.agg, a)
+                    if x.right is not None:
+                        a = monoid.combine(a, x.right.agg)
+                    if x.agg != a:
+                        raise Exception("The aggregate of " + str(x) + " is wrong!")
+                stack.append((x, height))
+                x = x.left
+            
+            x, height = stack.pop()
+            if (previous is not None) and (x.key < previous.key):
+                raise Exception("The keys of " + str(previous) + " and " + str(x) + " are not in order!")
+            if self.multiset:
+                if (previous is not None) and not (previous.key < x.key):
+                    raise Exception("The multiset has the two nodes " + str(previous) + " and " + str(x) + " with equal keys!")
+                if x.count < 1:
+                    raise Exception("The count of " + str(x) + " is not positive!")
+            previous = x
+            count += x.count
+            x = x.right
+        
+        if self._counted and (self._length != count):
+            raise Exception("The tree has " + str(count) + " nodes, but its length is " + str(self._length) + "!")
         return None
-                                      
+    
     ###########################################################################
-    def inorder(self) -> list:
-        """ The function returns the keys of the nodes inserted in the tree in increasing order. """
-        # stores the keys of the nodes inserted in the tree in increasing order
-        ordered = []
-        
-        def _node_inorder(n:Node) -> None: 
-            if n is not None:
-                _node_inorder(n.left)
-                ordered.append(n.key)
-                _node_inorder(n.right)
-                
-        _node_inorder(self.root)
-        return ordered
+    # split, join and set operations: the nodes of the input trees are relinked (not copied), 
+    # so the input trees are empty afterwards
+    
+    # all of them work on detached subtrees (whose roots have no parent) together with their black heights, 
+    # i.e. the number of black nodes on each path from the root of the subtree down to a leaf (including 
+    # the root); a subtree root may be red during the operations, the final root-Node is colored black
+    def _black_height(self, x:Union[Node,None]) -> int:
+        h = 0
+        while x is not None:
+            if x.color is black:
+                h += 1
+            x = x.left
+        return h
+    
+    
+    
+    # a new empty tree with the same options (and class) as this one
+    def _empty(self) -> "RedBlackTree":
+        options = {}
+        if self.key is not None:
+            options["key"] = self.key
+        if self.typed is not None:
+            options["typed"] = self.typed
+        if self.multiset:
+            options["multiset"] = True
+        if self.monoid is not None:
+            options["monoid"] = self.monoid
+        return type(self)(order_statistics=self.order_statistics, **options)
+    
+    
+    
+    # make the subtree x the content of the tree (its nodes are counted on demand, see __len__)
+    def _set_root(self, x:Union[Node,None]) -> None:
+        if x is not None:
+            x.parent = None
+            x.color = black
+        self.root = x
+        self._counted = False
+        return None
+    
+    
+    
+    # join the subtrees tl and tr (with the black heights bl and br) with the node k between them,
+    # where all keys of tl are smaller or equal and all keys of tr bigger or equal than k.key;
+    # returns the root of the joined subtree and its black height, in O(|bl - br| + 1)
+    def _join(self, tl:Union[Node,None], bl:int, k:Node, tr:Union[Node,None], br:int) -> tuple:
+        # the algorithm needs black roots; coloring a red root black increases its black height
+        if (tl is not None) and (tl.color is red):
+            tl.color = black
+            bl += 1
+        if (tr is not None) and (tr.color is red):
+            tr.color = black
+            br += 1
+        
+        if bl > br:
+            return self._join_right(tl, bl, k, tr, br), bl
+        if br > bl:
+            return self._join_left(tl, bl, k, tr, br), br
+        
+        # the same black heights: k becomes the (red) root above both subtrees
+        self._link(k, tl, tr, red)
+        return k, bl
+    
+    
+    
+    # k gets the children l and r and the input color
+    def _link(self, k:Node, l:Union[Node,None], r:Union[Node,None], color:int) -> None:
+        k.left = l
+        k.right = r
+        k.parent = None
+        k.color = color
+        if l is not None:
+            l.parent = k
+        if r is not None:
+            r.parent = k
+        if self._update is not None:
+            self._update(k)
+        return None
+    
+    
+    
+    # go down the right spine of tl (whose black height bl is bigger than br) to the first black subtree c 
+    # with the black height br, and put k with the children c and tr at its place; a red-red violation 
+    # on the way back up is repaired by a rotation like in the insertion
+    def _join_right(self, tl:Node, bl:int, k:Node, tr:Union[Node,None], br:int) -> Node:
+        c = tl.right
+        if tl.color is black:
+            bc = bl - 1
+        else:
+            bc = bl
         
+        if ((c is None) or (c.color is black)) and (bc == br):
+            if c is not None:
+                c.parent = None
+            self._link(k, c, tr, red)
+            t = k
+        else:
+            t = self._join_right(c, bc, k, tr, br)
+        
+        tl.right = t
+        t.parent = tl
+        if self._update is not None:
+            self._update(tl)
+        
+        if (tl.color is black) and (t.color is red) and (t.right is not None) and (t.right.color is red):
+            t.right.color = black
+            self.rotate_around(tl, left)
+            return t
+        return tl
+    
+    
+    
+    # the mirror image of _join_right (tr has the bigger black height)
+    def _join_left(self, tl:Union[Node,None], bl:int, k:Node, tr:Node, br:int) -> Node:
+        c = tr.left
+        if tr.color is black:
+            bc = br - 1
+        else:
+            bc = br
+        
+        if ((c is None) or (c.color is black)) and (bc == bl):
+            if c is not None:
+                c.parent = None
+            self._link(k, tl, c, red)
+            t = k
+        else:
+            t = self._join_left(tl, bl, k, c, bc)
+        
+        tr.left = t
+        t.parent = tr
+        if self._update is not None:
+            self._update(tr)
+        
+        if (tr.color is black) and (t.color is red) and (t.left is not None) and (t.left.color is red):
+            t.left.color = black
+            self.rotate_around(tr, right)
+            return t
+        return tr
+    
+    
+    
+    # join two subtrees without a node between them: the biggest node of tl is taken out and put between
+    def _join2(self, tl:Union[Node,None], bl:int, tr:Union[Node,None], br:int) -> tuple:
+        if tl is None:
+            return tr, br
+        if tr is None:
+            return tl, bl
+        tl, bl, k = self._split_last(tl, bl)
+        return self._join(tl, bl, k, tr, br)
+    
+    
+    
+    # take the biggest node out of the subtree t: returns the rest, its black height and the node
+    def _split_last(self, t:Node, bt:int) -> tuple:
+        l = t.left
+        r = t.right
+        if l is not None:
+            l.parent = None
+        if t.color is black:
+            bc = bt - 1
+        else:
+            bc = bt
+        if r is None:
+            t.left = None
+            return l, bc, t
+        r.parent = None
+        rest, br, last = self._split_last(r, bc)
+        t.left = None
+        t.right = None
+        rest, b = self._join(l, bc, t, rest, br)
+        return rest, b, last
+    
+    
+    
+    # split the subtree t (with the black height bt) at key: returns (l, bl, r, br) with the keys 
+    # smaller than key in l and the others in r (with or_equal=True: the keys smaller or equal in l);
+    # the joins on the way back up cost O(log n) together, since their black heights increase
+    def _split(self, t:Union[Node,None], bt:int, key, or_equal:bool = False) -> tuple:
+        if t is None:
+            return None, 0, None, 0
+        
+        l = t.left
+        r = t.right
+        if l is not None:
+            l.parent = None
+        if r is not None:
+            r.parent = None
+        if t.color is black:
+            bc = bt - 1
+        else:
+            bc = bt
+        
+        if (key < t.key) or ((not or_equal) and not (t.key < key)):
+            # t and its right subtree belong to the right part
+            ll, bll, lr, blr = self._split(l, bc, key, or_equal)
+            r, br = self._join(lr, blr, t, r, bc)
+            return ll, bll, r, br
+        else:
+            # t and its left subtree belong to the left part
+            rl, brl, rr, brr = self._split(r, bc, key, or_equal)
+            l, bl = self._join(l, bc, t, rl, brl)
+            return l, bl, rr, brr
+    
+    
+    
+    def _check_compatible(self, other:"RedBlackTree") -> None:
+        if not isinstance(other, RedBlackTree):
+            raise ValueError("You can only combine RedBlackTrees!")
+        # (the nodes of two multisets may count equal keys, which would end up in two nodes)
+        if self.multiset or other.multiset:
+            raise ValueError("Multisets can not be joined or combined!")
+        if (other._node_class is not self._node_class) or (other.key is not self.key) or (other.typed is not self.typed) \
+                or (other.monoid is not self.monoid):
+            raise ValueError("You can only combine trees with the same options!")
+        return None
+    
+    
+    
+    @classmethod
+    def join(cls, t1:"RedBlackTree", k, t2:"RedBlackTree") -> "RedBlackTree":
+        """ 
+        The function joins two trees and a key between them to one tree in O(log n). 
+        The nodes of t1 and t2 are reused, i.e. t1 and t2 are empty afterwards. 
+  
+        Parameters: 
+            t1 (RedBlackTree): The tree whose keys are all smaller or equal than k. 
+            k: The key (resp. item) between the trees.
+            t2 (RedBlackTree): The tree whose keys are all bigger or equal than k. 
             
-    def minimum(self) -> Node:
-        """ The function returns a node whose key is smaller or equal than the others. """
-        x = self.root
-        while x.left is not None:
-            x = x.left
-        return x
+        Returns: 
+            RedBlackTree: The joined tree (with the options of t1). 
+        """
+        t1._check_compatible(t2)
+        n = t1.new_node(k)
+        if ((t1.root is not None) and (n.key < t1.maximum().key)) or ((t2.root is not None) and (t2.minimum().key < n.key)):
+            raise ValueError("The keys of the trees are not in order!")
         
+        tree = t1._empty()
+        root, _ = tree._join(t1.root, t1._black_height(t1.root), n,
+                             t2.root, t2._black_height(t2.root))
+        tree._set_root(root)
+        t1.clear()
+        t2.clear()
+        return tree
+    
+    
+    
+    def split(self, key) -> tuple:
+        """ 
+        The function splits the tree at the input key into two trees in O(log n). 
+        The nodes are reused, i.e. the tree is empty afterwards. 
+  
+        Parameter: 
+            key: The key at which the tree is split (it does not need to be in the tree). 
+            
+        Returns: 
+            tuple: The tree with the keys smaller than key and the tree with the keys bigger or equal than key. 
+        """
+        l, _, r, _ = self._split(self.root, self._black_height(self.root), key)
+        smaller = self._empty()
+        smaller._set_root(l)
+        bigger = self._empty()
+        bigger._set_root(r)
+        self.clear()
+        return smaller, bigger
+    
+    
+    
+    # the set operations follow "Just Join for Parallel Ordered Sets" (Blelloch, Ferizovic and Sun, 2016):
+    # the root of t1 splits t2, the parts are combined recursively and joined again, which costs 
+    # O(m log(n/m + 1)) for trees with m <= n nodes; they treat the trees as sets, i.e. they expect every 
+    # key at most once per tree (like in a RedBlackTreeMap), and of equal keys the node of t1 is kept
+    def _union(self, t1:Union[Node,None], b1:int, t2:Union[Node,None], b2:int) -> tuple:
+        if t1 is None:
+            return t2, b2
+        if t2 is None:
+            return t1, b1
+        l1, bc, k, r1 = self._expose(t1, b1)
+        l2, bl2, r2, br2 = self._split(t2, b2, k.key)
+        # drop the node of t2 with the key of k
+        _, _, r2, br2 = self._split(r2, br2, k.key, or_equal=True)
+        l, bl = self._union(l1, bc, l2, bl2)
+        r, br = self._union(r1, bc, r2, br2)
+        return self._join(l, bl, k, r, br)
+    
+    
+    
+    def _intersection(self, t1:Union[Node,None], b1:int, t2:Union[Node,None], b2:int) -> tuple:
+        if (t1 is None) or (t2 is None):
+            return None, 0
+        l1, bc, k, r1 = self._expose(t1, b1)
+        l2, bl2, r2, br2 = self._split(t2, b2, k.key)
+        equal, _, r2, br2 = self._split(r2, br2, k.key, or_equal=True)
+        l, bl = self._intersection(l1, bc, l2, bl2)
+        r, br = self._intersection(r1, bc, r2, br2)
+        if equal is not None:
+            return self._join(l, bl, k, r, br)
+        return self._join2(l, bl, r, br)
+    
+    
+    
+    def _difference(self, t1:Union[Node,None], b1:int, t2:Union[Node,None], b2:int) -> tuple:
+        if (t1 is None) or (t2 is None):
+            return t1, b1
+        l1, bc, k, r1 = self._expose(t1, b1)
+        l2, bl2, r2, br2 = self._split(t2, b2, k.key)
+        equal, _, r2, br2 = self._split(r2, br2, k.key, or_equal=True)
+        l, bl = self._difference(l1, bc, l2, bl2)
+        r, br = self._difference(r1, bc, r2, br2)
+        if equal is None:
+            return self._join(l, bl, k, r, br)
+        return self._join2(l, bl, r, br)
+    
+    
+    
+    # detach the root t of a subtree from its children: returns (left child, black height of the children, t, right child)
+    def _expose(self, t:Node, bt:int) -> tuple:
+        l = t.left
+        r = t.right
+        if l is not None:
+            l.parent = None
+        if r is not None:
+            r.parent = None
+        t.left = None
+        t.right = None
+        if t.color is black:
+            return l, bt - 1, t, r
+        return l, bt, t, r
+    
+    
+    
+    def _set_operation(self, operation, other:"RedBlackTree") -> "RedBlackTree":
+        self._check_compatible(other)
+        root, _ = operation(self.root, self._black_height(self.root), other.root, other._black_height(other.root))
+        tree = self._empty()
+        tree._set_root(root)
+        self.clear()
+        other.clear()
+        return tree
+    
+    
+    
+    def union(self, other:"RedBlackTree") -> "RedBlackTree":
+        """ 
+        The function computes the union of the keys of both trees in O(m log(n/m + 1)). 
+        The nodes are reused, i.e. both trees are empty afterwards. 
+  
+        Parameter: 
+            other (RedBlackTree): The other tree (with the same options). 
+            
+        Returns: 
+            RedBlackTree: The tree with the keys of both trees (a key of both trees only once). 
+        """
+        return self._set_operation(self._union, other)
+    
+    
+    
+    def intersection(self, other:"RedBlackTree") -> "RedBlackTree":
+        """ 
+        The function computes the intersection of the keys of both trees in O(m log(n/m + 1)). 
+        The nodes are reused, i.e. both trees are empty afterwards. 
+  
+        Parameter: 
+            other (RedBlackTree): The other tree (with the same options). 
+            
+        Returns: 
+            RedBlackTree: The tree with the keys which are in both trees. 
+        """
+        return self._set_operation(self._intersection, other)
+    
+    
+    
+    def difference(self, other:"RedBlackTree") -> "RedBlackTree":
+        """ 
+        The function computes the keys of this tree which are not in the other tree in O(m log(n/m + 1)). 
+        The nodes are reused, i.e. both trees are empty afterwards. 
+  
+        Parameter: 
+            other (RedBlackTree): The other tree (with the same options). 
+            
+        Returns: 
+            RedBlackTree: The tree with the keys of this tree which are not in other. 
+        """
+        return self._set_operation(self._difference, other)
     
-    def maximum(self) -> Node:
-        """ The function returns a node whose key is bigger or equal than the others. """
-        x = self.root
-        while x.right is not None:
-            x = x.right
-        return x
+    
+    
+    def clear(self) -> None:
+        """ The function removes all nodes from the tree (in O(1)). """
+        self.root = None
+        self._length = 0
+        self._counted = True
+        return None
     
         
 ###############################################################################
         
-    # function to draw the tree in a Tex-file
-    def draw_tex(self, output=sys.stdout):
+    # functions to draw the tree: as TikZ (tikz-qtree), DOT or JSON: the nodes are visited without recursion
+    # and the text is written in large chunks; with max_depth (or max_nodes) the subtrees below
+    # the limit are drawn as one box which summarizes them (number of nodes and range of the keys)
+    def draw_tex(self, output=sys.stdout, max_depth:Union[int,None] = None, max_nodes:Union[int,None] = None) -> None:
         """ 
         The function draws the red black tree with inserted nodes into a tex-file. 
   
-        Parameter: 
+        Parameters: 
             output: The place/ writeable file where to draw the tree into (sys.stdout by default).
+            max_depth (int, None): The number of levels which are drawn, the subtrees below are summarized (None by default). 
+            max_nodes (int, None): The maximal number of drawn nodes, as many full levels are drawn as fit (None by default). 
             
         Returns: 
             None
         """
+        out = _ChunkedWriter(output)
         # r"..." : the string (...) is treated as a raw string, i.e. the \... won't be interpreted as commands
-        # """...""" (triple-quoted string): unescaped newlines and quotes are allowed (and are retained),
-        # except that three unescaped quotes in a row terminate the string.
-        # (A ``quote'' is the character used to open the string, i.e. either ' or ".)
-        print(r""" 
-        \documentclass{article}
-        
-        \usepackage[landscape,left=1cm,right=1cm,bottom=1cm,top=2cm]{geometry}
-        \usepackage{tikz}
-        \usepackage{tikz-qtree}
-        
-        %\parindent=0pt
-        %\parskip=0pt
-        
-        \begin{document}
-        \centering
-        \begin{tikzpicture}[scale=1,]
-        \tikzset{every tree node/.style={, circle, draw=black}}
-        \tikzset{every leaf node/.style={fill=black}}
-        \Tree""", file=output) # writes the tex-code in output
-        
-        def _color_nodes(node):
-            if node.color is red:
-                return "\color{red}"
-            return "\color{black}"
-        
-        def _draw_nodes(node, out):
-            if node is not None:
-                # the syntax for generating a tree in Tex with the package tikz-qtree:
-                # - subtrees are delimited by square brackets
-                # - a subtree’s root label is joined by a dot (.) to its opening bracket
-                # - spaces are required after every (internal or leaf) node label
-                print(r"[.{" + _color_nodes(node) + str(node.key) + r"} ", file=out)
-                _draw_nodes(node.left, out)
-                _draw_nodes(node.right, out)
-                print(r" ]", file=out)
-            else:
-                print(r" { } ", file=out)
+        out.write(r"""\documentclass{article}
+
+\usepackage[landscape,left=1cm,right=1cm,bottom=1cm,top=2cm]{geometry}
+\usepackage{tikz}
+\usepackage{tikz-qtree}
+
+\begin{document}
+\centering
+\begin{tikzpicture}[scale=1,]
+\tikzset{every tree node/.style={, circle, draw=black}}
+\tikzset{every leaf node/.style={fill=black}}
+\Tree""")
+
+        # the syntax for generating a tree in Tex with the package tikz-qtree:
+        # - subtrees are delimited by square brackets
+        # - a subtree’s root label is joined by a dot (.) to its opening bracket
+        # - spaces are required after every (internal or leaf) node label
+        for event, x in self._export_walk(self._export_depth(max_depth, max_nodes)):
+            if event is _enter:
+                color = r"\color{red}" if x.color is red else r"\color{black}"
+                out.write(r" [.{" + color + str(x.key) + r"} ")
+            elif event is _exit:
+                out.write(r" ]")
+            elif event is _leaf:
+                out.write(r" { } ")
+            elif event is _collapsed:
+                count, lo, hi = self._summary(x)
+                out.write(r" \node[rectangle,draw=black,fill=white,align=center]{" + str(count) + r" nodes\\"
+                          + str(lo) + r" -- " + str(hi) + r"}; ")
+
+        out.write(r""";
+\end{tikzpicture}
+\end{document}
+""")
+        out.flush() 
+        return None
+        
+
+
+    def draw_dot(self, output=sys.stdout, max_depth:Union[int,None] = None, max_nodes:Union[int,None] = None) -> None: 
+        """
+        The function writes the red black tree in the DOT language of Graphviz (e.g. for "dot -Tsvg").
+        
+        Parameters:
+            output: The writeable file where to write the tree into (sys.stdout by default).
+            max_depth (int, None): The number of levels which are written, the subtrees below are summarized (None by default).
+            max_nodes (int, None): The maximal number of written nodes, as many full levels are written as fit (None by default).
+        
+        Returns:
+            None
+        """ 
+        out = _ChunkedWriter(output) 
+        out.write("digraph RedBlackTree {\n  node [style=filled, fontcolor=white];\n") 
+        
+        # the empty leaves are left out, every other node gets a number as its name
+        names = []
+        number = 0
+        for event, x in self._export_walk(self._export_depth(max_depth, max_nodes)): 
+            if (event is _enter) or (event is _collapsed): 
+                name = "n" + str(number) 
+                number += 1
+                if event is _enter: 
+                    color = "red" if x.color is red else "black"
+                    out.write("  " + name + ' [label="' + _dot_escape(x.key) + '", fillcolor=' + color + "];\n") 
+                else: 
+                    count, lo, hi = self._summary(x) 
+                    out.write("  " + name + ' [shape=box, label="' + str(count) + " nodes\\n" + _dot_escape(lo) + " .. "
+                              + _dot_escape(hi) + '", fillcolor=lightgrey, fontcolor=black];\n') 
+                if names: 
+                    out.write("  " + names[-1] + " -> " + name + ";\n") 
+                if event is _enter: 
+                    names.append(name) 
+            elif event is _exit: 
+                names.pop() 
                 
-        _draw_nodes(self.root, output)
+        out.write("}\n") 
+        out.flush() 
+        return None
+        
+
+
+    def draw_json(self, output=sys.stdout, max_depth:Union[int,None] = None, max_nodes:Union[int,None] = None) -> None: 
+        """
+        The function writes the red black tree as nested JSON objects
+        {"key": ..., "color": "red"/"black", "left": ..., "right": ...}, where an empty leaf is null
+        and a summarized subtree is {"collapsed": number of nodes, "min": ..., "max": ...}.
+        (Keys which are no JSON values are written as strings.)
+        
+        Parameters:
+            output: The writeable file where to write the tree into (sys.stdout by default).
+            max_depth (int, None): The number of levels which are written, the subtrees below are summarized (None by default).
+            max_nodes (int, None): The maximal number of written nodes, as many full levels are written as fit (None by default).
+        
+        Returns:
+            None
+        """ 
+        out = _ChunkedWriter(output) 
+        for event, x in self._export_walk(self._export_depth(max_depth, max_nodes)): 
+            if event is _enter: 
+                color = "red" if x.color is red else "black"
+                out.write('{"key": ' + json.dumps(x.key, default=str) + ', "color": "' + color + '", "left": ') 
+            elif event is _between: 
+                out.write(', "right": ') 
+            elif event is _exit: 
+                out.write("}") 
+            elif event is _leaf: 
+                out.write("null") 
+            else: 
+                count, lo, hi = self._summary(x) 
+                out.write('{"collapsed": ' + str(count) + ', "min": ' + json.dumps(lo, default=str) 
+                          + ', "max": ' + json.dumps(hi, default=str) + "}") 
+        out.write("\n") 
+        out.flush() 
+        return None
+        
+
+
+    # the depth up to which the nodes are exported: max_depth, or the number of full levels
+    # with at most max_nodes nodes together (found by a breadth-first search which stops there) 
+    def _export_depth(self, max_depth:Union[int,None], max_nodes:Union[int,None]) -> Union[int,None]: 
+        if max_nodes is None: 
+            return max_depth
+        depth = 0
+        count = 0
+        level = [] if self.root is None else [self.root]
+        while level and ((max_depth is None) or (depth < max_depth)): 
+            count += len(level) 
+            if count > max_nodes: 
+                break
+            depth += 1
+            level = [c for x in level for c in (x.left, x.right) if c is not None]
+        else: 
+            # all levels fit
+            return max_depth
+        return depth
+        
+
+
+    # visit the nodes in preorder with an explicit stack and yield the events (event, node) for the writers: 
+    # _enter before and _exit after the subtree of a node, _between the left and the right subtree,
+    # _leaf for an empty leaf and _collapsed for a subtree at the depth max_depth
+    def _export_walk(self, max_depth:Union[int,None] = None): 
+        stack = [(_enter, self.root, 0)]
+        while stack: 
+            event, x, depth = stack.pop() 
+            if event is _enter: 
+                if x is None: 
+                    yield _leaf, None
+                    continue
+                if (max_depth is not None) and (depth >= max_depth): 
+                    yield _collapsed, x
+                    continue
+                stack.append((_exit, x, depth)) 
+                stack.append((_enter, x.right, depth + 1)) 
+                stack.append((_between, x, depth)) 
+                stack.append((_enter, x.left, depth + 1)) 
+            yield event, x
+            
+
+
+    # the number of nodes, the smallest and the biggest key in the subtree of x
+    # (the number is counted with a stack if the tree stores no sizes) 
+    def _summary(self, x:Node) -> tuple: 
+        if self.order_statistics: 
+            count = x.size
+        else: 
+            count = 0
+            stack = [x]
+            while stack: 
+                y = stack.pop() 
+                count += 1
+                if y.left is not None: 
+                    stack.append(y.left) 
+                if y.right is not None: 
+                    stack.append(y.right) 
+        lo = x
+        while lo.left is not None: 
+            lo = lo.left
+        hi = x
+        while hi.right is not None: 
+            hi = hi.right
+        return count, lo.key, hi.key
+        
+###############################################################################
+
+# the events of RedBlackTree._export_walk
+_enter = "enter"
+_between = "between"
+_exit = "exit"
+_leaf = "leaf"
+_collapsed = "collapsed"
+
+def _dot_escape(key) -> str: 
+    return str(key).replace("\\", "\\\\").replace('"', '\\"') 
+    
+
+
+class _ChunkedWriter: 
+    """
+    This is a class which collects the pieces of a text and writes them in large chunks
+    (instead of one write or print call per piece).
+    """ 
+    
+    def __init__(self, output, chunk_size:int = 1 << 16): 
+        self.output = output
+        self.chunk_size = chunk_size
+        self._pieces = []
+        self._size = 0
         
-        print(r""";
-        \end{tikzpicture}
-        \end{document}
-        """, file=output)
+
+
+    def write(self, piece:str) -> None: 
+        self._pieces.append(piece) 
+        self._size += len(piece) 
+        if self._size >= self.chunk_size: 
+            self.flush() 
+        return None
         
+
+
+    def flush(self) -> None: 
+        if self._pieces: 
+            self.output.write("".join(self._pieces)) 
+            self._pieces = []
+            self._size = 0
         return None
         
 ###############################################################################
@@ -584,17 +2795,12 @@ if __name__ == '__main__':
     
     
     
-    # produce the tex-files
-    bt.draw_tex(open("bt.tex", "w"))
-    os.system("pdflatex bt.tex")
-    rbt.draw_tex(open("rbt.tex", "w"))
-    os.system("pdflatex rbt.tex")# executes the command in a subshell
-        
-    rbt_test.draw_tex(open("rbt_test.tex", "w"))
-    os.system("pdflatex rbt_test.tex")
-    
-    rbt_random.draw_tex(open("rbt_random.tex", "w"))
-    os.system("pdflatex rbt_random.tex")
+    # produce the tex-files; they are only compiled with pdflatex if asked for (python red_black_tree.py --pdf)
+    for name, tree in (("bt", bt), ("rbt", rbt), ("rbt_test", rbt_test), ("rbt_random", rbt_random)):
+        with open(name + ".tex", "w") as f:
+            tree.draw_tex(f)
+        if "--pdf" in sys.argv[1:]:
+            os.system("pdflatex " + name + ".tex") # executes the command in a subshell
 
 
 
@@ -0,0 +1,287 @@
+# -*- coding: utf-8 -*-
+""" 
+A sorted key-value map on top of the red black tree of red_black_tree.py. 
+
+Every node stores its value itself (in the slot "value"), so no second dictionary
+next to the tree is needed. 
+"""
+
+from collections.abc import ItemsView, KeysView, MutableMapping, ValuesView
+
+from typing import Union
+
+from red_black_tree import Monoid, Node, RedBlackTree
+
+
+###############################################################################
+
+# a marker for "no default value given" (None can be a default value itself)
+_missing = object()
+
+class RedBlackTreeMap(RedBlackTree, MutableMapping):
+    """ 
+    This is a class for a map whose keys are kept in increasing order in a red black tree. 
+    
+    Each key is stored at most once: assigning to an existing key updates the value of its node
+    in place, and so do insert_rbt and insert with a node of an existing key (unlike those of
+    RedBlackTree, which would insert a second node); add and insert_many, which get keys without
+    values, raise a TypeError. 
+    All operations on a single key cost O(log n), the iteration is lazy and in increasing order of the keys. 
+    
+    Attributes: 
+        root (Node, None): The root node, i.e. the initial node of the tree. 
+        order_statistics (bool): Whether every node stores the size of its subtree (see RedBlackTree). 
+        monoid (Monoid, None): The monoid whose aggregates of the subtrees the nodes store (see RedBlackTree),
+            e.g. Monoid.sum(attrgetter("value")) for the sum of the values of a range of keys.
+    """
+    
+    _fields = ("value",)
+    
+    
+    
+    def __init__(self, items = None, order_statistics:bool = False, monoid:Union[Monoid,None] = None):
+        """ 
+        The constructor for RedBlackTreeMaps. 
+        
+        Parameters: 
+            items: A mapping or an iterable of (key, value) pairs which are inserted (None by default). 
+            order_statistics (bool): Whether every node stores the size of its subtree (False by default). 
+            monoid (Monoid, None): The monoid of the aggregates (None by default).
+        """
+        super().__init__(order_statistics, monoid=monoid)
+        if items is not None:
+            self.update(items)
+    
+    
+    
+    @classmethod
+    def from_sorted(cls, items, **options) -> "RedBlackTreeMap":
+        """ 
+        The function builds a map from (key, value) pairs whose keys are strictly increasing in O(n). 
+        
+        Parameters: 
+            items: The (key, value) pairs sorted by their keys. 
+            options: The keyword arguments for the constructor (e.g. order_statistics=True). 
+            
+        Returns: 
+            RedBlackTreeMap: The new map. 
+        """
+        tree = cls(**options)
+        node_class = tree._node_class
+        
+        nodes = []
+        for k, v in items:
+            if nodes and not (nodes[-1].key < k):
+                raise ValueError("The keys are not strictly increasing!")
+            n = node_class(k)
+            n.value = v
+            nodes.append(n)
+        
+        tree._link_sorted(nodes)
+        return tree
+    
+    
+    
+    @classmethod
+    def from_iterable(cls, items, **options) -> "RedBlackTreeMap":
+        """ 
+        The function builds a map from (key, value) pairs in any order in O(n log n);
+        like for a dict, the last value of a key wins. 
+        
+        Parameters: 
+            items: A mapping or an iterable of (key, value) pairs. 
+            options: The keyword arguments for the constructor (e.g. order_statistics=True). 
+            
+        Returns: 
+            RedBlackTreeMap: The new map. 
+        """
+        if hasattr(items, "items"):
+            items = items.items()
+        # the sort is stable, so among equal keys the last pair is the last one of its group
+        ordered = sorted(items, key=lambda item: item[0])
+        unique = []
+        for item in ordered:
+            if unique and not (unique[-1][0] < item[0]):
+                unique[-1] = item
+            else:
+                unique.append(item)
+        return cls.from_sorted(unique, **options)
+    
+    ###########################################################################
+    # the interface of MutableMapping
+    def __getitem__(self, key):
+        n = self.search(key)
+        if n is None:
+            raise KeyError(key)
+        return n.value
+    
+    
+    
+    def __setitem__(self, key, value) -> None:
+        n = self._node_class(key)
+        n.value = value
+        self._assign(n)
+        return None
+    
+    
+    
+    # insert the node n, or assign its value to the node with an equal key
+    # (one descent: either the node with the equal key is found or n is inserted)
+    def _assign(self, n:Node) -> None:
+        found = self._insert_unique(n)
+        if found is None:
+            self._fix(n)
+        else:
+            found.value = n.value
+            # (the aggregates above the node may depend on its value)
+            if self._update is not None:
+                self._update_path(found)
+        return None
+    
+    
+    
+    def __delitem__(self, key) -> None:
+        self.delete(key)
+        return None
+    
+    
+    
+    def get(self, key, default = None):
+        """ The function returns the value of the input key, or default if the key is not in the map. """
+        n = self.search(key)
+        if n is None:
+            return default
+        return n.value
+    
+    
+    
+    def setdefault(self, key, default = None):
+        """ The function returns the value of the input key and inserts the key with default first if it is not in the map. """
+        n = self._node_class(key)
+        n.value = default
+        found = self._insert_unique(n)
+        if found is None:
+            self._fix(n)
+            return default
+        return found.value
+    
+    
+    
+    def pop(self, key, default = _missing):
+        """ The function removes the input key and returns its value (or default if the key is not in the map). """
+        n = self.search(key)
+        if n is None:
+            if default is _missing:
+                raise KeyError(key)
+            return default
+        self._delete(n)
+        return n.value
+    
+    
+    
+    def popitem(self) -> tuple:
+        """ The function removes the item with the smallest key and returns it as (key, value). """
+        n = self.pop_min()
+        return (n.key, n.value)
+    
+    ###########################################################################
+    # the insertions of RedBlackTree: they would insert a second node for a key which is in the map already,
+    # so the nodes are assigned like by map[key] = value, and keys without values are rejected
+    def insert_rbt(self, n:Node) -> None:
+        """ 
+        The function inserts the input node (with its key and value) into the map, or assigns its value to
+        the node with an equal key (like map[n.key] = n.value). 
+        
+        Parameter: 
+            n (Node): The node which is inserted (created with new_node, with the attribute value). 
+            
+        Returns: 
+            None
+        """
+        if not isinstance(n, self._node_class):
+            raise ValueError("You can only insert " + self._node_class.__name__ + "s!")
+        self._assign(n)
+        return None
+    
+    
+    
+    def insert(self, n:Node) -> None:
+        """ The function does the same as insert_rbt (a map is always kept balanced, since it inserts no duplicates). """
+        self.insert_rbt(n)
+        return None
+    
+    
+    
+    def add(self, item) -> None:
+        """ The function is not supported by maps, whose keys need values (use map[key] = value instead). """
+        raise TypeError("A RedBlackTreeMap needs a value for every key (use map[key] = value or update)!")
+    
+    
+    
+    def insert_many(self, iterable) -> None:
+        """ The function is not supported by maps, whose keys need values (use update instead). """
+        raise TypeError("A RedBlackTreeMap needs a value for every key (use map[key] = value or update)!")
+    
+    ###########################################################################
+    # sorted views which iterate lazily over the nodes
+    def keys(self) -> "_KeysView":
+        """ The function returns a view of the keys in increasing order. """
+        return _KeysView(self)
+    
+    
+    
+    def values(self) -> "_ValuesView":
+        """ The function returns a view of the values in increasing order of their keys. """
+        return _ValuesView(self)
+    
+    
+    
+    def items(self) -> "_ItemsView":
+        """ The function returns a view of the (key, value) pairs in increasing order of the keys. """
+        return _ItemsView(self)
+    
+    
+    
+    # iterate over the nodes (in increasing or decreasing order of the keys)
+    def _nodes(self, reverse:bool = False):
+        if self.root is None:
+            return iter(())
+        if reverse:
+            return self._walk(self.maximum(), reverse=True)
+        return self._walk(self.minimum())
+    
+    
+    
+    def __repr__(self) -> str:
+        return type(self).__name__ + "({" + ", ".join(repr(n.key) + ": " + repr(n.value) for n in self._nodes()) + "})"
+
+
+
+class _KeysView(KeysView):
+    
+    def __reversed__(self):
+        return reversed(self._mapping)
+
+
+
+class _ValuesView(ValuesView):
+    
+    def __iter__(self):
+        for n in self._mapping._nodes():
+            yield n.value
+    
+    def __reversed__(self):
+        for n in self._mapping._nodes(reverse=True):
+            yield n.value
+
+
+
+class _ItemsView(ItemsView):
+    
+    def __iter__(self):
+        for n in self._mapping._nodes():
+            yield (n.key, n.value)
+    
+    def __reversed__(self):
+        for n in self._mapping._nodes(reverse=True):
+            yield (n.key, n.value)
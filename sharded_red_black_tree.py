@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+""" 
+A range-partitioned set of red black trees (shards) of red_black_tree.py. 
+
+The keys are routed to the shards by sorted splitter keys: shard i holds the keys k with
+splitters[i-1] <= k < splitters[i]. A bulk load sorts and merges the keys in a process pool,
+so it can use more than one core. Since the shards hold disjoint ranges in the order of the
+splitters, the merge of the shards for inorder and range queries is their concatenation. 
+"""
+
+import os
+import random
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from typing import Union
+
+from mapped_red_black_tree import dumps_sorted, loads
+from red_black_tree import RedBlackTree
+
+
+###############################################################################
+
+# the work of one process during a bulk load: sort a chunk of the keys and cut it at the splitters;
+# the result is a (compactly pickled) list of sorted runs, one per shard
+def _sorted_runs(keys:list, splitters:list) -> list:
+    keys.sort()
+    runs = []
+    lo = 0
+    for s in splitters:
+        hi = bisect_left(keys, s, lo)
+        runs.append(keys[lo:hi])
+        lo = hi
+    runs.append(keys[lo:])
+    return runs
+
+
+
+# the second part of the work of the processes: merge the runs of one shard and return the shard in the
+# file format of mapped_red_black_tree.py, whose loads links the nodes in O(n) without a comparison
+# (or the merged keys, if they are no int or float keys of one type, for RedBlackTree.from_sorted)
+def _shard_data(runs:list) -> Union[bytes,list]:
+    merged = list(chain.from_iterable(runs))
+    # (the runs are sorted already, so the sort of their concatenation is a merge)
+    merged.sort()
+    if all(type(k) is int for k in merged) or all(type(k) is float for k in merged):
+        try:
+            return dumps_sorted(merged)
+        except ValueError:
+            # (ints with more than 64 bits)
+            pass
+    return merged
+
+
+
+class ShardedRedBlackTree:
+    """ 
+    This is a class for a red black tree which is split into several trees by ranges of the keys. 
+    
+    Attributes: 
+        splitters (list): The sorted keys at which the shards are split. 
+        shards (list): The RedBlackTrees, one more than splitters. 
+    """
+    
+    
+    
+    def __init__(self, splitters:list, order_statistics:bool = False):
+        """ 
+        The constructor for ShardedRedBlackTrees. 
+        
+        Parameters: 
+            splitters (list): The keys at which the shards are split, in increasing order (without duplicates). 
+            order_statistics (bool): Whether every node stores the size of its subtree (see RedBlackTree). 
+        """
+        splitters = list(splitters)
+        for i in range(1, len(splitters)):
+            if not (splitters[i - 1] < splitters[i]):
+                raise ValueError("The splitters are not strictly increasing!")
+        self.splitters = splitters
+        self.shards = [RedBlackTree(order_statistics=order_statistics) for _ in range(len(splitters) + 1)]
+    
+    
+    
+    @classmethod
+    def from_iterable(cls, iterable, shards:Union[int,None] = None, workers:Union[int,None] = None,
+                      sample:int = 100, **options) -> "ShardedRedBlackTree":
+        """ 
+        The function builds a sharded tree from keys in any order. The splitters are chosen from a random
+        sample of the keys, so that the shards get about the same number of keys. The keys are sorted in
+        a ProcessPoolExecutor (every process sorts a chunk and cuts it into runs for the shards), then the
+        processes merge the runs of each shard and return it in the compact file format of dump (for int
+        or float keys), so this process only creates and links the nodes in O(n) (see loads). 
+        
+        Parameters: 
+            iterable: The keys. 
+            shards (int, None): The number of shards (None for the number of CPUs). 
+            workers (int, None): The number of processes (None for the number of shards, 1 for no process pool). 
+            sample (int): The number of sampled keys per shard for the choice of the splitters (100 by default). 
+            options: The keyword arguments for the constructor (e.g. order_statistics=True). 
+            
+        Returns: 
+            ShardedRedBlackTree: The new tree. 
+        """
+        keys = list(iterable)
+        if shards is None:
+            shards = os.cpu_count() or 1
+        if workers is None:
+            workers = shards
+        
+        # the quantiles of a sorted sample (equal candidates are merged, so there may be fewer shards)
+        candidates = sorted(random.sample(keys, min(len(keys), shards * sample)))
+        splitters = []
+        for i in range(1, shards):
+            s = candidates[i * len(candidates) // shards] if candidates else None
+            if (s is not None) and ((not splitters) or (splitters[-1] < s)):
+                splitters.append(s)
+        tree = cls(splitters, **options)
+        
+        size = -(-len(keys) // workers) if keys else 1
+        chunks = [keys[i:i + size] for i in range(0, len(keys), size)]
+        del keys
+        if workers > 1 and len(chunks) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                tree._load_shards(pool.map, chunks)
+        else:
+            tree._load_shards(map, chunks)
+        return tree
+    
+    
+    
+    # sort the chunks and merge the runs of each shard with the input map function (the one of the process
+    # pool or the builtin map), and build the shards from the results
+    def _load_shards(self, mapper, chunks:list) -> None:
+        results = list(mapper(_sorted_runs, chunks, [self.splitters] * len(chunks)))
+        shard_runs = [[runs[i] for runs in results] for i in range(len(self.shards))]
+        del results
+        for i, data in enumerate(mapper(_shard_data, shard_runs)):
+            order_statistics = self.shards[i].order_statistics
+            if isinstance(data, bytes):
+                self.shards[i] = loads(data, order_statistics=order_statistics)
+            else:
+                self.shards[i] = RedBlackTree.from_sorted(data, order_statistics=order_statistics)
+        return None
+    
+    ###########################################################################
+    def shard_of(self, key) -> RedBlackTree:
+        """ The function returns the shard which holds (or would hold) the input key. """
+        return self.shards[bisect_right(self.splitters, key)]
+    
+    
+    
+    def insert(self, key) -> None:
+        """ The function inserts the input key into its shard. """
+        shard = self.shard_of(key)
+        shard.add(key)
+        return None
+    
+    
+    
+    def insert_many(self, iterable) -> None:
+        """ The function inserts the input keys, grouped by their shards. """
+        groups = [[] for _ in self.shards]
+        splitters = self.splitters
+        for k in iterable:
+            groups[bisect_right(splitters, k)].append(k)
+        for shard, group in zip(self.shards, groups):
+            if group:
+                shard.insert_many(group)
+        return None
+    
+    
+    
+    def delete(self, key) -> None:
+        """ The function deletes a node with the input key from its shard (KeyError if there is none). """
+        self.shard_of(key).delete(key)
+        return None
+    
+    
+    
+    def __contains__(self, key) -> bool:
+        return key in self.shard_of(key)
+    
+    
+    
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self.shards)
+    
+    ###########################################################################
+    def minimum(self):
+        """ The function returns the smallest key (ValueError for an empty tree). """
+        for shard in self.shards:
+            if shard.root is not None:
+                return shard.minimum().key
+        raise ValueError("The tree is empty!")
+    
+    
+    
+    def maximum(self):
+        """ The function returns the biggest key (ValueError for an empty tree). """
+        for shard in reversed(self.shards):
+            if shard.root is not None:
+                return shard.maximum().key
+        raise ValueError("The tree is empty!")
+    
+    
+    
+    def __iter__(self):
+        """ The function iterates lazily over the keys of all shards in increasing order. """
+        return chain.from_iterable(self.shards)
+    
+    
+    
+    def __reversed__(self):
+        """ The function iterates lazily over the keys of all shards in decreasing order. """
+        return chain.from_iterable(reversed(shard) for shard in reversed(self.shards))
+    
+    
+    
+    def inorder(self) -> list:
+        """ The function returns the keys of all shards in increasing order. """
+        return list(self)
+    
+    
+    
+    def irange(self, lo = None, hi = None, inclusive:tuple = (True, True), reverse:bool = False):
+        """ 
+        The function iterates lazily over the keys between lo and hi (see RedBlackTree.irange);
+        only the shards whose ranges overlap [lo, hi] are visited. 
+        
+        Parameters: 
+            lo: The lower bound (None for no lower bound). 
+            hi: The upper bound (None for no upper bound). 
+            inclusive (tuple): Whether lo and hi themselves are included ((True, True) by default). 
+            reverse (bool): Whether the keys are returned in decreasing order (False by default). 
+            
+        Returns: 
+            generator: The keys in the range. 
+        """
+        first = 0 if lo is None else bisect_right(self.splitters, lo)
+        last = len(self.splitters) if hi is None else bisect_right(self.splitters, hi)
+        shards = self.shards[first:last + 1]
+        if reverse:
+            shards.reverse()
+        return chain.from_iterable(shard.irange(lo, hi, inclusive, reverse) for shard in shards)
+    
+    
+    
+    def __repr__(self) -> str:
+        return type(self).__name__ + "(" + repr(self.splitters) + ", " + repr(self.inorder()) + ")"
@@ -0,0 +1,8 @@
+# -*- coding: utf-8 -*-
+"""  
+Randomized invariant tests: every structure is changed by random operations, checked with
+validate() after each of them and compared with a sorted list.  
+
+Usage:  
+    python -m unittest discover tests (or python -m pytest tests) 
+"""
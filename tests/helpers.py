@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+""" 
+The randomized harness of the tests: a structure and a simple model of it (e.g. a sorted list of
+its keys) are changed by the same random operations, and checked against each other every few steps. 
+"""
+
+import random
+import unittest
+
+
+class RandomizedTestCase(unittest.TestCase):
+    """ 
+    This is a base class for the tests which compare a structure with a model. 
+    """
+    
+    def check_sorted(self, tree, keys:list, key = None) -> None:
+        """ 
+        The function checks the invariants of the tree (validate) and compares its keys with the model. 
+        
+        Parameters: 
+            tree: The tree (anything with validate, iteration in order and len). 
+            keys (list): The keys of the model in any order. 
+            key (callable, None): The key function of the tree (None by default). 
+        """
+        tree.validate()
+        self.assertEqual(list(tree), sorted(keys, key=key))
+        self.assertEqual(len(tree), len(keys))
+    
+    
+    
+    def run_operations(self, seed:int, operations:list, check, steps:int = 1000, check_every:int = 50) -> None:
+        """ 
+        The function runs random operations, each of which changes (or queries) the structure and its model
+        in the same way, and calls check after every check_every steps and at the end. 
+        
+        Parameters: 
+            seed (int): The seed of the random numbers. 
+            operations (list): The (weight, operation) pairs, where operation is called with the Random
+                instance (an operation which is not possible, e.g. on an empty model, does nothing). 
+            check (callable): The function without arguments which compares the structure with the model. 
+            steps (int): The number of operations (1000 by default). 
+            check_every (int): The number of operations between two checks (50 by default). 
+        """
+        for operation, rnd, due in _schedule(seed, operations, steps, check_every):
+            operation(rnd)
+            if due:
+                check()
+        return None
+    
+    
+    
+    async def run_async_operations(self, seed:int, operations:list, check, steps:int = 1000, check_every:int = 50) -> None:
+        """ 
+        The function does the same as run_operations for coroutine functions (the operations and check),
+        e.g. for a structure of asyncio whose other tasks run while an operation awaits. 
+        """
+        for operation, rnd, due in _schedule(seed, operations, steps, check_every):
+            await operation(rnd)
+            if due:
+                await check()
+        return None
+
+
+
+# the operations of run_operations: (operation, rnd, whether a check follows) for every step
+def _schedule(seed:int, operations:list, steps:int, check_every:int):
+    rnd = random.Random(seed)
+    weights = [weight for weight, _ in operations]
+    functions = [operation for _, operation in operations]
+    for step in range(1, steps + 1):
+        yield rnd.choices(functions, weights)[0], rnd, (step % check_every == 0) or (step == steps)
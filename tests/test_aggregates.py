@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+""" 
+Tests for the range aggregates of RedBlackTree and RedBlackTreeMap (monoid=...). 
+"""
+
+import random
+import unittest
+from operator import attrgetter
+
+from red_black_tree import Monoid, RedBlackTree
+from red_black_tree_map import RedBlackTreeMap
+from tests.helpers import RandomizedTestCase
+
+
+# a monoid which is not commutative: the keys of a range as a string, in increasing order
+def _concat() -> Monoid:
+    return Monoid("", lambda a, b: a + b, lambda n: str(n.key) + ",")
+
+
+def _expected(keys:list, lo, hi, inclusive:tuple) -> list:
+    return [k for k in sorted(keys)
+            if ((lo < k) or (inclusive[0] and lo == k)) and ((k < hi) or (inclusive[1] and k == hi))]
+
+
+class TestAggregates(RandomizedTestCase):
+    
+    def check(self, tree:RedBlackTree, keys:list, rnd:random.Random, reduce) -> None:
+        self.check_sorted(tree, keys)
+        self.assertEqual(tree.aggregate(), reduce(sorted(keys)))
+        for _ in range(10):
+            lo, hi = sorted(rnd.randrange(-10, 310) for _ in range(2))
+            inclusive = (rnd.random() < 0.5, rnd.random() < 0.5)
+            self.assertEqual(tree.aggregate(lo, hi, inclusive), reduce(_expected(keys, lo, hi, inclusive)))
+    
+    
+    
+    def test_random_operations(self):
+        rnd = random.Random(24)
+        cases = [(Monoid.sum(), {}, sum),
+                 (Monoid.sum(), {"multiset": True, "order_statistics": True}, sum),
+                 (Monoid.count(), {"multiset": True}, len),
+                 (Monoid.min(), {"order_statistics": True}, lambda ks: min(ks, default=None)),
+                 (Monoid.max(), {}, lambda ks: max(ks, default=None)),
+                 (_concat(), {}, lambda ks: "".join(str(k) + "," for k in ks))]
+        for monoid, options, reduce in cases:
+            multiset = options.get("multiset", False)
+            tree = RedBlackTree(monoid=monoid, **options)
+            keys = []
+            
+            def add(rnd:random.Random) -> None:
+                k = rnd.randrange(300)
+                if multiset or (k not in keys):
+                    tree.add(k)
+                    keys.append(k)
+            
+            def insert_many(rnd:random.Random) -> None:
+                batch = list({rnd.randrange(300) for _ in range(rnd.randrange(20))} - set(keys))
+                tree.insert_many(batch)
+                keys.extend(batch)
+            
+            def delete(rnd:random.Random) -> None:
+                if keys:
+                    k = rnd.choice(keys)
+                    tree.delete(k)
+                    keys.remove(k)
+            
+            def pop(rnd:random.Random) -> None:
+                if keys:
+                    n = tree.pop_min() if rnd.random() < 0.5 else tree.pop_max()
+                    keys.remove(n.key)
+            
+            self.run_operations(24, [(40, add), (10, insert_many), (30, delete), (10, pop)],
+                                lambda: self.check(tree, keys, rnd, reduce), steps=1500, check_every=100)
+    
+    
+    
+    def test_split_join_and_union(self):
+        rnd = random.Random(42)
+        for monoid, reduce in ((Monoid.sum(), sum), (_concat(), lambda ks: "".join(str(k) + "," for k in ks))):
+            keys = rnd.sample(range(300), 150)
+            tree = RedBlackTree.from_iterable(keys, monoid=monoid)
+            self.check(tree, keys, rnd, reduce)
+            for _ in range(10):
+                key = rnd.randrange(300)
+                left, right = tree.split(key)
+                self.check(left, [k for k in keys if k < key], rnd, reduce)
+                self.check(right, [k for k in keys if not (k < key)], rnd, reduce)
+                if right.root is None:
+                    tree = left
+                    continue
+                tree = RedBlackTree.join(left, right.pop_min().key, right)
+                self.check(tree, keys, rnd, reduce)
+            
+            others = rnd.sample(range(300), 100)
+            union = tree.union(RedBlackTree.from_iterable(others, monoid=monoid))
+            self.check(union, sorted(set(keys) | set(others)), rnd, reduce)
+    
+    
+    
+    def test_map_values(self):
+        rnd = random.Random(7)
+        tree = RedBlackTreeMap(monoid=Monoid.sum(attrgetter("value")))
+        expected = {}
+        
+        def assign(rnd:random.Random) -> None:
+            # (also overwrites the values of existing keys in place)
+            k = rnd.randrange(200)
+            tree[k] = expected[k] = rnd.randrange(-50, 50)
+        
+        def delete(rnd:random.Random) -> None:
+            k = rnd.randrange(200)
+            if k in expected:
+                del tree[k]
+                del expected[k]
+        
+        def update(rnd:random.Random) -> None:
+            items = {rnd.randrange(200): rnd.randrange(-50, 50) for _ in range(rnd.randrange(10))}
+            tree.update(items)
+            expected.update(items)
+        
+        def check() -> None:
+            self.check_sorted(tree, list(expected))
+            self.assertEqual(tree.aggregate(), sum(expected.values()))
+            lo, hi = sorted(rnd.randrange(200) for _ in range(2))
+            self.assertEqual(tree.aggregate(lo, hi), sum(v for k, v in expected.items() if lo <= k <= hi))
+        
+        self.run_operations(7, [(60, assign), (20, delete), (10, update)], check, steps=2000, check_every=100)
+    
+    
+    
+    def test_without_monoid(self):
+        with self.assertRaises(ValueError):
+            RedBlackTree.from_iterable([1, 2]).aggregate()
+        with self.assertRaises(ValueError):
+            RedBlackTree(monoid=sum)
+        with self.assertRaises(ValueError):
+            RedBlackTree(monoid=Monoid.sum()).union(RedBlackTree())
+
+
+if __name__ == '__main__':
+    unittest.main()
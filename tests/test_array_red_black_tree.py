@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+""" 
+Tests for ArrayRedBlackTree against a sorted list, with the reuse of the freed slots. 
+"""
+
+import random
+import unittest
+
+from array_red_black_tree import ArrayRedBlackTree
+from tests.helpers import RandomizedTestCase
+
+
+class TestArrayRedBlackTree(RandomizedTestCase):
+    
+    def check(self, tree:ArrayRedBlackTree, keys:list, peak:int) -> None:
+        tree.validate()
+        self.assertEqual(tree.inorder(), sorted(keys))
+        self.assertEqual(len(tree), len(keys))
+        # the arrays only grow if there is no free slot, i.e. they have as many slots as the tree had nodes at most
+        self.assertEqual(len(tree._left), peak)
+        self.assertEqual(len(tree._colors), (peak + 7) // 8)
+    
+    
+    
+    def test_random_operations(self):
+        for typecode, make in ((None, int), ("q", int), ("d", float), (None, str)):
+            tree = ArrayRedBlackTree(typecode)
+            keys = []
+            peak = [0]
+            
+            def insert(rnd:random.Random) -> None:
+                k = make(rnd.randrange(300))
+                tree.insert(k)
+                keys.append(k)
+                peak[0] = max(peak[0], len(keys))
+            
+            def remove(rnd:random.Random) -> None:
+                if keys:
+                    k = rnd.choice(keys)
+                    tree.remove(k)
+                    keys.remove(k)
+                with self.assertRaises(KeyError):
+                    tree.remove(make(300))
+            
+            def query(rnd:random.Random) -> None:
+                k = make(rnd.randrange(300))
+                self.assertEqual(k in tree, k in keys)
+                if keys:
+                    self.assertEqual(tree.minimum(), min(keys))
+                    self.assertEqual(tree.maximum(), max(keys))
+            
+            # (phases of more insertions and of more removals, so that many slots are freed and reused)
+            self.run_operations(3, [(60, insert), (30, remove), (10, query)], lambda: self.check(tree, keys, peak[0]),
+                                steps=800)
+            self.run_operations(4, [(20, insert), (70, remove), (10, query)], lambda: self.check(tree, keys, peak[0]),
+                                steps=800)
+            self.run_operations(5, [(70, insert), (20, remove), (10, query)], lambda: self.check(tree, keys, peak[0]),
+                                steps=800)
+    
+    
+    
+    def test_colors(self):
+        # the colors of all nodes are packed into one bit each
+        tree = ArrayRedBlackTree("q")
+        for k in range(100):
+            tree.insert(k)
+        tree.validate()
+        reds = sum(bin(byte).count("1") for byte in tree._colors)
+        self.assertEqual(reds, sum(1 for i in range(100) if tree._is_red(i)))
+        self.assertGreater(reds, 0)
+        for k in range(100):
+            tree.remove(k)
+            tree.validate()
+        self.assertEqual(tree.inorder(), [])
+        self.assertEqual(tree.root, -1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""  
+Tests for AsyncRedBlackTree: chunked iterations against the synchronous ones, and changes of
+the tree during an iteration.  
+"""
+
+import asyncio
+import random
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+from async_red_black_tree import AsyncRedBlackTree
+from interval_red_black_tree import IntervalRedBlackTree
+from red_black_tree import RedBlackTree
+from tests.helpers import RandomizedTestCase
+
+
+class TestAsyncRedBlackTree(RandomizedTestCase):
+    
+    def run_async(self, coroutine):
+        # (a deadlock fails the test instead of hanging it)
+        return asyncio.run(asyncio.wait_for(coroutine, 10))
+    
+    
+    
+    def test_iterations(self):
+        rnd = random.Random(21)
+        
+        async def check(tree:RedBlackTree) -> None:
+            facade = AsyncRedBlackTree(tree, chunk_size=3)
+            self.assertEqual(await facade.inorder(), list(tree))
+            self.assertEqual([k async for k in facade.reversed()], list(reversed(tree)))
+            for _ in range(20):
+                lo = rnd.randrange(-5, 60)
+                hi = rnd.randrange(-5, 60)
+                inclusive = (rnd.random() < 0.5, rnd.random() < 0.5)
+                reverse = rnd.random() < 0.5
+                self.assertEqual([k async for k in facade.irange(lo, hi, inclusive, reverse)],
+                                 list(tree.irange(lo, hi, inclusive, reverse)))
+        
+        # (many equal keys, so that the chunks end within runs of equal keys)
+        keys = [rnd.randrange(50) for _ in range(200)]
+        for options in ({}, {"multiset": True}, {"key": lambda item: item[0]}):
+            items = [(k, i) for i, k in enumerate(keys)] if "key" in options else keys
+            self.run_async(check(RedBlackTree.from_iterable(items, **options)))
+            tree = RedBlackTree(**options)
+            for item in items:
+                tree.add(item)
+            self.run_async(check(tree))
+        self.run_async(check(RedBlackTree()))
+        self.run_async(check(IntervalRedBlackTree.from_iterable((k, k + rnd.randrange(10)) for k in keys)))
+    
+    
+    
+    def test_from_iterable(self):
+        rnd = random.Random(121)
+        keys = [rnd.randrange(50) for _ in range(300)]
+        calls = []
+        
+        # a local key function can not be pickled, so it must not be sent to the process
+        def key(item:tuple) -> int:
+            calls.append(item)
+            return -item[0]
+        
+        items = [(k, i) for i, k in enumerate(keys)]
+        with ProcessPoolExecutor(1) as executor:
+            for values, options in ((keys, {}), (keys, {"multiset": True}), ([str(k) for k in keys], {"typed": float}),
+                                    (items, {"key": key}), (items, {"key": lambda item: item[0], "order_statistics": True})):
+                expected = RedBlackTree.from_iterable(values, **options)
+                for pool in (None, executor):
+                    del calls[:]
+                    facade = self.run_async(AsyncRedBlackTree.from_iterable(values, executor=pool, **options))
+                    facade.tree.validate()
+                    self.assertEqual(list(facade.tree), list(expected))
+                    self.assertEqual(len(facade.tree), len(values))
+                    if options.get("key") is key:
+                        self.assertEqual(len(calls), len(items))
+    
+    
+    
+    def test_delete_during_own_iteration(self):
+        async def work() -> list:
+            facade = AsyncRedBlackTree(chunk_size=4)
+            await facade.insert_many(range(20))
+            seen = []
+            async for k in facade:
+                seen.append(k)
+                # the iterating task deletes keys ahead of and behind its position
+                if k % 5 == 0:
+                    await facade.delete(k)
+                    if k + 6 in facade:
+                        await facade.delete(k + 6)
+                    await facade.pop_min()
+            facade.tree.validate()
+            return seen, list(facade.tree)
+        
+        seen, remaining = self.run_async(work())
+        # every key is yielded at most once, and the deleted keys behind the current chunk are skipped
+        self.assertEqual(seen, sorted(set(seen)))
+        self.assertNotIn(11, seen)
+        self.assertEqual(remaining, sorted(remaining))
+    
+    
+    
+    def test_random_operations(self):
+        facade = AsyncRedBlackTree(chunk_size=8, order_statistics=True)
+        keys = []
+        
+        async def insert(rnd:random.Random) -> None:
+            k = rnd.randrange(300)
+            await facade.insert(k)
+            keys.append(k)
+        
+        async def insert_many(rnd:random.Random) -> None:
+            batch = [rnd.randrange(300) for _ in range(rnd.randrange(30))]
+            await facade.insert_many(batch)
+            keys.extend(batch)
+        
+        async def delete(rnd:random.Random) -> None:
+            if keys:
+                k = rnd.choice(keys)
+                await facade.delete(k)
+                keys.remove(k)
+        
+        async def pop_min(rnd:random.Random) -> None:
+            if keys:
+                self.assertEqual(await facade.pop_min(), min(keys))
+                keys.remove(min(keys))
+        
+        async def check() -> None:
+            # (the reader gets its turn between the operations)
+            await asyncio.sleep(0)
+            self.check_sorted(facade.tree, keys)
+            self.assertEqual(await facade.inorder(), sorted(keys))
+        
+        async def reader() -> None:
+            for _ in range(20):
+                previous = None
+                async for k in facade:
+                    self.assertTrue((previous is None) or (previous <= k))
+                    previous = k
+        
+        async def work() -> None:
+            await asyncio.gather(reader(), self.run_async_operations(
+                210, [(50, insert), (5, insert_many), (25, delete), (10, pop_min)], check, steps=2000))
+        
+        self.run_async(work())
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+""" 
+Tests for BoundedRedBlackTree. 
+"""
+
+import math
+import random
+import unittest
+
+from bounded_red_black_tree import BoundedRedBlackTree
+from tests.helpers import RandomizedTestCase
+
+
+class TestBoundedRedBlackTree(RandomizedTestCase):
+    
+    def check(self, tree:BoundedRedBlackTree, model:list) -> None:
+        self.check_sorted(tree, [k for k, _ in model])
+        self.assertEqual(list(tree.by_age()), [k for k, _ in model])
+        if model:
+            self.assertEqual(tree.oldest().key, model[0][0])
+            self.assertEqual(tree.newest().key, model[-1][0])
+    
+    
+    
+    def test_random_operations(self):
+        for capacity, window in ((1, None), (7, None), (50, None), (None, 5.0), (20, 5.0)):
+            now = [0.0]
+            tree = BoundedRedBlackTree(capacity, window, clock=lambda: now[0], order_statistics=True)
+            # the keys with their times in the order of their insertion (the keys are distinct, so a
+            # deletion removes a known node)
+            model = []
+            
+            def new_key(rnd:random.Random) -> int:
+                keys = {k for k, _ in model}
+                while True:
+                    k = rnd.randrange(100000)
+                    if k not in keys:
+                        return k
+            
+            # every operation is followed by the evictions of the model
+            def evict() -> None:
+                if window is not None:
+                    # (without an insertion the keys are only evicted by expire)
+                    tree.expire()
+                    model[:] = [(k, t) for k, t in model if t > now[0] - window]
+                if capacity is not None:
+                    del model[:-capacity]
+            
+            def add(rnd:random.Random) -> None:
+                now[0] += rnd.random()
+                k = new_key(rnd)
+                tree.add(k)
+                model.append((k, now[0]))
+                evict()
+            
+            def insert_many(rnd:random.Random) -> None:
+                now[0] += rnd.random()
+                batch = list({new_key(rnd) for _ in range(rnd.randrange(12))})
+                tree.insert_many(batch)
+                model.extend((k, now[0]) for k in batch)
+                evict()
+            
+            def delete(rnd:random.Random) -> None:
+                now[0] += rnd.random()
+                if model:
+                    item = rnd.choice(model)
+                    tree.delete(item[0])
+                    model.remove(item)
+                evict()
+            
+            def pop(rnd:random.Random) -> None:
+                now[0] += rnd.random()
+                if model:
+                    item = min(model) if rnd.random() < 0.5 else max(model)
+                    self.assertEqual((tree.pop_min() if item == min(model) else tree.pop_max()).key, item[0])
+                    model.remove(item)
+                evict()
+            
+            def quantile(rnd:random.Random) -> None:
+                if model:
+                    ordered = sorted(k for k, _ in model)
+                    q = rnd.random()
+                    self.assertEqual(tree.quantile(q).key, ordered[max(math.ceil(q * len(ordered)) - 1, 0)])
+            
+            self.run_operations(22, [(60, add), (10, insert_many), (10, delete), (10, pop), (10, quantile)],
+                                lambda: self.check(tree, model), steps=3000)
+    
+    
+    
+    def test_rejected_operations(self):
+        with self.assertRaises(ValueError):
+            BoundedRedBlackTree()
+        with self.assertRaises(ValueError):
+            BoundedRedBlackTree(capacity=3, multiset=True)
+        tree = BoundedRedBlackTree(window=10.0, clock=lambda: 0.0)
+        tree.add(1, timestamp=5.0)
+        with self.assertRaises(ValueError):
+            tree.add(2, timestamp=4.0)
+        self.check(tree, [(1, 5.0)])
+        with self.assertRaises(ValueError):
+            tree.split(1)
+        with self.assertRaises(ValueError):
+            BoundedRedBlackTree.join(tree, 7, BoundedRedBlackTree(window=10.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
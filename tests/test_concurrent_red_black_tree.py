@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""  
+Tests for ConcurrentRedBlackTree, with and without a batch size.  
+"""
+
+import random
+import threading
+import unittest
+
+from concurrent_red_black_tree import ConcurrentRedBlackTree
+from tests.helpers import RandomizedTestCase
+
+
+class TestConcurrentRedBlackTree(RandomizedTestCase):
+    
+    def check(self, tree:ConcurrentRedBlackTree, keys:list) -> None:
+        tree.flush()
+        self.check_sorted(tree.tree, keys)
+        self.assertEqual(tree.snapshot(), sorted(keys))
+    
+    
+    
+    def test_random_operations(self):
+        for batch_size in (None, 1, 7):
+            tree = ConcurrentRedBlackTree(batch_size=batch_size, order_statistics=True)
+            keys = []
+            
+            def insert(rnd:random.Random) -> None:
+                k = rnd.randrange(200)
+                tree.insert(k)
+                keys.append(k)
+            
+            def insert_many(rnd:random.Random) -> None:
+                batch = [rnd.randrange(200) for _ in range(rnd.randrange(20))]
+                tree.insert_many(batch)
+                keys.extend(batch)
+            
+            def delete(rnd:random.Random) -> None:
+                if keys:
+                    k = rnd.choice(keys)
+                    tree.delete(k)
+                    keys.remove(k)
+            
+            def pop(rnd:random.Random) -> None:
+                if keys:
+                    k = min(keys) if rnd.random() < 0.5 else max(keys)
+                    self.assertEqual(tree.pop_min() if k == min(keys) else tree.pop_max(), k)
+                    keys.remove(k)
+            
+            self.run_operations(13, [(50, insert), (10, insert_many), (20, delete), (10, pop)],
+                                lambda: self.check(tree, keys))
+    
+    
+    
+    def test_threads(self):
+        tree = ConcurrentRedBlackTree(batch_size=16)
+        
+        def work(seed:int) -> None:
+            rnd = random.Random(seed)
+            for _ in range(500):
+                tree.insert(rnd.randrange(10000))
+                list(tree.irange(0, 100))
+        
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        expected = []
+        for i in range(4):
+            rnd = random.Random(i)
+            expected += [rnd.randrange(10000) for _ in range(500)]
+        self.check(tree, expected)
+    
+    
+    
+    def test_bad_batched_key(self):
+        # an impossible key fails in its own call of insert, and the queued keys are kept
+        tree = ConcurrentRedBlackTree(batch_size=10)
+        tree.insert(1)
+        tree.insert(2)
+        with self.assertRaises(TypeError):
+            tree.insert("x")
+        with self.assertRaises(ValueError):
+            tree.insert(None)
+        tree.delete(1)
+        self.check(tree, [2])
+        
+        # the same against the keys of the tree when the queue is empty
+        with self.assertRaises(TypeError):
+            tree.insert("x")
+        self.check(tree, [2])
+        
+        # and an impossible batch of the caller does not lose the queued keys
+        tree.insert(3)
+        with self.assertRaises(TypeError):
+            tree.insert_many([4, "y"])
+        self.assertIn(3, tree)
+        tree.tree.validate()
+
+
+
+if __name__ == '__main__':
+    unittest.main()
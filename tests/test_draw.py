@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+""" 
+Tests for the exporters of RedBlackTree (draw_tex, draw_dot, draw_json) and their chunked writer. 
+"""
+
+import io
+import json
+import random
+import re
+import unittest
+
+from red_black_tree import RedBlackTree, _ChunkedWriter, red
+
+
+# an output which records its write calls
+class _Recorder:
+    
+    def __init__(self):
+        self.writes = []
+    
+    
+    
+    def write(self, text:str) -> None:
+        self.writes.append(text)
+        return None
+
+
+def _levels(tree:RedBlackTree) -> list:
+    # the nodes of the tree level by level
+    levels = []
+    level = [] if tree.root is None else [tree.root]
+    while level:
+        levels.append(level)
+        level = [c for x in level for c in (x.left, x.right) if c is not None]
+    return levels
+
+
+class TestDraw(unittest.TestCase):
+    
+    def random_tree(self, seed:int, n:int, order_statistics:bool = False) -> RedBlackTree:
+        rnd = random.Random(seed)
+        tree = RedBlackTree(order_statistics=order_statistics)
+        for k in rnd.sample(range(10 * n), n):
+            tree.add(k)
+        return tree
+    
+    
+    
+    def check_json(self, x, data, depth:int, max_depth) -> None:
+        # compare the JSON object with the subtree of x (iteratively, node by node)
+        stack = [(x, data, depth)]
+        while stack:
+            x, data, depth = stack.pop()
+            if x is None:
+                self.assertIsNone(data)
+                continue
+            if (max_depth is not None) and (depth >= max_depth):
+                keys = []
+                walk = [x]
+                while walk:
+                    y = walk.pop()
+                    keys.append(y.key)
+                    walk.extend(c for c in (y.left, y.right) if c is not None)
+                self.assertEqual(data, {"collapsed": len(keys), "min": min(keys), "max": max(keys)})
+                continue
+            self.assertEqual(set(data), {"key", "color", "left", "right"})
+            self.assertEqual(data["key"], x.key)
+            self.assertEqual(data["color"], "red" if x.color is red else "black")
+            stack.append((x.left, data["left"], depth + 1))
+            stack.append((x.right, data["right"], depth + 1))
+    
+    
+    
+    def test_json(self):
+        for order_statistics in (False, True):
+            tree = self.random_tree(16, 500, order_statistics)
+            height = len(_levels(tree))
+            for max_depth in (None, 0, 1, 4, height - 1, height, height + 5):
+                out = io.StringIO()
+                tree.draw_json(out, max_depth=max_depth)
+                self.check_json(tree.root, json.loads(out.getvalue()), 0, max_depth)
+        
+        out = io.StringIO()
+        RedBlackTree().draw_json(out)
+        self.assertEqual(out.getvalue(), "null\n")
+        # keys which are no JSON values are written as strings
+        out = io.StringIO()
+        RedBlackTree.from_iterable([(1, 2)]).draw_json(out)
+        self.assertEqual(json.loads(out.getvalue())["key"], [1, 2])
+    
+    
+    
+    def test_max_nodes(self):
+        tree = self.random_tree(160, 500)
+        levels = _levels(tree)
+        for max_nodes in (0, 1, 2, 3, 10, 100, 499, 500, 1000):
+            # as many full levels as fit into max_nodes
+            depth = 0
+            count = 0
+            while (depth < len(levels)) and (count + len(levels[depth]) <= max_nodes):
+                count += len(levels[depth])
+                depth += 1
+            out = io.StringIO()
+            tree.draw_json(out, max_nodes=max_nodes)
+            self.check_json(tree.root, json.loads(out.getvalue()), 0, depth)
+    
+    
+    
+    def test_dot(self):
+        node_line = re.compile(r'  (n\d+) \[label="(\d+)", fillcolor=(red|black)\];')
+        box_line = re.compile(r'  (n\d+) \[shape=box, label="(\d+) nodes\\n(\d+) \.\. (\d+)", fillcolor=lightgrey, fontcolor=black\];')
+        edge_line = re.compile(r"  (n\d+) -> (n\d+);")
+        tree = self.random_tree(1600, 300)
+        for max_depth in (None, 3):
+            out = io.StringIO()
+            tree.draw_dot(out, max_depth=max_depth)
+            lines = out.getvalue().split("\n")
+            self.assertEqual(lines[:2], ["digraph RedBlackTree {", "  node [style=filled, fontcolor=white];"])
+            self.assertEqual(lines[-2:], ["}", ""])
+            
+            # one line per node (or summarized subtree) and one edge per pair of parent and child
+            names = {}
+            boxes = {}
+            edges = set()
+            for line in lines[2:-2]:
+                m = node_line.fullmatch(line)
+                if m:
+                    names[m.group(1)] = (int(m.group(2)), m.group(3))
+                    continue
+                m = box_line.fullmatch(line)
+                if m:
+                    boxes[m.group(1)] = tuple(int(g) for g in m.group(2, 3, 4))
+                    continue
+                m = edge_line.fullmatch(line)
+                self.assertIsNotNone(m, line)
+                edges.add(m.group(1, 2))
+            
+            levels = _levels(tree)
+            drawn = [x for level in levels[:max_depth] for x in level]
+            self.assertEqual(sorted(names.values()), sorted((x.key, "red" if x.color is red else "black") for x in drawn))
+            self.assertEqual(len(edges), len(names) + len(boxes) - 1)
+            key = {name: k for name, (k, color) in names.items()}
+            self.assertEqual({(key[a], key[b]) for a, b in edges if b in key},
+                             {(x.parent.key, x.key) for x in drawn if x.parent is not None})
+            if max_depth is None:
+                self.assertEqual(len(names), len(tree))
+                self.assertEqual(boxes, {})
+            else:
+                below = levels[max_depth]
+                self.assertEqual(len(boxes), len(below))
+                self.assertEqual(sum(count for count, lo, hi in boxes.values()), len(tree) - len(drawn))
+                self.assertEqual({(key[a], boxes[b][1:]) for a, b in edges if b in boxes},
+                                 {(x.parent.key, tree._summary(x)[1:]) for x in below})
+        
+        # quotes and backslashes in the keys are escaped
+        out = io.StringIO()
+        RedBlackTree.from_iterable(['a"b']).draw_dot(out)
+        self.assertIn(r'label="a\"b"', out.getvalue())
+    
+    
+    
+    def test_deep_tree(self):
+        # a tree whose height is far beyond the recursion limit (a chain, linked by hand, which is no valid 
+        # red black tree, but the exporters do not care) 
+        tree = RedBlackTree()
+        tree.add(0)
+        x = tree.root
+        for k in range(1, 5000):
+            y = tree._make_node(k)
+            y.parent = x
+            x.right = y
+            x = y
+        for draw in (tree.draw_tex, tree.draw_dot, tree.draw_json):
+            out = io.StringIO()
+            draw(out)
+            self.assertGreater(len(out.getvalue()), 5000)
+        out = io.StringIO()
+        tree.draw_json(out, max_depth=10)
+        self.assertIn('{"collapsed": 4990, "min": 10, "max": 4999}', out.getvalue())
+    
+    
+    
+    def test_chunked_writer(self):
+        output = _Recorder()
+        out = _ChunkedWriter(output, chunk_size=10)
+        pieces = ["abc", "defg", "hij", "k", "lmnopqrstuvw", "xyz"]
+        for piece in pieces[:2]:
+            out.write(piece)
+        # nothing is written before a chunk is full
+        self.assertEqual(output.writes, [])
+        for piece in pieces[2:]:
+            out.write(piece)
+        self.assertEqual(output.writes, ["abcdefghij", "klmnopqrstuvw"])
+        out.flush()
+        out.flush()
+        self.assertEqual(output.writes, ["abcdefghij", "klmnopqrstuvw", "xyz"])
+        
+        # the exporters write a large tree in a few chunks
+        tree = self.random_tree(16000, 20000)
+        for draw in (tree.draw_tex, tree.draw_dot, tree.draw_json):
+            output = _Recorder()
+            draw(output)
+            text = "".join(output.writes)
+            self.assertLessEqual(len(output.writes), len(text) // (1 << 16) + 1)
+            self.assertTrue(all(len(w) >= 1 << 16 for w in output.writes[:-1]))
+
+
+if __name__ == '__main__':
+    unittest.main()
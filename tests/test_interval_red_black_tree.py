@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+""" 
+Tests for IntervalRedBlackTree. 
+"""
+
+import random
+import unittest
+
+from interval_red_black_tree import IntervalRedBlackTree
+from tests.helpers import RandomizedTestCase
+
+
+class TestIntervalRedBlackTree(RandomizedTestCase):
+    
+    def check(self, tree:IntervalRedBlackTree, intervals:list, rnd:random.Random) -> None:
+        # (the order of the intervals with equal lower ends is not defined)
+        tree.validate()
+        result = list(tree)
+        self.assertEqual(sorted(result), sorted(intervals))
+        self.assertEqual([low for low, _ in result], sorted(low for low, _ in intervals))
+        self.assertEqual(len(tree), len(intervals))
+        for _ in range(10):
+            lo = rnd.randrange(-10, 1010)
+            hi = lo + rnd.choice((0, 1, 5, 50))
+            result = list(tree.overlapping(lo, hi))
+            expected = [(low, high) for low, high in intervals if (low <= hi) and (lo <= high)]
+            self.assertEqual(sorted(result), sorted(expected))
+            self.assertEqual([low for low, _ in result], sorted(low for low, _ in expected))
+            self.assertEqual(tree.overlaps(lo, hi), bool(expected))
+    
+    
+    
+    def random_interval(self, rnd):
+        low = rnd.randrange(1000)
+        return (low, low + rnd.choice((0, rnd.randrange(10), rnd.randrange(200))))
+    
+    
+    
+    def test_random_operations(self):
+        for order_statistics in (False, True):
+            rnd = random.Random(23)
+            intervals = [self.random_interval(rnd) for _ in range(100)]
+            tree = IntervalRedBlackTree.from_iterable(intervals, order_statistics=order_statistics)
+            
+            def add(rnd:random.Random) -> None:
+                interval = self.random_interval(rnd)
+                tree.add(interval)
+                intervals.append(interval)
+            
+            def insert_many(rnd:random.Random) -> None:
+                batch = [self.random_interval(rnd) for _ in range(rnd.randrange(20))]
+                tree.insert_many(batch)
+                intervals.extend(batch)
+            
+            def delete(rnd:random.Random) -> None:
+                if intervals:
+                    interval = rnd.choice(intervals)
+                    tree.delete(interval)
+                    intervals.remove(interval)
+            
+            def pop_min(rnd:random.Random) -> None:
+                if intervals:
+                    n = tree.pop_min()
+                    self.assertEqual(n.key, min(intervals)[0])
+                    intervals.remove((n.key, n.high))
+            
+            def contains(rnd:random.Random) -> None:
+                interval = self.random_interval(rnd)
+                self.assertEqual(interval in tree, interval in intervals)
+            
+            self.run_operations(23, [(40, add), (10, insert_many), (35, delete), (5, pop_min), (10, contains)],
+                                lambda: self.check(tree, intervals, rnd), steps=1500, check_every=100)
+    
+    
+    
+    def test_split_and_join(self):
+        rnd = random.Random(32)
+        intervals = [self.random_interval(rnd) for _ in range(300)]
+        tree = IntervalRedBlackTree.from_iterable(intervals)
+        for _ in range(20):
+            key = rnd.randrange(1000)
+            left, right = tree.split(key)
+            self.check(left, [i for i in intervals if i[0] < key], rnd)
+            self.check(right, [i for i in intervals if not (i[0] < key)], rnd)
+            if right.root is None:
+                tree = left
+                continue
+            n = right.pop_min()
+            tree = IntervalRedBlackTree.join(left, (n.key, n.high), right)
+            self.check(tree, intervals, rnd)
+        with self.assertRaises(ValueError):
+            tree.add((5, 4))
+        with self.assertRaises(ValueError):
+            tree.union(IntervalRedBlackTree())
+
+
+if __name__ == '__main__':
+    unittest.main()
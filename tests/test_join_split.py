@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+""" 
+Tests for join, split and the set operations of RedBlackTree (against sorted lists and sets). 
+"""
+
+import random
+import unittest
+
+from red_black_tree import RedBlackTree
+from tests.helpers import RandomizedTestCase
+
+
+class TestJoinSplit(RandomizedTestCase):
+    
+    def random_tree(self, rnd:random.Random, keys:list, order_statistics:bool) -> RedBlackTree:
+        # inserted one by one in random order (not linked by from_sorted), so the shapes vary
+        tree = RedBlackTree(order_statistics=order_statistics)
+        for k in rnd.sample(keys, len(keys)):
+            tree.add(k)
+        return tree
+    
+    
+    
+    def check_lazy(self, tree:RedBlackTree, keys:list) -> None:
+        # the length of a joined or split tree is counted on demand, also after further changes
+        tree.add(-1)
+        tree.delete(-1)
+        self.check_sorted(tree, keys)
+        tree.add(10**9)
+        self.assertEqual(len(tree), len(keys) + 1)
+        tree.delete(10**9)
+        self.check_sorted(tree, keys)
+    
+    
+    
+    def test_join(self):
+        rnd = random.Random(11)
+        # (very different sizes, so very different black heights of the two trees)
+        sizes = (0, 1, 2, 7, 100, 3000)
+        for order_statistics in (False, True):
+            for n1 in sizes:
+                for n2 in sizes:
+                    left = list(range(n1))
+                    right = list(range(n1 + 1, n1 + 1 + n2))
+                    t1 = self.random_tree(rnd, left, order_statistics)
+                    t2 = self.random_tree(rnd, right, order_statistics)
+                    tree = RedBlackTree.join(t1, n1, t2)
+                    self.assertEqual((t1.root, t2.root), (None, None))
+                    self.check_sorted(tree, left + [n1] + right)
+                    self.check_lazy(tree, left + [n1] + right)
+        
+        with self.assertRaises(ValueError):
+            RedBlackTree.join(RedBlackTree.from_iterable([1, 5]), 3, RedBlackTree.from_iterable([4]))
+        with self.assertRaises(ValueError):
+            RedBlackTree.join(RedBlackTree(), 3, RedBlackTree(order_statistics=True))
+    
+    
+    
+    def test_split(self):
+        rnd = random.Random(111)
+        for order_statistics in (False, True):
+            keys = [rnd.randrange(0, 2000, 2) for _ in range(500)]
+            ordered = sorted(keys)
+            # missing keys, the minimum, the maximum, keys beyond both ends and repeated keys
+            for key in (ordered[0], ordered[-1], ordered[0] - 1, ordered[-1] + 1, 1, 999, ordered[250], ordered[251] + 1):
+                smaller, bigger = self.random_tree(rnd, keys, order_statistics).split(key)
+                self.check_sorted(smaller, [k for k in keys if k < key])
+                self.check_sorted(bigger, [k for k in keys if not (k < key)])
+                
+                # the length is counted lazily, so it must be right after further changes as well
+                smaller, bigger = self.random_tree(rnd, keys, order_statistics).split(key)
+                self.check_lazy(smaller, [k for k in keys if k < key])
+                self.check_lazy(bigger, [k for k in keys if not (k < key)])
+                
+                # and the parts can be joined again
+                if bigger.root is not None:
+                    k = bigger.pop_min().key
+                    self.check_sorted(RedBlackTree.join(smaller, k, bigger), keys)
+    
+    
+    
+    def test_random_split_and_join(self):
+        for order_statistics in (False, True):
+            parts = [RedBlackTree.from_iterable(range(100), order_statistics=order_statistics)]
+            
+            def split(rnd:random.Random) -> None:
+                i = rnd.randrange(len(parts))
+                keys = list(parts[i])
+                if keys:
+                    parts[i:i + 1] = parts[i].split(rnd.randrange(keys[0], keys[-1] + 2))
+            
+            def join(rnd:random.Random) -> None:
+                # two neighbouring parts are joined by the smallest key of the right one
+                i = rnd.randrange(len(parts))
+                if (i + 1 < len(parts)) and (parts[i + 1].root is not None):
+                    k = parts[i + 1].pop_min().key
+                    parts[i:i + 2] = [RedBlackTree.join(parts[i], k, parts[i + 1])]
+            
+            def check() -> None:
+                for part in parts:
+                    part.validate()
+                self.assertEqual([k for part in parts for k in part], list(range(100)))
+                self.assertEqual(sum(len(part) for part in parts), 100)
+            
+            self.run_operations(1111, [(50, split), (50, join)], check, steps=500, check_every=10)
+    
+    
+    
+    def test_set_operations(self):
+        rnd = random.Random(1100)
+        operations = ((RedBlackTree.union, set.union), (RedBlackTree.intersection, set.intersection),
+                      (RedBlackTree.difference, set.difference))
+        for order_statistics in (False, True):
+            for n1, n2 in ((0, 0), (0, 50), (50, 0), (1, 1000), (1000, 1), (300, 300), (2000, 100)):
+                a = set(rnd.sample(range(3000), n1))
+                b = set(rnd.sample(range(3000), n2))
+                for operation, expected in operations:
+                    t1 = self.random_tree(rnd, list(a), order_statistics)
+                    t2 = self.random_tree(rnd, list(b), order_statistics)
+                    tree = operation(t1, t2)
+                    self.assertEqual((t1.root, t2.root), (None, None))
+                    self.assertEqual((len(t1), len(t2)), (0, 0))
+                    self.check_sorted(tree, list(expected(a, b)))
+                    self.check_lazy(tree, list(expected(a, b)))
+
+
+if __name__ == '__main__':
+    unittest.main()
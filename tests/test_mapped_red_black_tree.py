@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""  
+Tests for dump, load and MappedRedBlackTree.  
+"""
+
+import os
+import random
+import tempfile
+import unittest
+
+from mapped_red_black_tree import MappedRedBlackTree
+from red_black_tree import RedBlackTree
+from red_black_tree_map import RedBlackTreeMap
+from tests.helpers import RandomizedTestCase
+
+
+class TestMappedRedBlackTree(RandomizedTestCase):
+    
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name, "tree.rbt")
+    
+    
+    
+    def tearDown(self):
+        self.folder.cleanup()
+    
+    
+    
+    def test_round_trip(self):
+        rnd = random.Random(15)
+        for n in (0, 1, 2, 100, 1000):
+            for keys in (rnd.sample(range(10 * n + 1), n), [rnd.random() for _ in range(n)]):
+                tree = RedBlackTree()
+                for k in keys:
+                    tree.add(k)
+                tree.dump(self.path)
+                loaded = RedBlackTree.load(self.path, order_statistics=True)
+                self.check_sorted(loaded, keys)
+                with MappedRedBlackTree(self.path) as mapped:
+                    self.assertEqual(list(mapped), sorted(keys))
+                    for _ in range(20):
+                        lo, hi = sorted(rnd.sample(keys, 2)) if n > 1 else (0, 1)
+                        self.assertEqual(list(mapped.irange(lo, hi)), list(loaded.irange(lo, hi)))
+                        self.assertEqual(mapped.rank(lo), loaded.rank(lo))
+    
+    
+    
+    def test_rejected_trees(self):
+        with self.assertRaises(ValueError):
+            RedBlackTreeMap({1: "a", 2: "b"}).dump(self.path)
+        with self.assertRaises(ValueError):
+            RedBlackTree.from_iterable([0.5, 2**60 + 1]).dump(self.path)
+        with self.assertRaises(ValueError):
+            RedBlackTree.from_iterable(["a"]).dump(self.path)
+        
+        # the int keys which are exactly doubles can be stored together with float keys
+        RedBlackTree.from_iterable([0.5, 2**60, 3]).dump(self.path)
+        self.assertEqual(list(RedBlackTree.load(self.path)), [0.5, 3, 2**60])
+        for options in ({"key": abs}, {"multiset": True}, {"typed": int}):
+            with self.assertRaises(ValueError):
+                RedBlackTree.load(self.path, **options)
+        with self.assertRaises(ValueError):
+            RedBlackTreeMap.load(self.path)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
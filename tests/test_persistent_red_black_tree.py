@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+""" 
+Tests for PersistentRedBlackTree: every version stays unchanged and valid after the updates. 
+"""
+
+import random
+import unittest
+
+from persistent_red_black_tree import PersistentRedBlackTree
+from tests.helpers import RandomizedTestCase
+
+
+def _height(x) -> int:
+    return 0 if x is None else 1 + max(_height(x.left), _height(x.right))
+
+
+class TestPersistentRedBlackTree(RandomizedTestCase):
+    
+    def test_random_operations(self):
+        tree = PersistentRedBlackTree()
+        # all versions with the keys they had when they were created
+        versions = [(tree, [])]
+        
+        def update(new:PersistentRedBlackTree, keys:list) -> None:
+            old = versions[-1][0]
+            # only the nodes on the path to the changed place are copied (and a few of their neighbours)
+            shared = {id(x) for x in old._walk()}
+            copied = sum(1 for x in new._walk() if id(x) not in shared)
+            self.assertLessEqual(copied, 2 * (_height(old.root) + 1))
+            versions.append((new, keys))
+        
+        def insert(rnd:random.Random) -> None:
+            tree, keys = versions[-1]
+            k = rnd.randrange(200)
+            update(tree.insert(k), keys + [k])
+        
+        def delete(rnd:random.Random) -> None:
+            tree, keys = versions[-1]
+            if keys:
+                k = rnd.choice(keys)
+                rest = list(keys)
+                rest.remove(k)
+                update(tree.delete(k), rest)
+            with self.assertRaises(KeyError):
+                tree.delete(200)
+        
+        def delete_old(rnd:random.Random) -> None:
+            # an update of an old version does not change the versions after it
+            tree, keys = rnd.choice(versions)
+            if keys:
+                k = rnd.choice(keys)
+                rest = list(keys)
+                rest.remove(k)
+                self.check_sorted(tree.delete(k), rest)
+        
+        def check() -> None:
+            for tree, keys in versions:
+                self.check_sorted(tree, keys)
+                self.assertEqual(list(reversed(tree)), sorted(keys, reverse=True))
+        
+        self.run_operations(12, [(50, insert), (40, delete), (10, delete_old)], check, steps=600, check_every=100)
+    
+    
+    
+    def test_from_sorted(self):
+        rnd = random.Random(120)
+        for n in list(range(40)) + [1000, 1023, 1024]:
+            keys = sorted(rnd.randrange(n + 1) for _ in range(n))
+            tree = PersistentRedBlackTree.from_sorted(keys)
+            self.check_sorted(tree, keys)
+            self.check_sorted(PersistentRedBlackTree.from_iterable(reversed(keys)), keys)
+            # the deletions (of fused nodes as well) keep the invariants down to the empty tree
+            if n < 40:
+                for k in rnd.sample(keys, n):
+                    tree = tree.delete(k)
+                    tree.validate()
+                self.assertEqual(len(tree), 0)
+        with self.assertRaises(ValueError):
+            PersistentRedBlackTree.from_sorted([2, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+"""  
+Tests for RedBlackTree with its options (order statistics, key functions, the typed mode and
+multisets) against a sorted list.  
+"""
+
+import random
+import unittest
+
+from red_black_tree import Monoid, RedBlackTree
+from tests.helpers import RandomizedTestCase
+
+
+class TestRedBlackTree(RandomizedTestCase):
+    
+    def check(self, tree:RedBlackTree, keys:list) -> None:
+        self.check_sorted(tree, keys, tree.key)
+    
+    
+    
+    def test_random_operations(self):
+        for options in ({}, {"order_statistics": True}, {"typed": int}, {"multiset": True, "order_statistics": True}):
+            tree = RedBlackTree(**options)
+            keys = []
+            
+            def add(rnd:random.Random) -> None:
+                k = rnd.randrange(300)
+                tree.add(k)
+                keys.append(k)
+            
+            def insert_many(rnd:random.Random) -> None:
+                batch = [rnd.randrange(300) for _ in range(rnd.randrange(40))]
+                tree.insert_many(batch)
+                keys.extend(batch)
+            
+            def delete(rnd:random.Random) -> None:
+                if keys:
+                    k = rnd.choice(keys)
+                    tree.delete(k)
+                    keys.remove(k)
+            
+            def pop_min(rnd:random.Random) -> None:
+                if keys:
+                    self.assertEqual(tree.pop_min().key, min(keys))
+                    keys.remove(min(keys))
+            
+            def pop_max(rnd:random.Random) -> None:
+                if keys:
+                    self.assertEqual(tree.pop_max().key, max(keys))
+                    keys.remove(max(keys))
+            
+            def query(rnd:random.Random) -> None:
+                lo = rnd.randrange(300)
+                hi = rnd.randrange(300)
+                self.assertEqual(list(tree.irange(lo, hi)), [k for k in sorted(keys) if lo <= k <= hi])
+                if tree.order_statistics:
+                    self.assertEqual(tree.rank(lo), sum(1 for k in keys if k < lo))
+                    self.assertEqual(tree.count_range(lo, hi), sum(1 for k in keys if lo <= k <= hi))
+                    if keys:
+                        i = rnd.randrange(len(keys))
+                        self.assertEqual(tree.select(i).key, sorted(keys)[i])
+            
+            self.run_operations(19, [(40, add), (10, insert_many), (25, delete), (5, pop_min), (5, pop_max), (15, query)],
+                                lambda: self.check(tree, keys), steps=2000)
+    
+    
+    
+    def test_from_iterable(self):
+        rnd = random.Random(190)
+        keys = [rnd.randrange(100) for _ in range(500)]
+        for options in ({}, {"order_statistics": True}, {"multiset": True}, {"typed": float}):
+            self.check(RedBlackTree.from_iterable(keys, **options), keys)
+            self.check(RedBlackTree.from_sorted(sorted(keys), **options), keys)
+        
+        # the typed mode sorts the converted keys
+        tree = RedBlackTree.from_iterable(["10", "9", "9.5"], typed=float)
+        self.check(tree, [10.0, 9.0, 9.5])
+        
+        # a key function is called once per item, and equal keys keep the order of their items
+        calls = []
+        
+        def key(item:tuple) -> int:
+            calls.append(item)
+            return item[0]
+        
+        items = [(k, i) for i, k in enumerate(keys)]
+        tree = RedBlackTree.from_iterable(items, key=key)
+        self.assertEqual(len(calls), len(items))
+        self.assertEqual(list(tree), sorted(items, key=lambda item: item[0]))
+        tree.validate()
+    
+    
+    
+    def test_incomparable_key(self):
+        # a key which can not be compared with the keys of the tree leaves the tree (and its length) unchanged
+        for options in ({}, {"order_statistics": True}, {"multiset": True}):
+            tree = RedBlackTree(**options)
+            tree.add(1)
+            tree.add(2)
+            with self.assertRaises(TypeError):
+                tree.add("x")
+            self.check(tree, [1, 2])
+            with self.assertRaises(TypeError):
+                tree.insert_many(["x"])
+            self.check(tree, [1, 2])
+            
+            # a large batch (which is merged with the tree) fails before the tree is changed
+            with self.assertRaises(TypeError):
+                tree.insert_many([3, "x", 4])
+            self.check(tree, [1, 2])
+    
+    
+    
+    def test_stats(self):
+        # the comparisons of the stats mode are the calls of < of the keys during the descents (the
+        # constructor of a node checks its key with one more call)
+        calls = [0]
+        
+        class Key(int):
+            def __lt__(self, other):
+                calls[0] += 1
+                return int(self) < int(other)
+        
+        rnd = random.Random(20)
+        keys = [rnd.randrange(50) for _ in range(300)]
+        for multiset in (False, True):
+            tree = RedBlackTree(stats=True, multiset=multiset)
+            calls[0] = 0
+            for k in keys:
+                tree.add(Key(k))
+            self.assertEqual(tree.stats.comparisons, calls[0] - len(keys))
+            self.check(tree, keys)
+            if multiset:
+                # every key is inserted once as a node, its repetitions only count up the node
+                self.assertEqual(tree.stats.insertions, len(set(keys)))
+                self.assertEqual(tree.stats.duplicates, len(keys) - len(set(keys)))
+            else:
+                self.assertEqual(tree.stats.insertions, len(keys))
+                self.assertEqual(tree.stats.duplicates, 0)
+            self.assertEqual(tree.stats.fixes, tree.stats.insertions)
+            self.assertGreater(tree.stats.max_depth, 0)
+    
+    
+    
+    def test_insert_many(self):
+        # a batch is inserted key by key (a sparse batch), with the finger search (a dense batch) or merged
+        # with the nodes of the tree (a batch of at least _merge_ratio * len(tree) keys); the spies record
+        # which path was taken
+        rnd = random.Random(10)
+        for options in ({}, {"key": lambda k: -k}, {"order_statistics": True, "monoid": Monoid.sum()},
+                        {"multiset": True, "order_statistics": True, "monoid": Monoid.sum()}):
+            tree = RedBlackTree(**options)
+            keys = []
+            paths = []
+            merge_sorted = tree._merge_sorted
+            insert = tree._insert
+            
+            def merge_spy(nodes:list) -> None:
+                paths.append("merge")
+                merge_sorted(nodes)
+            
+            def insert_spy(n, node = None) -> None:
+                if node is not None:
+                    paths.append("finger")
+                insert(n, node)
+            
+            tree._merge_sorted = merge_spy
+            tree._insert = insert_spy
+            # (the sizes cross the thresholds of both the finger search and the merge several times)
+            for m in (0, 5, 1, 300, 12, 13, 100, 199, 200, 600, 40, 3, 1500, 150, 70):
+                # unsorted and with duplicates
+                batch = [rnd.randrange(1000) for _ in range(m)]
+                n = len(tree)
+                distinct = len(set(batch)) if tree.multiset else len(batch)
+                if distinct >= RedBlackTree._merge_ratio * n:
+                    expected = "merge"
+                elif tree.multiset or (len(batch) * RedBlackTree._finger_gap < n) or (len(batch) < 2):
+                    expected = None
+                else:
+                    expected = "finger"
+                del paths[:]
+                tree.insert_many(batch)
+                keys.extend(batch)
+                self.assertEqual(paths[:1], [] if expected is None else [expected], m)
+                self.check(tree, keys)
+                if keys and (tree.monoid is not None):
+                    self.assertEqual(tree.root.agg, sum(keys))
+                    self.assertEqual(tree.root.size, len(keys))
+
+
+
+if __name__ == '__main__':
+    unittest.main()
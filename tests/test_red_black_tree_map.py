@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""  
+Tests for RedBlackTreeMap against a dict.  
+"""
+
+import random
+import unittest
+
+from red_black_tree_map import RedBlackTreeMap
+from tests.helpers import RandomizedTestCase
+
+
+class TestRedBlackTreeMap(RandomizedTestCase):
+    
+    def check(self, m:RedBlackTreeMap, d:dict) -> None:
+        self.check_sorted(m, list(d))
+        self.assertEqual(list(m.items()), sorted(d.items()))
+    
+    
+    
+    def test_random_operations(self):
+        for order_statistics in (False, True):
+            m = RedBlackTreeMap(order_statistics=order_statistics)
+            d = {}
+            
+            def assign(rnd:random.Random) -> None:
+                k = rnd.randrange(100)
+                m[k] = d[k] = rnd.random()
+            
+            def insert_node(rnd:random.Random) -> None:
+                # (insert_rbt and insert assign the value of an existing key as well)
+                n = m.new_node(rnd.randrange(100))
+                n.value = d[n.key] = rnd.random()
+                (m.insert_rbt if rnd.random() < 0.5 else m.insert)(n)
+            
+            def setdefault(rnd:random.Random) -> None:
+                k = rnd.randrange(100)
+                value = rnd.random()
+                self.assertEqual(m.setdefault(k, value), d.setdefault(k, value))
+            
+            def pop(rnd:random.Random) -> None:
+                k = rnd.randrange(100)
+                self.assertEqual(m.pop(k, None), d.pop(k, None))
+            
+            def popitem(rnd:random.Random) -> None:
+                if d:
+                    k = min(d)
+                    self.assertEqual(m.popitem(), (k, d.pop(k)))
+            
+            def get(rnd:random.Random) -> None:
+                k = rnd.randrange(100)
+                self.assertEqual(m.get(k), d.get(k))
+            
+            self.run_operations(9, [(40, assign), (10, insert_node), (10, setdefault), (20, pop), (5, popitem), (15, get)],
+                                lambda: self.check(m, d), steps=2000)
+    
+    
+    
+    def test_keys_without_values(self):
+        m = RedBlackTreeMap({1: "a", 2: "b", 3: "c"})
+        with self.assertRaises(TypeError):
+            m.insert_many([2, 5])
+        with self.assertRaises(TypeError):
+            m.add(2)
+        n = m.new_node(2)
+        n.value = "B"
+        m.insert_rbt(n)
+        self.check(m, {1: "a", 2: "B", 3: "c"})
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+""" 
+Tests for ShardedRedBlackTree, dumps_sorted and loads. 
+"""
+
+import os
+import random
+import tempfile
+import unittest
+
+from mapped_red_black_tree import dumps_sorted, loads
+from red_black_tree import RedBlackTree
+from sharded_red_black_tree import ShardedRedBlackTree
+from tests.helpers import RandomizedTestCase
+
+
+class TestShardedRedBlackTree(RandomizedTestCase):
+    
+    def check(self, tree:ShardedRedBlackTree, keys:list) -> None:
+        # every shard holds the keys between its splitters
+        bounds = [None] + tree.splitters + [None]
+        for shard, lo, hi in zip(tree.shards, bounds, bounds[1:]):
+            self.check_sorted(shard, [k for k in keys if ((lo is None) or not (k < lo)) and ((hi is None) or (k < hi))])
+        self.assertEqual(list(tree), sorted(keys))
+        self.assertEqual(list(reversed(tree)), sorted(keys, reverse=True))
+        self.assertEqual(len(tree), len(keys))
+    
+    
+    
+    def test_from_iterable(self):
+        rnd = random.Random(14)
+        for n in (0, 1, 5, 1000):
+            for keys in ([rnd.randrange(n // 2 + 1) for _ in range(n)], [rnd.random() for _ in range(n)],
+                         [str(rnd.randrange(n + 1)) for _ in range(n)], [rnd.randrange(2**70) for _ in range(n)]):
+                for workers in (1, 2):
+                    tree = ShardedRedBlackTree.from_iterable(keys, shards=3, workers=workers,
+                                                             order_statistics=True)
+                    self.check(tree, keys)
+    
+    
+    
+    def test_random_operations(self):
+        rnd = random.Random(41)
+        keys = [rnd.randrange(300) for _ in range(200)]
+        tree = ShardedRedBlackTree.from_iterable(keys, shards=4, workers=1)
+        
+        def insert(rnd:random.Random) -> None:
+            k = rnd.randrange(-50, 350)
+            tree.insert(k)
+            keys.append(k)
+        
+        def insert_many(rnd:random.Random) -> None:
+            batch = [rnd.randrange(-50, 350) for _ in range(rnd.randrange(10))]
+            tree.insert_many(batch)
+            keys.extend(batch)
+        
+        def delete(rnd:random.Random) -> None:
+            if keys:
+                k = rnd.choice(keys)
+                tree.delete(k)
+                keys.remove(k)
+            with self.assertRaises(KeyError):
+                tree.delete(350)
+        
+        def query(rnd:random.Random) -> None:
+            k = rnd.randrange(-50, 350)
+            self.assertEqual(k in tree, k in keys)
+            lo, hi = sorted(rnd.sample(range(-60, 360), 2))
+            self.assertEqual(list(tree.irange(lo, hi)), [k for k in sorted(keys) if lo <= k <= hi])
+            self.assertEqual(list(tree.irange(lo, hi, (False, False), True)),
+                             [k for k in sorted(keys, reverse=True) if lo < k < hi])
+        
+        self.run_operations(41, [(40, insert), (10, insert_many), (40, delete), (10, query)],
+                            lambda: self.check(tree, keys), steps=2000, check_every=100)
+    
+    
+    
+    def test_dumps_sorted(self):
+        rnd = random.Random(15)
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        path = os.path.join(folder.name, "tree.rbt")
+        for n in list(range(70)) + [1000, 1023, 1024]:
+            for keys in (sorted(rnd.randrange(n + 1) for _ in range(n)), sorted(rnd.random() for _ in range(n))):
+                data = dumps_sorted(keys)
+                tree = loads(data, order_statistics=True)
+                tree.validate()
+                self.assertEqual(list(tree), keys)
+                
+                # the same bytes as dump writes for the tree of from_sorted
+                RedBlackTree.from_sorted(keys).dump(path)
+                with open(path, "rb") as file:
+                    self.assertEqual(data, file.read())
+        with self.assertRaises(ValueError):
+            dumps_sorted([2, 1])
+        with self.assertRaises(ValueError):
+            dumps_sorted(["a", "b"])
+
+
+if __name__ == '__main__':
+    unittest.main()